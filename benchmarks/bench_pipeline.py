@@ -0,0 +1,278 @@
+"""Compile-time scaling benchmarks for the scheduling pipeline.
+
+Run a suite and write JSON::
+
+    python benchmarks/bench_pipeline.py --output bench.json
+
+Compare a fresh run against a stored baseline (exit status 1 on regression)::
+
+    python benchmarks/bench_pipeline.py --compare baseline.json --threshold 0.25
+
+``plan_fusion_groups`` is opt-in because it grows quadratically with the
+number of ops a group can span. Long skip connections are its worst case::
+
+    python benchmarks/bench_pipeline.py --generators skip_ladder \
+        --stages plan_fusion_groups --sizes 250 500 1000
+
+Each stage is timed on a cold graph (shape and analysis caches dropped before
+every repeat); the reported wall time is the best of ``--repeats`` runs and
+peak memory is measured in a separate ``tracemalloc`` run so tracing overhead
+does not leak into the timings.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sequence
+
+from mlcompiler import Graph, HardwareConfig, Op, Tensor, evaluate_candidates, run_schedule_pass
+from mlcompiler.fusion import plan_fusion_groups
+from mlcompiler.pass_memory_aware_schedule import choose_schedule
+
+SCHEMA_VERSION = 1
+DEFAULT_SIZES = (10, 100, 1_000, 10_000, 100_000)
+STAGES = ("infer_shapes", "evaluate_candidates", "run_schedule_pass", "choose_schedule")
+OPT_IN_STAGES = ("plan_fusion_groups",)
+_WIDTHS = (64, 128, 256, 512)
+
+
+def make_mlp_chain(num_ops: int, batch: int = 8, seed: int = 0) -> Graph:
+    """Alternating Linear/GELU chain with ``num_ops`` ops and seeded widths."""
+    rng = random.Random(seed)
+    width = rng.choice(_WIDTHS)
+    inputs = {"x": Tensor((batch, width))}
+    ops: List[Op] = []
+    prev = "x"
+    for i in range(num_ops):
+        out = f"t{i}"
+        if i % 2 == 0:
+            nxt = rng.choice(_WIDTHS)
+            ops.append(
+                Op(
+                    name="Linear",
+                    inputs=[prev],
+                    outputs=[out],
+                    attrs={"in_features": width, "out_features": nxt},
+                )
+            )
+            width = nxt
+        else:
+            ops.append(Op(name="GELU", inputs=[prev], outputs=[out], attrs={}))
+        prev = out
+    return Graph(ops=ops, inputs=inputs, outputs=[prev])
+
+
+def make_residual_stack(num_ops: int, batch: int = 8, width: int = 256, seed: int = 0) -> Graph:
+    """Pre-norm residual blocks (LayerNorm, Linear, GELU, Linear, Add), truncated to ``num_ops``."""
+    rng = random.Random(seed)
+    inputs = {"x": Tensor((batch, width))}
+    ops: List[Op] = []
+    stream = "x"
+    block = 0
+    while len(ops) < num_ops:
+        ff = width * rng.choice((2, 4))
+        p = f"b{block}_"
+        body = [
+            Op(name="LayerNorm", inputs=[stream], outputs=[p + "ln"], attrs={}),
+            Op(
+                name="Linear",
+                inputs=[p + "ln"],
+                outputs=[p + "up"],
+                attrs={"in_features": width, "out_features": ff},
+            ),
+            Op(name="GELU", inputs=[p + "up"], outputs=[p + "act"], attrs={}),
+            Op(
+                name="Linear",
+                inputs=[p + "act"],
+                outputs=[p + "down"],
+                attrs={"in_features": ff, "out_features": width},
+            ),
+            Op(name="Add", inputs=[stream, p + "down"], outputs=[p + "res"], attrs={}),
+        ]
+        ops.extend(body[: num_ops - len(ops)])
+        stream = ops[-1].outputs[0]
+        block += 1
+    return Graph(ops=ops, inputs=inputs, outputs=[ops[-1].outputs[0]])
+
+
+def make_skip_ladder(num_ops: int, batch: int = 8, width: int = 256) -> Graph:
+    """GELU chain whose outputs are added back in reverse order (U-Net style skips).
+
+    Live ranges nest and span up to the whole graph.
+    """
+    inputs = {"x": Tensor((batch, width))}
+    ops: List[Op] = []
+    prev = "x"
+    down = num_ops // 2
+    for i in range(down):
+        ops.append(Op(name="GELU", inputs=[prev], outputs=[f"e{i}"], attrs={}))
+        prev = f"e{i}"
+    for i in range(num_ops - down):
+        skip = f"e{down - 2 - i}" if down - 2 - i >= 0 else "x"
+        ops.append(Op(name="Add", inputs=[prev, skip], outputs=[f"d{i}"], attrs={}))
+        prev = f"d{i}"
+    return Graph(ops=ops, inputs=inputs, outputs=[prev])
+
+
+GENERATORS: Dict[str, Callable[[int], Graph]] = {
+    "mlp_chain": make_mlp_chain,
+    "residual_stack": make_residual_stack,
+    "skip_ladder": make_skip_ladder,
+}
+
+
+def _stage_fn(stage: str, hw: HardwareConfig) -> Callable[[Graph], object]:
+    if stage == "infer_shapes":
+        return lambda g: g.infer_shapes()
+    if stage == "evaluate_candidates":
+        return lambda g: evaluate_candidates(g, hw)
+    if stage == "run_schedule_pass":
+        return lambda g: run_schedule_pass(g, hw)
+    if stage == "choose_schedule":
+        return lambda g: choose_schedule(g, hw)
+    if stage == "plan_fusion_groups":
+        return lambda g: plan_fusion_groups(g, hw)
+    raise ValueError(f"Unknown stage {stage!r}")
+
+
+def _measure(graph: Graph, fn: Callable[[Graph], object], repeats: int) -> Dict[str, float]:
+    best = float("inf")
+    for _ in range(repeats):
+        graph.invalidate_shapes()
+        start = time.perf_counter()
+        fn(graph)
+        best = min(best, time.perf_counter() - start)
+
+    graph.invalidate_shapes()
+    tracemalloc.start()
+    try:
+        fn(graph)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    n = len(graph.ops)
+    return {
+        "wall_s": best,
+        "ops_per_s": n / best if best > 0 else float("inf"),
+        "peak_mem_bytes": peak,
+    }
+
+
+def run_suite(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    generators: Optional[Sequence[str]] = None,
+    stages: Sequence[str] = STAGES,
+    repeats: int = 3,
+    sram_bytes: int = 1 * 1024 * 1024,
+) -> Dict[str, object]:
+    hw = HardwareConfig(sram_bytes=sram_bytes)
+    results: List[Dict[str, object]] = []
+    for gen_name in generators or list(GENERATORS):
+        for n in sizes:
+            graph = GENERATORS[gen_name](n)
+            for stage in stages:
+                row: Dict[str, object] = {"generator": gen_name, "num_ops": n, "stage": stage}
+                row.update(_measure(graph, _stage_fn(stage, hw), repeats))
+                results.append(row)
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sram_bytes": sram_bytes,
+        "repeats": repeats,
+        "results": results,
+    }
+
+
+def _key(row: Dict[str, object]) -> tuple:
+    return (row["generator"], row["num_ops"], row["stage"])
+
+
+def compare(
+    baseline: Dict[str, object],
+    current: Dict[str, object],
+    threshold: float = 0.25,
+    min_wall_s: float = 1e-3,
+) -> List[Dict[str, object]]:
+    """Return rows whose wall time or peak memory grew by more than ``threshold``.
+
+    Timings below ``min_wall_s`` in the baseline are ignored for the time check;
+    they are dominated by timer noise.
+    """
+    base_rows = {_key(r): r for r in baseline["results"]}  # type: ignore[index]
+    regressions: List[Dict[str, object]] = []
+    for row in current["results"]:  # type: ignore[index]
+        base = base_rows.get(_key(row))
+        if base is None:
+            continue
+        for metric in ("wall_s", "peak_mem_bytes"):
+            old, new = float(base[metric]), float(row[metric])
+            if metric == "wall_s" and old < min_wall_s:
+                continue
+            if old > 0 and (new - old) / old > threshold:
+                regressions.append(
+                    {
+                        "generator": row["generator"],
+                        "num_ops": row["num_ops"],
+                        "stage": row["stage"],
+                        "metric": metric,
+                        "baseline": old,
+                        "current": new,
+                        "ratio": new / old,
+                    }
+                )
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--generators", nargs="+", choices=sorted(GENERATORS))
+    parser.add_argument(
+        "--stages", nargs="+", choices=STAGES + OPT_IN_STAGES, default=list(STAGES)
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--sram-bytes", type=int, default=1 * 1024 * 1024)
+    parser.add_argument("--output", help="write results JSON here (default: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="baseline JSON to check against")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    report = run_suite(
+        sizes=args.sizes,
+        generators=args.generators,
+        stages=args.stages,
+        repeats=args.repeats,
+        sram_bytes=args.sram_bytes,
+    )
+    status = 0
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        report["regressions"] = compare(baseline, report, threshold=args.threshold)
+        status = 1 if report["regressions"] else 0
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    for reg in report.get("regressions", []):
+        print(
+            f"REGRESSION {reg['generator']}/{reg['num_ops']}/{reg['stage']} "
+            f"{reg['metric']}: {reg['baseline']:.4g} -> {reg['current']:.4g} "
+            f"({reg['ratio']:.2f}x)",
+            file=sys.stderr,
+        )
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""Load generator for the asyncio compile server.
+
+Replays the same request stream two ways and prints JSON with throughput and
+latency percentiles for each:
+
+* ``direct``: every request parses its graph and calls ``run_schedule_pass``
+  itself, as a service embedding the library would.
+* ``server``: ``--clients`` concurrent connections pipeline requests into an
+  in-process ``CompileServer`` over a Unix socket.
+
+Requests draw from ``--distinct`` graphs with a skewed (Zipf-like) popularity,
+so the server can coalesce repeated in-flight requests.
+
+    python benchmarks/loadgen.py --requests 2000 --distinct 50 --clients 32
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from bench_pipeline import make_residual_stack
+
+from mlcompiler import HardwareConfig, run_schedule_pass
+from mlcompiler.server import CompileClient, CompileServer
+from mlcompiler.stream import graph_from_record, graph_to_record
+
+
+def _request_stream(n: int, distinct: int, ops: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    records = [graph_to_record(make_residual_stack(ops, seed=k)) for k in range(distinct)]
+    weights = [1.0 / (k + 1) for k in range(distinct)]
+    return [records[k] for k in rng.choices(range(distinct), weights=weights, k=n)]
+
+
+def _summary(latencies: Sequence[float], elapsed: float) -> Dict[str, float]:
+    lat = sorted(latencies)
+
+    def pct(q: float) -> float:
+        return lat[min(len(lat) - 1, int(round(q * (len(lat) - 1))))] if lat else 0.0
+
+    return {
+        "requests": len(lat),
+        "elapsed_s": elapsed,
+        "throughput_rps": len(lat) / elapsed if elapsed > 0 else 0.0,
+        "latency_p50_s": pct(0.50),
+        "latency_p90_s": pct(0.90),
+        "latency_p99_s": pct(0.99),
+    }
+
+
+def run_direct(records: Sequence[Dict[str, Any]], hw: HardwareConfig) -> Dict[str, float]:
+    latencies = []
+    start = time.perf_counter()
+    for record in records:
+        t0 = time.perf_counter()
+        run_schedule_pass(graph_from_record(record), hw)
+        latencies.append(time.perf_counter() - t0)
+    return _summary(latencies, time.perf_counter() - start)
+
+
+async def run_server(
+    records: Sequence[Dict[str, Any]],
+    hw: HardwareConfig,
+    clients: int,
+    workers: int,
+    max_batch: int,
+) -> Dict[str, Any]:
+    server = CompileServer(workers=workers, max_batch=max_batch)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "compile.sock")
+        listener = await server.serve_unix(path)
+        conns = [await CompileClient.connect_unix(path) for _ in range(clients)]
+        latencies: List[float] = []
+
+        async def one(conn: CompileClient, record: Dict[str, Any]) -> None:
+            t0 = time.perf_counter()
+            await conn.compile_record(record, hw)
+            latencies.append(time.perf_counter() - t0)
+
+        async def client(idx: int) -> None:
+            mine = records[idx::clients]
+            # Each client keeps a few requests outstanding at a time.
+            window = 8
+            for lo in range(0, len(mine), window):
+                await asyncio.gather(*(one(conns[idx], r) for r in mine[lo : lo + window]))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client(i) for i in range(clients)))
+        elapsed = time.perf_counter() - start
+        stats = await conns[0].stats()
+        for conn in conns:
+            await conn.close()
+        listener.close()
+        await listener.wait_closed()
+        await server.close()
+    out: Dict[str, Any] = dict(_summary(latencies, elapsed))
+    out["server_stats"] = stats
+    return out
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--distinct", type=int, default=50)
+    parser.add_argument("--ops", type=int, default=200, help="ops per graph")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--sram-bytes", type=int, default=1 * 1024 * 1024)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    hw = HardwareConfig(sram_bytes=args.sram_bytes)
+    records = _request_stream(args.requests, args.distinct, args.ops, args.seed)
+    direct = run_direct(records, hw)
+    served = asyncio.run(run_server(records, hw, args.clients, args.workers, args.max_batch))
+    report = {
+        "config": vars(args),
+        "direct": direct,
+        "server": served,
+        "speedup": served["throughput_rps"] / direct["throughput_rps"],
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,25 +1,118 @@
-from .ir import Graph, Op, Tensor
-from .hardware import HardwareConfig
+from .ir import Graph, Op, Sym, Tensor
+from .ops import OpRule, get_op_rule, register_op, registered_ops
+from .compact import CompactGraph
+from .hardware import HardwareConfig, MemoryLevel
+from .liveness import LiveRange, compute_live_ranges, peak_residency
 from .pass_memory_aware_schedule import choose_schedule, ScheduleChoice
-from .pass_schedule import run_schedule_pass, CompilationResult
+from .pass_schedule import decide_schedule, run_schedule_pass, select_schedule, CompilationResult
+from .breakpoints import SramCurve, SramInterval, sram_curve
+from .symbolic import ScheduleTable, schedule_table, symbolic_estimate
+from .batch import BatchItem, compile_many
+from .stream import compile_jsonl, read_graphs, write_graphs
+from .server import CompileClient, CompileServer
+from .binfmt import (
+    dumps_graph,
+    dumps_results,
+    loads_graph,
+    loads_results,
+    open_graph,
+    open_results,
+)
+from .cache import CompilationCache, cached_run_schedule_pass, structural_hash
+from .fusion import FusionPlan, plan_fusion_groups
+from .remat import RematPlan, plan_rematerialization
+from .reference import ExecutionReport, execute_schedule
+from .partition import PartitionPlan, partition_candidates, plan_partition
+from .precision import apply_storage_dtypes, run_precision_pass
+from .ordering import OpOrder, order_for_memory, reorder_graph
+from .tiling import TileCandidate, search_tile_shapes
+from .profiling import Profiler, profile
 from .cost import (
     estimate_dram_bytes,
     estimate_peak_sram_bytes,
+    estimate_schedule,
     evaluate_schedule,
     evaluate_candidates,
+    estimate_flops,
+    place_spills,
+    roofline_latency_s,
+    schedule_latency_s,
+    sweep_linear_gelu_linear,
+    SweepResult,
+    ScheduleEstimate,
 )
 
 __all__ = [
     "Graph",
     "Op",
     "Tensor",
+    "Sym",
+    "CompactGraph",
+    "OpRule",
+    "get_op_rule",
+    "register_op",
+    "registered_ops",
     "HardwareConfig",
+    "MemoryLevel",
+    "LiveRange",
+    "compute_live_ranges",
+    "peak_residency",
     "choose_schedule",
     "ScheduleChoice",
     "run_schedule_pass",
+    "decide_schedule",
+    "select_schedule",
     "CompilationResult",
+    "SramCurve",
+    "SramInterval",
+    "sram_curve",
+    "ScheduleTable",
+    "schedule_table",
+    "symbolic_estimate",
+    "BatchItem",
+    "compile_many",
+    "compile_jsonl",
+    "read_graphs",
+    "write_graphs",
+    "CompileServer",
+    "CompileClient",
+    "dumps_graph",
+    "loads_graph",
+    "open_graph",
+    "dumps_results",
+    "loads_results",
+    "open_results",
+    "CompilationCache",
+    "cached_run_schedule_pass",
+    "structural_hash",
+    "OpOrder",
+    "order_for_memory",
+    "reorder_graph",
+    "FusionPlan",
+    "plan_fusion_groups",
+    "RematPlan",
+    "plan_rematerialization",
+    "ExecutionReport",
+    "execute_schedule",
+    "PartitionPlan",
+    "partition_candidates",
+    "plan_partition",
+    "apply_storage_dtypes",
+    "run_precision_pass",
+    "TileCandidate",
+    "search_tile_shapes",
+    "Profiler",
+    "profile",
     "estimate_dram_bytes",
     "estimate_peak_sram_bytes",
+    "estimate_schedule",
     "evaluate_schedule",
     "evaluate_candidates",
+    "estimate_flops",
+    "place_spills",
+    "roofline_latency_s",
+    "schedule_latency_s",
+    "sweep_linear_gelu_linear",
+    "SweepResult",
+    "ScheduleEstimate",
 ]
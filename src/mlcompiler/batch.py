@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .hardware import HardwareConfig
+from .ir import Graph
+from .pass_schedule import CompilationResult, run_schedule_pass
+
+
+# Aim for a few chunks per worker so stragglers even out without paying
+# per-graph IPC on tiny graphs.
+_CHUNKS_PER_WORKER = 4
+
+
+@dataclass(frozen=True)
+class BatchItem:
+    index: int
+    result: Optional[CompilationResult]
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _describe(exc: BaseException) -> str:
+    return f"{type(exc).__name__}: {exc}"
+
+
+def _compile_chunk(
+    start: int,
+    graphs: Sequence[Graph],
+    hw: HardwareConfig,
+    pass_kwargs: Dict[str, Any],
+) -> List[BatchItem]:
+    items = []
+    for offset, graph in enumerate(graphs):
+        try:
+            result = run_schedule_pass(graph, hw, **pass_kwargs)
+        except Exception as e:
+            items.append(BatchItem(index=start + offset, result=None, error=_describe(e)))
+        else:
+            items.append(BatchItem(index=start + offset, result=result))
+    return items
+
+
+def _chunk_bounds(graphs: Sequence[Graph], n_chunks: int) -> List[Tuple[int, int]]:
+    """Split into contiguous runs with roughly equal total op counts."""
+    weights = [max(1, len(g.ops)) for g in graphs]
+    target = max(1, -(-sum(weights) // n_chunks))
+    bounds = []
+    start, acc = 0, 0
+    for idx, w in enumerate(weights):
+        acc += w
+        if acc >= target:
+            bounds.append((start, idx + 1))
+            start, acc = idx + 1, 0
+    if start < len(graphs):
+        bounds.append((start, len(graphs)))
+    return bounds
+
+
+def compile_many(
+    graphs: Iterable[Graph],
+    hw: HardwareConfig,
+    workers: Optional[int] = None,
+    chunks_per_worker: int = _CHUNKS_PER_WORKER,
+    **pass_kwargs: Any,
+) -> List[BatchItem]:
+    """Run ``run_schedule_pass`` over many graphs on a process pool.
+
+    Results come back in input order. A graph that fails to compile yields a
+    ``BatchItem`` with ``error`` set instead of aborting the batch. Extra
+    keyword arguments are forwarded to ``run_schedule_pass``.
+    """
+    graphs = list(graphs)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"workers must be positive, got {workers}")
+    if workers == 1 or len(graphs) <= 1:
+        return _compile_chunk(0, graphs, hw, pass_kwargs)
+
+    bounds = _chunk_bounds(graphs, workers * max(1, chunks_per_worker))
+    items: List[BatchItem] = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(bounds))) as pool:
+        futures = [
+            pool.submit(_compile_chunk, lo, graphs[lo:hi], hw, pass_kwargs)
+            for lo, hi in bounds
+        ]
+        for (lo, hi), future in zip(bounds, futures):
+            try:
+                items.extend(future.result())
+            except Exception as e:
+                # The chunk never ran (e.g. unpicklable graph or a dead worker).
+                error = _describe(e)
+                items.extend(BatchItem(index=i, result=None, error=error) for i in range(lo, hi))
+    return items
@@ -0,0 +1,621 @@
+"""Versioned binary format for graphs and compilation results.
+
+A file is a small header, a section directory, and 8-byte aligned sections::
+
+    header     <4s magic> <u16 version> <u16 reserved> <u32 section count>
+    directory  per section: <16s name> <1s array typecode> <7x> <u64 offset> <u64 length>
+    sections   little-endian packed arrays
+
+Strings are interned into tables stored as two sections, ``<name>.off`` (int64
+offsets) and ``<name>.dat`` (UTF-8 bytes), so each distinct op kind, tensor
+name, attrs dict (as JSON), schedule or reason is stored once. JSON arrays
+in attrs read back as tuples; list values are wrapped as ``{"__list__": [...]}``
+so they read back as lists. Graph files
+(magic ``MLCG``) hold the ``CompactGraph`` arrays: op kinds, CSR operand
+lists, and packed shape dims plus dtype codes. Result files (magic ``MLCR``)
+hold one row per result and one row per candidate cost. Breakdown dicts are
+stored as interned-key/value pair lists. Result sets with ``storage_dtypes``
+add an ``r_dtypes`` column into a ``dtypes`` table of JSON objects; files
+without it read back with ``storage_dtypes=None``. Likewise costs on a memory
+hierarchy add ``dram_lvl``/``sram_lvl`` pair lists and a ``c_mem_time``
+column, and files without them read back with empty dicts and ``None``.
+
+``GraphView`` and ``ResultSetView`` read from any buffer. ``open_graph`` and
+``open_results`` memory-map a file. Numeric sections are exposed as
+``memoryview`` casts over the map, so looking at one op or one cost only
+decodes that record.
+"""
+from __future__ import annotations
+
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .compact import CompactGraph
+from .cost import DramEstimate, FlopEstimate, ScheduleCost, SramEstimate
+from .ir import Graph, Op, Tensor
+from .pass_schedule import CompilationResult
+from .schedule import Schedule
+
+FORMAT_VERSION = 1
+GRAPH_MAGIC = b"MLCG"
+RESULTS_MAGIC = b"MLCR"
+
+_HEADER = struct.Struct("<4sHHI")
+_ENTRY = struct.Struct("<16sc7xQQ")
+_ALIGN = 8
+_LITTLE = sys.byteorder == "little"
+# (typecode, expected itemsize, min, max), narrowest first.
+_INT_TYPES = (
+    ("B", 1, 0, 0xFF),
+    ("b", 1, -0x80, 0x7F),
+    ("H", 2, 0, 0xFFFF),
+    ("h", 2, -0x8000, 0x7FFF),
+    ("I", 4, 0, 0xFFFFFFFF),
+    ("i", 4, -0x80000000, 0x7FFFFFFF),
+)
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+class _Writer:
+    def __init__(self, tables: Sequence[str] = ()) -> None:
+        self._sections: List[Tuple[str, str, bytes]] = []
+        # Interned string tables, written by flush_tables() even when empty.
+        self._tables: Dict[str, Dict[str, int]] = {name: {} for name in tables}
+
+    def array(self, name: str, typecode: str, values: Any) -> None:
+        data = values if isinstance(values, array) and values.typecode == typecode else array(typecode, values)
+        if not _LITTLE:
+            data = array(typecode, data)
+            data.byteswap()
+        self._sections.append((name, typecode, data.tobytes()))
+
+    def ints(self, name: str, values: Any) -> None:
+        """Store integers in the narrowest array type that holds them."""
+        data = values if isinstance(values, array) else array("q", values)
+        lo = min(data) if len(data) else 0
+        hi = max(data) if len(data) else 0
+        typecode = next(
+            (
+                tc
+                for tc, size, low, high in _INT_TYPES
+                if array(tc).itemsize == size and low <= lo and hi <= high
+            ),
+            "q",
+        )
+        self.array(name, typecode, data)
+
+    def intern(self, table: str, value: str) -> int:
+        ids = self._tables.setdefault(table, {})
+        if value not in ids:
+            ids[value] = len(ids)
+        return ids[value]
+
+    def strings(self, name: str, values: Sequence[str]) -> None:
+        offsets = array("q", [0])
+        blob = bytearray()
+        for value in values:
+            blob += value.encode("utf-8")
+            offsets.append(len(blob))
+        self.ints(name + ".off", offsets)
+        self._sections.append((name + ".dat", "B", bytes(blob)))
+
+    def flush_tables(self) -> None:
+        for table, ids in self._tables.items():
+            self.strings(table, list(ids))
+
+    def finish(self, magic: bytes) -> bytes:
+        head = _HEADER.size + _ENTRY.size * len(self._sections)
+        offset = -(-head // _ALIGN) * _ALIGN
+        directory = bytearray(_HEADER.pack(magic, FORMAT_VERSION, 0, len(self._sections)))
+        body = bytearray()
+        for name, typecode, payload in self._sections:
+            key = name.encode("ascii")
+            if len(key) > 16:
+                raise ValueError(f"Section name {name!r} is longer than 16 bytes")
+            directory += _ENTRY.pack(key, typecode.encode("ascii"), offset + len(body), len(payload))
+            body += payload
+            body += b"\0" * (-len(body) % _ALIGN)
+        directory += b"\0" * (offset - len(directory))
+        return bytes(directory + body)
+
+
+class _StringTable:
+    __slots__ = ("_off", "_dat")
+
+    def __init__(self, off: Sequence[int], dat: memoryview) -> None:
+        self._off = off
+        self._dat = dat
+
+    def __len__(self) -> int:
+        return len(self._off) - 1
+
+    def __getitem__(self, i: int) -> str:
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return bytes(self._dat[self._off[i] : self._off[i + 1]]).decode("utf-8")
+
+
+class _Reader:
+    """Section lookup over a buffer; keeps every exported view so it can release them."""
+
+    def __init__(self, buf: Buffer, magic: bytes) -> None:
+        self._mv = memoryview(buf)
+        self._views: List[memoryview] = [self._mv]
+        if len(self._mv) < _HEADER.size:
+            raise ValueError("Buffer too small for an mlcompiler binary header")
+        found, version, _, count = _HEADER.unpack_from(self._mv, 0)
+        if found != magic:
+            raise ValueError(f"Bad magic {found!r}; expected {magic!r}")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported format version {version} (expected {FORMAT_VERSION})")
+        self._dir: Dict[str, Tuple[str, int, int]] = {}
+        for i in range(count):
+            key, typecode, offset, length = _ENTRY.unpack_from(self._mv, _HEADER.size + i * _ENTRY.size)
+            if offset + length > len(self._mv):
+                raise ValueError("Truncated mlcompiler binary section")
+            self._dir[key.rstrip(b"\0").decode("ascii")] = (typecode.decode("ascii"), offset, length)
+        self._cache: Dict[str, Any] = {}
+
+    def array(self, name: str) -> Sequence[Any]:
+        if name not in self._cache:
+            typecode, offset, length = self._dir[name]
+            raw = self._mv[offset : offset + length]
+            self._views.append(raw)
+            if typecode == "B":
+                self._cache[name] = raw
+            elif _LITTLE or array(typecode).itemsize == 1:
+                view = raw.cast(typecode)
+                self._views.append(view)
+                self._cache[name] = view
+            else:
+                data = array(typecode)
+                data.frombytes(raw)
+                data.byteswap()
+                self._cache[name] = data
+        return self._cache[name]
+
+    def has(self, name: str) -> bool:
+        return name in self._dir
+
+    def strings(self, name: str) -> _StringTable:
+        return _StringTable(self.array(name + ".off"), self.array(name + ".dat"))  # type: ignore[arg-type]
+
+    def release(self) -> None:
+        self._cache.clear()
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+
+
+class _MappedView:
+    def __init__(self, buf: Buffer, magic: bytes, mapped: Optional[mmap.mmap] = None) -> None:
+        self._r = _Reader(buf, magic)
+        self._mmap = mapped
+
+    def close(self) -> None:
+        self._r.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):  # type: ignore[no-untyped-def]
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _map(path: Union[str, "os.PathLike[str]"]) -> mmap.mmap:
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+# Graphs ---------------------------------------------------------------------
+
+_LIST_TAG = "__list__"
+
+
+def _attrs_json(value: Any) -> Any:
+    if isinstance(value, list):
+        return {_LIST_TAG: [_attrs_json(v) for v in value]}
+    if isinstance(value, tuple):
+        return [_attrs_json(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _attrs_json(v) for k, v in value.items()}
+    return value
+
+
+def dumps_graph(graph: Union[Graph, CompactGraph], include_shapes: bool = True) -> bytes:
+    """Serialize ``graph``; ``include_shapes`` also stores every inferred shape."""
+    cg = graph if isinstance(graph, CompactGraph) else CompactGraph.from_graph(graph)
+    if include_shapes:
+        cg.infer_shapes()
+    w = _Writer()
+    w.strings("tensors", cg.tensor_names)
+    w.strings("kinds", cg.kind_names)
+    w.strings("attrs", [json.dumps(_attrs_json(a), sort_keys=True) for a in cg.attr_table])
+    w.strings("dtypes", [json.dumps(d) for d in cg.dtype_table])
+    w.ints("op_kind", cg.op_kind)
+    w.ints("op_attr", cg.op_attr)
+    w.ints("op_in_ptr", cg.op_in_ptr)
+    w.ints("op_in", cg.op_in)
+    w.ints("op_out_ptr", cg.op_out_ptr)
+    w.ints("op_out", cg.op_out)
+    w.ints("input_ids", cg.input_ids)
+    w.ints("output_ids", cg.output_ids)
+    w.ints("shape_ptr", cg.shape_ptr)
+    w.ints("shape_dims", cg.shape_dims)
+    w.ints("dtype_code", cg.dtype_code)
+    return w.finish(GRAPH_MAGIC)
+
+
+def _attrs_from_json(value: Any) -> Any:
+    if isinstance(value, list):
+        return tuple(_attrs_from_json(v) for v in value)
+    if isinstance(value, dict):
+        if set(value) == {_LIST_TAG}:
+            return [_attrs_from_json(v) for v in value[_LIST_TAG]]
+        return {k: _attrs_from_json(v) for k, v in value.items()}
+    return value
+
+
+class GraphView(_MappedView):
+    """Lazy, read-only access to a serialized graph."""
+
+    def __init__(self, buf: Buffer, _mapped: Optional[mmap.mmap] = None) -> None:
+        super().__init__(buf, GRAPH_MAGIC, _mapped)
+        r = self._r
+        self._names = r.strings("tensors")
+        self._kinds = r.strings("kinds")
+        self._attrs = r.strings("attrs")
+        self._dtypes = r.strings("dtypes")
+
+    @property
+    def num_ops(self) -> int:
+        return len(self._r.array("op_kind"))
+
+    @property
+    def num_tensors(self) -> int:
+        return len(self._names)
+
+    @property
+    def has_shapes(self) -> bool:
+        """True if shapes were stored for every tensor, not just the inputs."""
+        return len(self._r.array("shape_ptr")) - 1 == self.num_tensors
+
+    def tensor_name(self, t: int) -> str:
+        return self._names[t]
+
+    def op_kind(self, i: int) -> str:
+        return self._kinds[self._r.array("op_kind")[i]]
+
+    def _ids(self, ptr: str, data: str, i: int) -> Sequence[int]:
+        p = self._r.array(ptr)
+        return self._r.array(data)[p[i] : p[i + 1]]
+
+    def op(self, i: int) -> Op:
+        names = self._names
+        return Op(
+            name=self.op_kind(i),
+            inputs=[names[t] for t in self._ids("op_in_ptr", "op_in", i)],
+            outputs=[names[t] for t in self._ids("op_out_ptr", "op_out", i)],
+            attrs=_attrs_from_json(json.loads(self._attrs[self._r.array("op_attr")[i]])),
+        )
+
+    def tensor(self, t: int) -> Optional[Tensor]:
+        """Stored shape and dtype of tensor ``t``, or None if it was not stored."""
+        ptr = self._r.array("shape_ptr")
+        if t + 1 >= len(ptr):
+            return None
+        dims = tuple(self._r.array("shape_dims")[ptr[t] : ptr[t + 1]])
+        return Tensor(dims, json.loads(self._dtypes[self._r.array("dtype_code")[t]]))
+
+    def to_compact(self) -> CompactGraph:
+        r = self._r
+        ptr = r.array("shape_ptr")
+        dims = r.array("shape_dims")
+        input_ids = r.array("input_ids")
+        return CompactGraph(
+            tensor_names=[self._names[t] for t in range(self.num_tensors)],
+            kind_names=[self._kinds[k] for k in range(len(self._kinds))],
+            attr_table=[_attrs_from_json(json.loads(self._attrs[a])) for a in range(len(self._attrs))],
+            dtype_table=[json.loads(self._dtypes[d]) for d in range(len(self._dtypes))],
+            op_kind=array("H", r.array("op_kind")),
+            op_attr=array("l", r.array("op_attr")),
+            op_in_ptr=array("q", r.array("op_in_ptr")),
+            op_in=array("q", r.array("op_in")),
+            op_out_ptr=array("q", r.array("op_out_ptr")),
+            op_out=array("q", r.array("op_out")),
+            input_ids=array("q", input_ids),
+            output_ids=array("q", r.array("output_ids")),
+            input_shapes=[tuple(dims[ptr[i] : ptr[i + 1]]) for i in range(len(input_ids))],
+            input_dtypes=array("H", r.array("dtype_code")[: len(input_ids)]),
+        )
+
+    def to_graph(self) -> Graph:
+        return self.to_compact().to_graph()
+
+
+def loads_graph(data: Buffer) -> Graph:
+    view = GraphView(data)
+    try:
+        return view.to_graph()
+    finally:
+        view.close()
+
+
+def write_graph(graph: Union[Graph, CompactGraph], path: Union[str, "os.PathLike[str]"]) -> None:
+    with open(path, "wb") as f:
+        f.write(dumps_graph(graph))
+
+
+def open_graph(path: Union[str, "os.PathLike[str]"]) -> GraphView:
+    """Memory-map a graph file; close the view (or use ``with``) to unmap it."""
+    mapped = _map(path)
+    return GraphView(mapped, mapped)
+
+
+# Compilation results --------------------------------------------------------
+
+_PAIR_LISTS = ("dram_bd", "sram_bd", "live", "flops_bd")
+# Per-level DRAM traffic and off-chip peaks, only present for memory hierarchies.
+_LEVEL_PAIR_LISTS = ("dram_lvl", "sram_lvl")
+
+
+def _schedule_json(s: Schedule) -> str:
+    fields: List[Any] = [s.name, s.description, s.tile_shape, s.kind, s.fusion_groups]
+    if s.buffers != 1 or s.remat is not None:
+        fields.append(s.buffers)
+    if s.remat is not None:
+        fields.append(s.remat)
+    return json.dumps(fields, separators=(",", ":"))
+
+
+def _schedule_from_json(text: str) -> Schedule:
+    name, description, tile_shape, kind, groups, *rest = json.loads(text)
+    return Schedule(
+        name=name,
+        description=description,
+        tile_shape=tuple(tile_shape) if tile_shape is not None else None,
+        kind=kind,
+        fusion_groups=tuple(tuple(g) for g in groups) if groups is not None else None,  # type: ignore[misc]
+        buffers=rest[0] if rest else 1,
+        remat=tuple(tuple(r) for r in rest[1]) if len(rest) > 1 else None,  # type: ignore[misc]
+    )
+
+
+def dumps_results(
+    results: Sequence[CompilationResult], ids: Optional[Sequence[str]] = None
+) -> bytes:
+    """Serialize a result set; ``ids`` optionally labels each result."""
+    if ids is not None and len(ids) != len(results):
+        raise ValueError(f"Got {len(ids)} ids for {len(results)} results")
+    w = _Writer(tables=("schedules", "reasons", "ids", "keys"))
+    cols: Dict[str, List[Any]] = {
+        k: []
+        for k in (
+            "r_chosen", "r_reason", "r_id", "r_cost_ptr", "r_has_order", "r_order_ptr", "r_order",
+            "c_sched", "c_feasible", "c_dram", "c_sram", "c_penalized", "c_flops",
+            "c_latency", "c_peak_op",
+        )
+    }
+    # Optional sections are written only when some result needs them, so
+    # older readers still see the section set they expect.
+    all_costs = [c for r in results for c in r.costs.values()]
+    levels = any(c.dram.by_level or c.sram.level_peaks for c in all_costs)
+    if any(c.memory_time_s is not None for c in all_costs):
+        cols["c_mem_time"] = []
+    pairs: Dict[str, Tuple[List[int], List[int], List[int]]] = {
+        k: ([0], [], []) for k in _PAIR_LISTS + (_LEVEL_PAIR_LISTS if levels else ())
+    }
+    cols["r_cost_ptr"].append(0)
+    cols["r_order_ptr"].append(0)
+
+    sched_ids: Dict[Schedule, int] = {}
+
+    def sched_id(schedule: Schedule) -> int:
+        if schedule not in sched_ids:
+            sched_ids[schedule] = w.intern("schedules", _schedule_json(schedule))
+        return sched_ids[schedule]
+
+    def add_pairs(kind: str, mapping: Dict[str, int]) -> None:
+        ptr, keys, vals = pairs[kind]
+        for key, value in mapping.items():
+            keys.append(w.intern("keys", key))
+            vals.append(int(value))
+        ptr.append(len(keys))
+
+    dtypes: Optional[List[int]] = (
+        [] if any(r.storage_dtypes is not None for r in results) else None
+    )
+
+    for n, result in enumerate(results):
+        if dtypes is not None:
+            dtypes.append(
+                -1
+                if result.storage_dtypes is None
+                else w.intern("dtypes", json.dumps(result.storage_dtypes, sort_keys=True))
+            )
+        cols["r_chosen"].append(sched_id(result.chosen_schedule))
+        cols["r_reason"].append(w.intern("reasons", result.reason))
+        cols["r_id"].append(w.intern("ids", ids[n]) if ids is not None else -1)
+        cols["r_has_order"].append(0 if result.op_order is None else 1)
+        cols["r_order"].extend(result.op_order or ())
+        cols["r_order_ptr"].append(len(cols["r_order"]))
+        for cost in result.costs.values():
+            cols["c_sched"].append(sched_id(cost.schedule))
+            cols["c_feasible"].append(1 if cost.feasible else 0)
+            cols["c_dram"].append(cost.dram.total_bytes)
+            cols["c_sram"].append(cost.sram.peak_bytes)
+            cols["c_penalized"].append(cost.penalized_cost)
+            cols["c_flops"].append(cost.flops.total_flops if cost.flops is not None else -1)
+            cols["c_latency"].append(cost.latency_s if cost.latency_s is not None else math.nan)
+            cols["c_peak_op"].append(-1 if cost.sram.peak_op_index is None else cost.sram.peak_op_index)
+            add_pairs("dram_bd", cost.dram.breakdown)
+            add_pairs("sram_bd", cost.sram.breakdown)
+            add_pairs("live", cost.sram.live_at_peak)
+            add_pairs("flops_bd", cost.flops.breakdown if cost.flops is not None else {})
+            if levels:
+                add_pairs("dram_lvl", cost.dram.by_level)
+                add_pairs("sram_lvl", cost.sram.level_peaks)
+            if "c_mem_time" in cols:
+                cols["c_mem_time"].append(
+                    cost.memory_time_s if cost.memory_time_s is not None else math.nan
+                )
+        cols["r_cost_ptr"].append(len(cols["c_sched"]))
+
+    w.flush_tables()
+    for name, values in cols.items():
+        if name in ("c_latency", "c_mem_time"):
+            w.array(name, "d", values)
+        else:
+            w.ints(name, values)
+    for kind, (ptr, keys, vals) in pairs.items():
+        w.ints(kind + "_ptr", ptr)
+        w.ints(kind + "_k", keys)
+        w.ints(kind + "_v", vals)
+    if dtypes is not None:
+        w.ints("r_dtypes", dtypes)
+    return w.finish(RESULTS_MAGIC)
+
+
+class ResultSetView(_MappedView):
+    """Lazy, read-only access to a serialized result set."""
+
+    def __init__(self, buf: Buffer, _mapped: Optional[mmap.mmap] = None) -> None:
+        super().__init__(buf, RESULTS_MAGIC, _mapped)
+        r = self._r
+        self._schedules = r.strings("schedules")
+        self._reasons = r.strings("reasons")
+        self._ids = r.strings("ids")
+        self._keys = r.strings("keys")
+        self._dtypes = r.strings("dtypes") if r.has("r_dtypes") else None
+        self._levels = r.has("dram_lvl_ptr")
+        self._mem_time = r.has("c_mem_time")
+        self._decoded: Dict[int, Schedule] = {}
+
+    def __len__(self) -> int:
+        return len(self._r.array("r_chosen"))
+
+    def __iter__(self) -> Iterator[CompilationResult]:
+        for i in range(len(self)):
+            yield self.result(i)
+
+    def id(self, i: int) -> Optional[str]:
+        k = self._r.array("r_id")[i]
+        return None if k < 0 else self._ids[k]
+
+    def _schedule(self, k: int) -> Schedule:
+        if k not in self._decoded:
+            self._decoded[k] = _schedule_from_json(self._schedules[k])
+        return self._decoded[k]
+
+    def chosen(self, i: int) -> Schedule:
+        return self._schedule(self._r.array("r_chosen")[i])
+
+    def reason(self, i: int) -> str:
+        return self._reasons[self._r.array("r_reason")[i]]
+
+    def storage_dtypes(self, i: int) -> Optional[Dict[str, Union[str, int]]]:
+        if self._dtypes is None:
+            return None
+        k = self._r.array("r_dtypes")[i]
+        return None if k < 0 else json.loads(self._dtypes[k])
+
+    def _cost_rows(self, i: int) -> range:
+        ptr = self._r.array("r_cost_ptr")
+        return range(ptr[i], ptr[i + 1])
+
+    def schedule_names(self, i: int) -> List[str]:
+        sched = self._r.array("c_sched")
+        return [self._schedule(sched[c]).name for c in self._cost_rows(i)]
+
+    def _pairs(self, kind: str, c: int) -> Dict[str, int]:
+        r = self._r
+        ptr = r.array(kind + "_ptr")
+        keys, vals = r.array(kind + "_k"), r.array(kind + "_v")
+        return {self._keys[keys[j]]: vals[j] for j in range(ptr[c], ptr[c + 1])}
+
+    def _decode_cost(self, c: int) -> ScheduleCost:
+        r = self._r
+        flops = r.array("c_flops")[c]
+        latency = r.array("c_latency")[c]
+        peak_op = r.array("c_peak_op")[c]
+        memory_time = r.array("c_mem_time")[c] if self._mem_time else math.nan
+        return ScheduleCost(
+            schedule=self._schedule(r.array("c_sched")[c]),
+            dram=DramEstimate(
+                total_bytes=r.array("c_dram")[c],
+                breakdown=self._pairs("dram_bd", c),
+                by_level=self._pairs("dram_lvl", c) if self._levels else {},
+            ),
+            sram=SramEstimate(
+                peak_bytes=r.array("c_sram")[c],
+                breakdown=self._pairs("sram_bd", c),
+                live_at_peak=self._pairs("live", c),
+                peak_op_index=None if peak_op < 0 else peak_op,
+                level_peaks=self._pairs("sram_lvl", c) if self._levels else {},
+            ),
+            feasible=bool(r.array("c_feasible")[c]),
+            penalized_cost=r.array("c_penalized")[c],
+            flops=None if flops < 0 else FlopEstimate(flops, self._pairs("flops_bd", c)),
+            latency_s=None if math.isnan(latency) else latency,
+            memory_time_s=None if math.isnan(memory_time) else memory_time,
+        )
+
+    def cost(self, i: int, schedule_name: str) -> ScheduleCost:
+        """Decode one candidate's cost for result ``i``."""
+        sched = self._r.array("c_sched")
+        for c in self._cost_rows(i):
+            if self._schedule(sched[c]).name == schedule_name:
+                return self._decode_cost(c)
+        raise KeyError(schedule_name)
+
+    def result(self, i: int) -> CompilationResult:
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        costs = {}
+        for c in self._cost_rows(i):
+            cost = self._decode_cost(c)
+            costs[cost.schedule.name] = cost
+        op_order = None
+        if self._r.array("r_has_order")[i]:
+            ptr = self._r.array("r_order_ptr")
+            op_order = tuple(self._r.array("r_order")[ptr[i] : ptr[i + 1]])
+        return CompilationResult(
+            chosen_schedule=self.chosen(i),
+            costs=costs,
+            reason=self.reason(i),
+            op_order=op_order,
+            storage_dtypes=self.storage_dtypes(i),
+        )
+
+
+def loads_results(data: Buffer) -> List[CompilationResult]:
+    view = ResultSetView(data)
+    try:
+        return list(view)
+    finally:
+        view.close()
+
+
+def write_results(
+    results: Sequence[CompilationResult],
+    path: Union[str, "os.PathLike[str]"],
+    ids: Optional[Sequence[str]] = None,
+) -> None:
+    with open(path, "wb") as f:
+        f.write(dumps_results(results, ids))
+
+
+def open_results(path: Union[str, "os.PathLike[str]"]) -> ResultSetView:
+    """Memory-map a result file; close the view (or use ``with``) to unmap it."""
+    mapped = _map(path)
+    return ResultSetView(mapped, mapped)
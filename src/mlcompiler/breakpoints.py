@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from .compact import CompactGraph
+from .cost import ScheduleCost, ScheduleEstimate, estimate_flops, estimate_schedule
+from .hardware import HardwareConfig
+from .ir import Graph
+from .pass_schedule import OBJECTIVES, _pick, generate_candidates
+from .schedule import Schedule
+
+
+@dataclass(frozen=True)
+class SramInterval:
+    """Capacities ``sram_lo <= sram_bytes < sram_hi`` that all pick ``schedule``."""
+
+    sram_lo: int
+    # Exclusive upper bound; None for the last, unbounded interval.
+    sram_hi: Optional[int]
+    schedule: Schedule
+    dram_bytes: int
+    feasible: bool
+    latency_s: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class SramCurve:
+    """Piecewise-constant schedule choice as a function of SRAM capacity."""
+
+    intervals: Tuple[SramInterval, ...]
+
+    @property
+    def breakpoints(self) -> Tuple[int, ...]:
+        """Capacities at which the chosen schedule changes."""
+        return tuple(iv.sram_lo for iv in self.intervals[1:])
+
+    def at(self, sram_bytes: int) -> SramInterval:
+        if sram_bytes < 0:
+            raise ValueError(f"sram_bytes must be non-negative, got {sram_bytes}")
+        idx = bisect.bisect_right(self.breakpoints, sram_bytes)
+        return self.intervals[idx]
+
+
+def sram_curve(
+    graph: Union[Graph, CompactGraph],
+    hw: Optional[HardwareConfig] = None,
+    candidates: Optional[Iterable[Schedule]] = None,
+    objective: str = "bytes",
+    estimates: Optional[Mapping[str, ScheduleEstimate]] = None,
+) -> SramCurve:
+    """Schedule chosen by ``run_schedule_pass`` for every SRAM capacity at once.
+
+    Candidates are estimated once; only feasibility depends on capacity, and
+    it only flips where the capacity reaches some candidate's peak SRAM. The
+    choice is re-ranked at each of those peaks. ``hw`` supplies bandwidth and
+    compute rates for ``objective="latency"``; its ``sram_bytes`` is ignored.
+    Pass precomputed ``estimates`` to skip re-estimating the graph.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective {objective!r}. Known: {list(OBJECTIVES)}")
+    base_hw = hw if hw is not None else HardwareConfig(sram_bytes=0)
+    if estimates is None:
+        if candidates is None:
+            candidates = generate_candidates(graph)
+        flops = estimate_flops(graph)
+        estimates = {s.name: estimate_schedule(graph, s, flops) for s in candidates}
+    if not estimates:
+        raise ValueError("sram_curve needs at least one candidate schedule")
+
+    peaks = sorted({est.sram.peak_bytes for est in estimates.values()})
+    points = peaks if peaks[0] == 0 else [0] + peaks
+    intervals: List[SramInterval] = []
+    for sram_bytes in points:
+        at_hw = replace(base_hw, sram_bytes=sram_bytes)
+        costs: Dict[str, ScheduleCost] = {n: e.cost_on(at_hw) for n, e in estimates.items()}
+        best, feasible, _ = _pick(costs, objective)
+        if intervals and intervals[-1].schedule == best.schedule and intervals[-1].feasible == feasible:
+            continue
+        if intervals:
+            intervals[-1] = replace(intervals[-1], sram_hi=sram_bytes)
+        intervals.append(
+            SramInterval(
+                sram_lo=sram_bytes,
+                sram_hi=None,
+                schedule=best.schedule,
+                dram_bytes=best.dram.total_bytes,
+                feasible=feasible,
+                latency_s=best.latency_s,
+            )
+        )
+    return SramCurve(intervals=tuple(intervals))
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import os
+import pickle
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+from .hardware import HardwareConfig
+from .ir import Graph
+from .pass_schedule import CompilationResult, run_schedule_pass
+from .schedule import Schedule
+
+
+# Bump when the cost model or the pickled CompilationResult layout changes in a
+# way that invalidates stored results.
+CACHE_SCHEMA_VERSION = 3
+
+
+def _canonical(obj: Any) -> Any:
+    """Deterministic, JSON-like form of IR values for hashing."""
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    if isinstance(obj, dict):
+        return ["dict", sorted((str(k), _canonical(v)) for k, v in obj.items())]
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(v) for v in obj]
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        fields = [f for f in dataclasses.fields(obj) if f.compare]
+        return [type(obj).__name__, [(f.name, _canonical(getattr(obj, f.name))) for f in fields]]
+    return ["repr", repr(obj)]
+
+
+def _digest(obj: Any) -> bytes:
+    return hashlib.sha256(repr(_canonical(obj)).encode("utf-8")).digest()
+
+
+def _graph_body_digest(graph: Graph) -> bytes:
+    ops = [(op.name, op.inputs, op.outputs, op.attrs) for op in graph.walk_ops()]
+    inputs = sorted(graph.inputs.items())
+    return _digest((ops, inputs))
+
+
+def structural_hash(
+    graph: Graph,
+    hw: HardwareConfig,
+    candidates: Optional[Sequence[Schedule]] = None,
+    **pass_kwargs: Any,
+) -> str:
+    """Content hash of everything ``run_schedule_pass`` depends on.
+
+    The op/input part is memoized on the graph per structural version, so
+    repeated lookups of an unchanged graph only hash the small remainder.
+    Like the shape cache, the version only sees changes to ``graph.ops`` and
+    ``graph.inputs`` themselves. After editing an op's ``attrs``, ``inputs``
+    or ``outputs`` in place, call ``graph.invalidate_shapes()``, or this
+    returns the old key and ``cached_run_schedule_pass`` the old result.
+    """
+    body = graph._memoized("structural_hash", lambda: _graph_body_digest(graph))
+    h = hashlib.sha256()
+    h.update(str(CACHE_SCHEMA_VERSION).encode())
+    h.update(body)
+    h.update(_digest((graph.outputs, hw, candidates, sorted(pass_kwargs.items()))))
+    return h.hexdigest()
+
+
+class CompilationCache:
+    """Size-bounded, LRU-evicting on-disk cache of ``CompilationResult``.
+
+    Entries live in a SQLite database in WAL mode, so several processes can
+    share one cache file. A small in-process LRU sits in front of it to make
+    repeated lookups from the same process cheap. Hits on that LRU still
+    count as accesses for on-disk eviction: they are written back in one
+    batch at most every ``touch_interval_s`` seconds, and before any eviction
+    or close.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        memory_entries: int = 1024,
+        timeout_s: float = 30.0,
+        touch_interval_s: float = 1.0,
+    ) -> None:
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.timeout_s = timeout_s
+        self.touch_interval_s = touch_interval_s
+        self._memory: "OrderedDict[str, CompilationResult]" = OrderedDict()
+        # last_access times of in-memory hits not yet written to SQLite.
+        self._touched: Dict[str, float] = {}
+        self._last_flush = time.monotonic()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = -1
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite connections must not cross a fork.
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout_s, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL,"
+                " size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries(last_access)")
+            self._conn = conn
+            self._pid = os.getpid()
+            self._memory.clear()
+            self._touched.clear()
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None and self._pid == os.getpid():
+            self._flush_touches(self._conn)
+            self._conn.close()
+        self._conn = None
+
+    def __enter__(self) -> "CompilationCache":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _remember(self, key: str, result: CompilationResult) -> None:
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[CompilationResult]:
+        result = self._memory.get(key)
+        if result is not None:
+            self._memory.move_to_end(key)
+            self._touched[key] = time.time()
+            if time.monotonic() - self._last_flush >= self.touch_interval_s:
+                self._flush_touches(self._connect())
+            return result
+        conn = self._connect()
+        row = conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+        result = pickle.loads(row[0])
+        self._remember(key, result)
+        return result
+
+    def _flush_touches(self, conn: sqlite3.Connection) -> None:
+        if self._touched:
+            conn.executemany(
+                "UPDATE entries SET last_access = MAX(last_access, ?) WHERE key = ?",
+                [(t, key) for key, t in self._touched.items()],
+            )
+            self._touched.clear()
+        self._last_flush = time.monotonic()
+
+    def put(self, key: str, result: CompilationResult) -> None:
+        blob = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._flush_touches(conn)
+            conn.execute(
+                "INSERT OR REPLACE INTO entries(key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, blob, len(blob), time.time()),
+            )
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._remember(key, result)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_access"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM entries WHERE key = ?", evicted)
+        for (key,) in evicted:
+            self._memory.pop(key, None)
+
+    def __len__(self) -> int:
+        (n,) = self._connect().execute("SELECT COUNT(*) FROM entries").fetchone()
+        return int(n)
+
+    def total_bytes(self) -> int:
+        (n,) = self._connect().execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return int(n)
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM entries")
+        self._memory.clear()
+        self._touched.clear()
+
+
+def cached_run_schedule_pass(
+    graph: Graph,
+    hw: HardwareConfig,
+    cache: CompilationCache,
+    candidates: Optional[Iterable[Schedule]] = None,
+    **pass_kwargs: Any,
+) -> CompilationResult:
+    """``run_schedule_pass`` backed by ``cache``; keyword options are part of the key.
+
+    The key is ``structural_hash``: call ``graph.invalidate_shapes()`` after
+    editing ops in place, or a stale result comes back.
+    """
+    candidate_list = list(candidates) if candidates is not None else None
+    key = structural_hash(graph, hw, candidate_list, **pass_kwargs)
+    result = cache.get(key)
+    if result is None:
+        result = run_schedule_pass(graph, hw, candidate_list, **pass_kwargs)
+        cache.put(key, result)
+    return result
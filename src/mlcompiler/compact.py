@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple, Union
+
+from .ir import Graph, Op, Tensor, _dtype_bytes
+
+
+_Dtype = Union[str, int]
+
+
+class CompactGraph:
+    """Struct-of-arrays form of ``Graph`` for very large graphs.
+
+    Tensors are integer IDs numbered inputs first, then op outputs in
+    production order. Op kinds, dtypes and identical ``attrs`` dicts are
+    interned. Op operands and tensor shapes are stored CSR-style in flat
+    ``array`` buffers: ``op_in[op_in_ptr[i]:op_in_ptr[i + 1]]`` are op
+    ``i``'s input IDs, and likewise for outputs and shape dims.
+
+    Instances are immutable; shapes are inferred once on first use.
+    """
+
+    __slots__ = (
+        "tensor_names",
+        "kind_names",
+        "attr_table",
+        "dtype_table",
+        "op_kind",
+        "op_attr",
+        "op_in_ptr",
+        "op_in",
+        "op_out_ptr",
+        "op_out",
+        "input_ids",
+        "output_ids",
+        "shape_ptr",
+        "shape_dims",
+        "dtype_code",
+        "_nbytes",
+        "_ordered",
+    )
+
+    def __init__(
+        self,
+        tensor_names: List[str],
+        kind_names: List[str],
+        attr_table: List[Dict[str, object]],
+        dtype_table: List[_Dtype],
+        op_kind: array,
+        op_attr: array,
+        op_in_ptr: array,
+        op_in: array,
+        op_out_ptr: array,
+        op_out: array,
+        input_ids: array,
+        output_ids: array,
+        input_shapes: Sequence[Tuple[int, ...]],
+        input_dtypes: array,
+    ) -> None:
+        self.tensor_names = tensor_names
+        self.kind_names = kind_names
+        self.attr_table = attr_table
+        self.dtype_table = dtype_table
+        self.op_kind = op_kind
+        self.op_attr = op_attr
+        self.op_in_ptr = op_in_ptr
+        self.op_in = op_in
+        self.op_out_ptr = op_out_ptr
+        self.op_out = op_out
+        self.input_ids = input_ids
+        self.output_ids = output_ids
+        # Until inference runs, only the graph inputs have shapes.
+        self.shape_ptr = array("q", [0])
+        self.shape_dims = array("q")
+        for shape in input_shapes:
+            self.shape_dims.extend(int(d) for d in shape)
+            self.shape_ptr.append(len(self.shape_dims))
+        self.dtype_code = input_dtypes
+        self._nbytes: Optional[array] = None
+        self._ordered: Optional[bool] = None
+
+    @property
+    def num_ops(self) -> int:
+        return len(self.op_kind)
+
+    @property
+    def num_tensors(self) -> int:
+        return len(self.tensor_names)
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> "CompactGraph":
+        names: List[str] = []
+        ids: Dict[str, int] = {}
+
+        def tid(name: str) -> int:
+            if name not in ids:
+                ids[name] = len(names)
+                names.append(name)
+            return ids[name]
+
+        for name in graph.inputs:
+            tid(name)
+        for op in graph.ops:
+            for name in op.outputs:
+                tid(name)
+
+        kinds: Dict[str, int] = {}
+        kind_names: List[str] = []
+        attrs_ids: Dict[Hashable, int] = {}
+        attr_table: List[Dict[str, object]] = []
+        op_kind, op_attr = array("H"), array("l")
+        op_in_ptr, op_in = array("q", [0]), array("q")
+        op_out_ptr, op_out = array("q", [0]), array("q")
+        for op in graph.ops:
+            if op.name not in kinds:
+                kinds[op.name] = len(kind_names)
+                kind_names.append(op.name)
+            op_kind.append(kinds[op.name])
+            try:
+                key: Optional[Hashable] = tuple(sorted(op.attrs.items()))
+                hash(key)
+            except TypeError:
+                key = None
+            if key is None or key not in attrs_ids:
+                attr_table.append(dict(op.attrs))
+                if key is not None:
+                    attrs_ids[key] = len(attr_table) - 1
+                op_attr.append(len(attr_table) - 1)
+            else:
+                op_attr.append(attrs_ids[key])
+            op_in.extend(tid(name) for name in op.inputs)
+            op_in_ptr.append(len(op_in))
+            op_out.extend(tid(name) for name in op.outputs)
+            op_out_ptr.append(len(op_out))
+
+        dtype_ids: Dict[_Dtype, int] = {}
+        dtype_table: List[_Dtype] = []
+        input_dtypes = array("H")
+        for tensor in graph.inputs.values():
+            if tensor.dtype not in dtype_ids:
+                dtype_ids[tensor.dtype] = len(dtype_table)
+                dtype_table.append(tensor.dtype)
+            input_dtypes.append(dtype_ids[tensor.dtype])
+
+        return cls(
+            tensor_names=names,
+            kind_names=kind_names,
+            attr_table=attr_table,
+            dtype_table=dtype_table,
+            op_kind=op_kind,
+            op_attr=op_attr,
+            op_in_ptr=op_in_ptr,
+            op_in=op_in,
+            op_out_ptr=op_out_ptr,
+            op_out=op_out,
+            input_ids=array("q", range(len(graph.inputs))),
+            output_ids=array("q", (tid(name) for name in graph.outputs)),
+            input_shapes=[t.shape for t in graph.inputs.values()],
+            input_dtypes=input_dtypes,
+        )
+
+    def to_graph(self) -> Graph:
+        names = self.tensor_names
+        inputs = {
+            names[t]: Tensor(self._input_shape(i), self.dtype_table[self.dtype_code[i]])
+            for i, t in enumerate(self.input_ids)
+        }
+        ops = []
+        for i in range(self.num_ops):
+            ops.append(
+                Op(
+                    name=self.kind_names[self.op_kind[i]],
+                    inputs=[names[t] for t in self.op_inputs(i)],
+                    outputs=[names[t] for t in self.op_outputs(i)],
+                    attrs=dict(self.attr_table[self.op_attr[i]]),
+                )
+            )
+        return Graph(ops=ops, inputs=inputs, outputs=[names[t] for t in self.output_ids])
+
+    def is_topologically_ordered(self) -> bool:
+        """True if every op only reads graph inputs or outputs of earlier ops."""
+        if self._ordered is None:
+            available = bytearray(self.num_tensors)
+            for t in self.input_ids:
+                available[t] = 1
+            ordered = True
+            for i in range(self.num_ops):
+                if not all(available[t] for t in self.op_inputs(i)):
+                    ordered = False
+                    break
+                for t in self.op_outputs(i):
+                    available[t] = 1
+            self._ordered = ordered
+        return self._ordered
+
+    def op_inputs(self, i: int) -> array:
+        return self.op_in[self.op_in_ptr[i] : self.op_in_ptr[i + 1]]
+
+    def op_outputs(self, i: int) -> array:
+        return self.op_out[self.op_out_ptr[i] : self.op_out_ptr[i + 1]]
+
+    def _input_shape(self, i: int) -> Tuple[int, ...]:
+        # Input tensors always occupy the first shape slots.
+        return tuple(self.shape_dims[self.shape_ptr[i] : self.shape_ptr[i + 1]])
+
+    def infer_shapes(self) -> None:
+        """Fill ``shape_ptr``/``shape_dims``/``dtype_code`` for every tensor."""
+        if self._nbytes is not None:
+            return
+        n_inputs = len(self.input_ids)
+        shapes: List[Optional[Tuple[int, ...]]] = [None] * self.num_tensors
+        dtypes: List[Optional[_Dtype]] = [None] * self.num_tensors
+        for i in range(n_inputs):
+            shapes[i] = self._input_shape(i)
+            dtypes[i] = self.dtype_table[self.dtype_code[i]]
+
+        names = self.tensor_names
+        for i in range(self.num_ops):
+            kind = self.kind_names[self.op_kind[i]]
+            attrs = self.attr_table[self.op_attr[i]]
+            in_ids = self.op_inputs(i)
+            out_ids = self.op_outputs(i)
+            for t in in_ids:
+                if shapes[t] is None:
+                    raise KeyError(f"Op {kind} missing input tensor {names[t]!r}")
+            # Dtype overrides from the precision pass go through the reference rules.
+            plain = "storage_dtype" not in attrs and "compute_dtype" not in attrs
+            if plain and kind == "GELU" and in_ids and len(out_ids) == 1:
+                shapes[out_ids[0]] = shapes[in_ids[0]]
+                dtypes[out_ids[0]] = dtypes[in_ids[0]]
+                continue
+            if plain and kind == "Linear" and in_ids and len(out_ids) == 1 and "dtype" not in attrs:
+                shape = shapes[in_ids[0]]
+                assert shape is not None
+                in_features = int(attrs.get("in_features", -1))  # type: ignore[arg-type]
+                if shape and shape[-1] == in_features and "out_features" in attrs:
+                    shapes[out_ids[0]] = shape[:-1] + (int(attrs["out_features"]),)  # type: ignore[arg-type]
+                    dtypes[out_ids[0]] = dtypes[in_ids[0]]
+                    continue
+            # Anything unusual goes through the reference rules (and their errors).
+            op = Op(kind, [names[t] for t in in_ids], [names[t] for t in out_ids], attrs)
+            outs = op.infer_output_tensors(
+                [Tensor(shapes[t], dtypes[t]) for t in in_ids]  # type: ignore[arg-type]
+            )
+            if len(outs) != len(out_ids):
+                raise ValueError(
+                    f"Op {kind} produced {len(outs)} outputs, "
+                    f"but outputs list has {len(out_ids)} names"
+                )
+            for t, tensor in zip(out_ids, outs):
+                shapes[t] = tensor.shape
+                dtypes[t] = tensor.dtype
+
+        dtype_ids = {d: k for k, d in enumerate(self.dtype_table)}
+        shape_ptr, shape_dims = array("q", [0]), array("q")
+        dtype_code, nbytes = array("H"), array("q")
+        for t in range(self.num_tensors):
+            shape, dtype = shapes[t], dtypes[t]
+            if shape is None:
+                # Dangling name (e.g. an output nobody produces).
+                shape_ptr.append(len(shape_dims))
+                dtype_code.append(0)
+                nbytes.append(0)
+                continue
+            shape_dims.extend(shape)
+            shape_ptr.append(len(shape_dims))
+            if dtype not in dtype_ids:
+                dtype_ids[dtype] = len(self.dtype_table)
+                self.dtype_table.append(dtype)  # type: ignore[arg-type]
+            dtype_code.append(dtype_ids[dtype])  # type: ignore[index]
+            elems = 1
+            for d in shape:
+                elems *= d
+            nbytes.append(elems * _dtype_bytes(dtype))  # type: ignore[arg-type]
+        self.shape_ptr, self.shape_dims = shape_ptr, shape_dims
+        self.dtype_code = dtype_code
+        self._nbytes = nbytes
+
+    def nbytes(self) -> array:
+        """Bytes per tensor ID (after inference)."""
+        self.infer_shapes()
+        assert self._nbytes is not None
+        return self._nbytes
+
+    def shape(self, t: int) -> Tuple[int, ...]:
+        self.infer_shapes()
+        return tuple(self.shape_dims[self.shape_ptr[t] : self.shape_ptr[t + 1]])
+
+    def tensor(self, t: int) -> Tensor:
+        self.infer_shapes()
+        return Tensor(self.shape(t), self.dtype_table[self.dtype_code[t]])
+
+    def intermediate_ids(self) -> List[int]:
+        """Op outputs that are not graph outputs, in production order."""
+        outputs = set(self.output_ids)
+        return [t for t in self.op_out if t not in outputs]
+
+    def live_ranges(self) -> Tuple[array, array, array]:
+        """(tensor IDs, first op, last op) for each intermediate."""
+        outputs = set(self.output_ids)
+        start = array("q", [-1]) * self.num_tensors
+        end = array("q", [-1]) * self.num_tensors
+        ids = array("q")
+        for i in range(self.num_ops):
+            for t in self.op_in[self.op_in_ptr[i] : self.op_in_ptr[i + 1]]:
+                if start[t] >= 0:
+                    end[t] = i
+            for t in self.op_out[self.op_out_ptr[i] : self.op_out_ptr[i + 1]]:
+                if t in outputs:
+                    continue
+                if start[t] < 0:
+                    ids.append(t)
+                start[t] = i
+                end[t] = i
+        return ids, start, end
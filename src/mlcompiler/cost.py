@@ -1,12 +1,22 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, Optional, Tuple
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Union
 
-from .hardware import HardwareConfig
-from .ir import Graph, Tensor
+from .compact import CompactGraph
+from .hardware import HardwareConfig, MemoryLevel
+from .ir import OP_RULES, Graph, Op, Tensor, _dtype_bytes
+from .fusion import split_by_groups
+from .liveness import LiveRange, compute_live_ranges, live_bytes_timeline, peak_residency
+from .ops import GELU_FLOPS_PER_ELEM, conversion_flops
+from .profiling import count, span
+from .remat import remat_layout
 from .schedule import MEMORY_AWARE_SCHEDULE, NAIVE_SCHEDULE, Schedule
 
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import ArrayLike
+
 
 def _prod(shape: Tuple[int, ...]) -> int:
     n = 1
@@ -15,6 +25,22 @@ def _prod(shape: Tuple[int, ...]) -> int:
     return n
 
 
+def _ceil_div(a: int, b: int) -> int:
+    return -(-a // b)
+
+
+def _tile_elems(shape: Tuple[int, ...], tile_shape: Tuple[int, ...]) -> int:
+    """Elements of ``shape`` in one tile.
+
+    ``tile_shape[0]`` counts rows with every leading dimension flattened into
+    one, as ``_tile_rereads`` does; ``tile_shape[-1]`` counts features.
+    """
+    if not shape:
+        return 1
+    rows = min(int(tile_shape[0]), _prod(shape[:-1]))
+    return rows * min(int(tile_shape[-1]), int(shape[-1]))
+
+
 def _effective_bytes(tensor: Tensor, tile_shape: Optional[Tuple[int, ...]]) -> int:
     full_bytes = tensor.nbytes()
     if tile_shape is None:
@@ -23,15 +49,23 @@ def _effective_bytes(tensor: Tensor, tile_shape: Optional[Tuple[int, ...]]) -> i
     if full_elems == 0:
         return 0
     bytes_per_elem = full_bytes // full_elems
-    tile_elems = _prod(tile_shape)
-    tile_bytes = tile_elems * bytes_per_elem
+    tile_bytes = _tile_elems(tensor.shape, tile_shape) * bytes_per_elem
     return min(full_bytes, tile_bytes)
 
 
+def _row_tile_bytes(tensor: Tensor, row_tile: int) -> int:
+    if not tensor.shape:
+        return tensor.nbytes()
+    return _effective_bytes(tensor, (row_tile, int(tensor.shape[-1])))
+
+
 @dataclass(frozen=True)
 class DramEstimate:
     total_bytes: int
     breakdown: Dict[str, int]
+    # Off-chip traffic per memory level; only filled for a hierarchy (see
+    # ``HardwareConfig.memory_levels``). Sums to ``total_bytes``.
+    by_level: Dict[str, int] = field(default_factory=dict)
 
     def __str__(self) -> str:
         parts = ", ".join(f"{k}={v}" for k, v in self.breakdown.items())
@@ -42,12 +76,27 @@ class DramEstimate:
 class SramEstimate:
     peak_bytes: int
     breakdown: Dict[str, int]
+    live_at_peak: Dict[str, int] = field(default_factory=dict)
+    peak_op_index: Optional[int] = None
+    # Peak bytes of spilled intermediates resident in each bounded off-chip
+    # level; only filled for a hierarchy.
+    level_peaks: Dict[str, int] = field(default_factory=dict)
 
     def __str__(self) -> str:
         parts = ", ".join(f"{k}={v}" for k, v in self.breakdown.items())
         return f"SRAM(peak={self.peak_bytes}, {parts})"
 
 
+@dataclass(frozen=True)
+class FlopEstimate:
+    total_flops: int
+    breakdown: Dict[str, int]
+
+    def __str__(self) -> str:
+        parts = ", ".join(f"{k}={v}" for k, v in self.breakdown.items())
+        return f"FLOPs(total={self.total_flops}, {parts})"
+
+
 @dataclass(frozen=True)
 class ScheduleCost:
     schedule: Schedule
@@ -55,20 +104,309 @@ class ScheduleCost:
     sram: SramEstimate
     feasible: bool
     penalized_cost: int
+    flops: Optional[FlopEstimate] = None
+    # Roofline estimate; None when the hardware has no bandwidth/compute figures.
+    latency_s: Optional[float] = None
+    # Sum over memory levels of traffic / bandwidth; None without a hierarchy
+    # or when a level has no bandwidth.
+    memory_time_s: Optional[float] = None
 
     def __str__(self) -> str:
         feas = "feasible" if self.feasible else "infeasible"
         return f"{self.schedule.name}: {feas}, dram={self.dram.total_bytes}, peak_sram={self.sram.peak_bytes}"
 
 
-def estimate_dram_bytes(graph: Graph, schedule: Schedule) -> DramEstimate:
-    tensors = graph.infer_shapes()
+def _op_flops(op: Op, ins: Sequence[Tensor], outs: Sequence[Tensor]) -> int:
+    rule = OP_RULES.get(op.name)
+    if rule is None:
+        raise NotImplementedError(f"FLOP count not implemented for op {op.name!r}")
+    return rule.flops(op, ins, outs) + conversion_flops(op, ins, outs)
+
+
+def _param_bytes(op: Op, ins: Sequence[Tensor], outs: Sequence[Tensor]) -> int:
+    rule = OP_RULES.get(op.name)
+    return rule.param_bytes(op, ins, outs) if rule is not None else 0
+
+
+def estimate_flops(graph: Union[Graph, CompactGraph]) -> FlopEstimate:
+    """Per-op arithmetic, keyed by each op's first output tensor.
+
+    FLOPs depend on the graph alone, so for a ``Graph`` the estimate is
+    memoized per structural version; treat it as read-only.
+    """
+    if isinstance(graph, CompactGraph):
+        return _compact_flops(graph)
+    return graph._memoized("flops", lambda: _graph_flops(graph))
+
+
+def _graph_flops(graph: Graph) -> FlopEstimate:
+    tensors = graph.shape_table()
+    breakdown: Dict[str, int] = {}
+    for op in graph.walk_ops():
+        ins = [tensors[name] for name in op.inputs]
+        outs = [tensors[name] for name in op.outputs]
+        key = op.outputs[0] if op.outputs else op.name
+        breakdown[key] = _op_flops(op, ins, outs)
+    return FlopEstimate(total_flops=sum(breakdown.values()), breakdown=breakdown)
+
+
+def roofline_latency_s(
+    dram_bytes: int, flops: int, hw: HardwareConfig
+) -> Optional[float]:
+    """max(memory time, compute time), or None if either rate is unset."""
+    if not hw.dram_bandwidth_GBs or not hw.compute_Gops:
+        return None
+    memory_s = dram_bytes / (hw.dram_bandwidth_GBs * 1e9)
+    compute_s = flops / (hw.compute_Gops * 1e9)
+    return max(memory_s, compute_s)
+
+
+@dataclass(frozen=True)
+class LevelPlacement:
+    """Where spilled intermediates live in an off-chip memory hierarchy.
+
+    ``level_of`` maps each spilled tensor to a level name. Graph inputs,
+    outputs and tile re-reads always go to the backing (last) level.
+    """
+
+    levels: Tuple[MemoryLevel, ...]
+    level_of: Dict[str, str]
+    spilled_bytes: Dict[str, int]
+    peaks: Dict[str, int]
+
+    def traffic(self, total_bytes: int) -> Dict[str, int]:
+        """Bytes moved to and from each level, given the schedule's total DRAM bytes."""
+        by_level = {lvl.name: 2 * self.spilled_bytes.get(lvl.name, 0) for lvl in self.levels}
+        backing = self.levels[-1].name
+        by_level[backing] = total_bytes - sum(
+            v for name, v in by_level.items() if name != backing
+        )
+        return by_level
+
+    def memory_time_s(self, by_level: Dict[str, int]) -> Optional[float]:
+        if not all(lvl.bandwidth_GBs for lvl in self.levels):
+            return None
+        return sum(
+            by_level[lvl.name] / (lvl.bandwidth_GBs * 1e9)  # type: ignore[operator]
+            for lvl in self.levels
+        )
+
+
+def place_spills(
+    spills: Sequence[LiveRange], num_ops: int, hw: HardwareConfig
+) -> LevelPlacement:
+    """Assign each spilled intermediate to the innermost level with room for it.
+
+    Tensors are placed greedily in production order. A level has room when
+    its resident bytes stay within capacity over the tensor's whole live
+    range; the unbounded backing level always has room.
+    """
+    levels = hw.levels()
+    resident = [[0] * num_ops for _ in levels[:-1]]
+    level_of: Dict[str, str] = {}
+    spilled_bytes: Dict[str, int] = {}
+    for r in sorted(spills, key=lambda r: r.start):
+        chosen = len(levels) - 1
+        for i, lvl in enumerate(levels[:-1]):
+            window = resident[i][r.start : r.end + 1]
+            if max(window, default=0) + r.nbytes <= lvl.capacity_bytes:  # type: ignore[operator]
+                for t in range(r.start, r.end + 1):
+                    resident[i][t] += r.nbytes
+                chosen = i
+                break
+        name = levels[chosen].name
+        level_of[r.name] = name
+        spilled_bytes[name] = spilled_bytes.get(name, 0) + r.nbytes
+    peaks = {lvl.name: max(resident[i], default=0) for i, lvl in enumerate(levels[:-1])}
+    return LevelPlacement(levels, level_of, spilled_bytes, peaks)
+
+
+def _intermediate_ranges(graph: Graph) -> Tuple[LiveRange, ...]:
+    return graph._memoized("live_ranges", lambda: tuple(compute_live_ranges(graph)))
+
+
+def spilled_ranges(
+    graph: Union[Graph, CompactGraph], schedule: Schedule
+) -> Tuple[LiveRange, ...]:
+    """Intermediates ``schedule`` writes off-chip and reads back, with their live ranges."""
+    if isinstance(graph, CompactGraph):
+        if schedule.strategy == "naive":
+            nbytes = graph.nbytes()
+            ids, start, end = graph.live_ranges()
+            names = graph.tensor_names
+            return tuple(LiveRange(names[t], start[t], end[t], nbytes[t]) for t in ids)
+        if schedule.strategy == "memory_aware":
+            return ()
+        return spilled_ranges(graph.to_graph(), schedule)
+    if schedule.strategy == "naive":
+        return _intermediate_ranges(graph)
+    if schedule.strategy == "memory_aware":
+        return ()
+    if schedule.strategy == "fusion_groups" and schedule.fusion_groups is not None:
+        _, materialized = split_by_groups(
+            _intermediate_ranges(graph), schedule.fusion_groups, len(graph.ops)
+        )
+        return tuple(materialized)
+    if schedule.strategy == "remat" and schedule.remat is not None:
+        return remat_layout(graph, dict(schedule.remat)).spilled
+    raise ValueError(f"Unknown schedule {schedule.name!r}")
+
+
+def _num_ops(graph: Union[Graph, CompactGraph]) -> int:
+    return graph.num_ops if isinstance(graph, CompactGraph) else len(graph.ops)
+
+
+def schedule_latency_s(
+    schedule: Schedule, memory_s: Optional[float], compute_s: Optional[float], steps: int = 1
+) -> Optional[float]:
+    """Latency of ``schedule`` given its total transfer and compute times.
+
+    Untiled schedules use the roofline bound ``max(memory, compute)``. A
+    single-buffered tiled schedule waits for each tile before computing on
+    it, so its ``steps`` tiles cost ``memory + compute``. With two or more
+    buffers the next tile loads while the current one computes: the steady
+    state runs at the slower of the two, plus one tile of the faster one to
+    fill and drain the pipeline.
+    """
+    if memory_s is None or compute_s is None:
+        return None
+    if schedule.tile_shape is None:
+        return max(memory_s, compute_s)
+    if schedule.buffers < 2:
+        return memory_s + compute_s
+    return max(memory_s, compute_s) + min(memory_s, compute_s) / max(1, steps)
+
+
+def tile_steps(graph: Union[Graph, CompactGraph], schedule: Schedule) -> int:
+    """Number of tiles a tiled schedule steps through; 1 for untiled schedules."""
+    if schedule.tile_shape is None:
+        return 1
+    if isinstance(graph, CompactGraph):
+        graph = graph.to_graph()
+    tensors = graph.shape_table()
+    outputs = set(graph.outputs)
+    row_tile = max(1, int(schedule.tile_shape[0]))
+    feat_tile = max(1, int(schedule.tile_shape[-1]))
+    steps = 1
+    for op in graph.walk_ops():
+        for name in op.outputs:
+            shape = tensors[name].shape
+            if name in outputs or len(shape) < 2:
+                continue
+            steps = max(
+                steps,
+                _ceil_div(_prod(shape[:-1]), row_tile) * _ceil_div(int(shape[-1]), feat_tile),
+            )
+    return steps
+
+
+def prefetch_bytes(graph: Union[Graph, CompactGraph], schedule: Schedule) -> int:
+    """SRAM for the extra tile buffers of a pipelined schedule.
+
+    Each extra buffer holds one step's share of the schedule's DRAM traffic.
+    """
+    if schedule.buffers < 2 or schedule.tile_shape is None:
+        return 0
+    per_step = _ceil_div(_dram_bytes(graph, schedule).total_bytes, tile_steps(graph, schedule))
+    return (schedule.buffers - 1) * per_step
+
+
+def _io_tiles(graph: Graph, tile_shape: Tuple[int, ...]) -> List[LiveRange]:
+    """Row tiles of graph inputs and outputs that a tiled schedule keeps on-chip.
+
+    Every op holds a ``tile_shape[0]``-row tile of each graph input it reads.
+    An intermediate wider than ``tile_shape[-1]`` is produced one feature
+    chunk at a time; elementwise readers keep it chunked, and any other
+    reader accumulates its whole output row tile over the chunks. Such an
+    accumulator stays resident for the entire chunk loop, from the op that
+    started it; a chunked graph output only needs its current chunk.
+    """
+    tensors = graph.shape_table()
+    outputs = set(graph.outputs)
+    row_tile = max(1, int(tile_shape[0]))
+    feat_tile = max(1, int(tile_shape[-1]))
+    loop_start: Dict[str, int] = {}
+    ranges: List[LiveRange] = []
+    for idx, op in enumerate(graph.walk_ops()):
+        for name in dict.fromkeys(op.inputs):
+            if name in graph.inputs:
+                ranges.append(LiveRange(name, idx, idx, _row_tile_bytes(tensors[name], row_tile)))
+        starts = [loop_start[n] for n in op.inputs if n in loop_start]
+        rule = OP_RULES.get(op.name)
+        chunked = bool(starts) and rule is not None and rule.elementwise
+        start = min(starts, default=idx)
+        for name in op.outputs:
+            t = tensors[name]
+            if name in outputs:
+                if chunked:
+                    ranges.append(LiveRange(name, idx, idx, _effective_bytes(t, tile_shape)))
+                else:
+                    ranges.append(LiveRange(name, start, idx, _row_tile_bytes(t, row_tile)))
+            elif (chunked or not starts) and t.shape and int(t.shape[-1]) > feat_tile:
+                loop_start[name] = start
+    return ranges
+
+
+def _tile_rereads(graph: Graph, tile_shape: Tuple[int, ...]) -> Tuple[int, int]:
+    """Extra DRAM bytes a tiled schedule spends re-reading weights and inputs.
+
+    ``tile_shape[0]`` tiles the rows (all leading dimensions, flattened) and
+    ``tile_shape[-1]`` the feature dimension. Every row tile streams the weights again, and every
+    feature tile of the intermediates streams the graph inputs again.
+    """
+    tensors = graph.shape_table()
+    outputs = set(graph.outputs)
+    row_tile = max(1, int(tile_shape[0]))
+    feat_tile = max(1, int(tile_shape[-1]))
+
+    weight_reread = 0
+    feat_tiles = 1
+    for op in graph.walk_ops():
+        if not op.outputs:
+            continue
+        out = tensors[op.outputs[0]]
+        params = _param_bytes(
+            op, [tensors[n] for n in op.inputs], [tensors[n] for n in op.outputs]
+        )
+        if params and out.shape:
+            rows = _prod(out.shape[:-1])
+            weight_reread += (_ceil_div(rows, row_tile) - 1) * params
+        for name in op.outputs:
+            shape = tensors[name].shape
+            if name not in outputs and shape:
+                feat_tiles = max(feat_tiles, _ceil_div(int(shape[-1]), feat_tile))
+
+    input_bytes = sum(t.nbytes() for t in graph.inputs.values())
+    return weight_reread, (feat_tiles - 1) * input_bytes
+
+
+def estimate_dram_bytes(
+    graph: Union[Graph, CompactGraph],
+    schedule: Schedule,
+    hw: Optional[HardwareConfig] = None,
+) -> DramEstimate:
+    """Off-chip traffic of ``schedule``.
+
+    When ``hw`` has ``memory_levels``, spilled intermediates are placed with
+    ``place_spills`` and ``by_level`` splits the total across the levels.
+    """
+    est = _dram_bytes(graph, schedule)
+    if hw is None or not hw.memory_levels:
+        return est
+    placement = place_spills(spilled_ranges(graph, schedule), _num_ops(graph), hw)
+    return replace(est, by_level=placement.traffic(est.total_bytes))
+
+
+def _dram_bytes(graph: Union[Graph, CompactGraph], schedule: Schedule) -> DramEstimate:
+    if isinstance(graph, CompactGraph):
+        return _compact_dram_bytes(graph, schedule)
+    tensors = graph.shape_table()
 
     input_read = sum(t.nbytes() for t in graph.inputs.values())
     output_write = sum(tensors[name].nbytes() for name in graph.outputs)
 
     inter_bytes = 0
-    if schedule.name == "naive":
+    if schedule.strategy == "naive":
         for op in graph.walk_ops():
             for out_name in op.outputs:
                 if out_name in graph.outputs:
@@ -85,7 +423,7 @@ def estimate_dram_bytes(graph: Graph, schedule: Schedule) -> DramEstimate:
         }
         return DramEstimate(total_bytes=total, breakdown=breakdown)
 
-    if schedule.name == "memory_aware":
+    if schedule.strategy == "memory_aware":
         total = input_read + output_write
         breakdown = {
             "input_read": input_read,
@@ -93,61 +431,599 @@ def estimate_dram_bytes(graph: Graph, schedule: Schedule) -> DramEstimate:
             "intermediate_read": 0,
             "output_write": output_write,
         }
+        if schedule.tile_shape is not None:
+            weight_reread, input_reread = _tile_rereads(graph, schedule.tile_shape)
+            breakdown["weight_reread"] = weight_reread
+            breakdown["input_reread"] = input_reread
+            total += weight_reread + input_reread
+        return DramEstimate(total_bytes=total, breakdown=breakdown)
+
+    if schedule.strategy == "fusion_groups" and schedule.fusion_groups is not None:
+        _, materialized = split_by_groups(
+            _intermediate_ranges(graph), schedule.fusion_groups, len(graph.ops)
+        )
+        inter_bytes = sum(r.nbytes for r in materialized)
+        total = input_read + output_write + 2 * inter_bytes
+        breakdown = {
+            "input_read": input_read,
+            "intermediate_write": inter_bytes,
+            "intermediate_read": inter_bytes,
+            "output_write": output_write,
+        }
+        return DramEstimate(total_bytes=total, breakdown=breakdown)
+
+    if schedule.strategy == "remat" and schedule.remat is not None:
+        layout = remat_layout(graph, dict(schedule.remat))
+        inter_bytes = sum(r.nbytes for r in layout.spilled)
+        total = input_read + output_write + 2 * inter_bytes + layout.reread_bytes
+        breakdown = {
+            "input_read": input_read,
+            "intermediate_write": inter_bytes,
+            "intermediate_read": inter_bytes,
+            "output_write": output_write,
+            "recompute_reread": layout.reread_bytes,
+        }
         return DramEstimate(total_bytes=total, breakdown=breakdown)
 
     raise ValueError(f"Unknown schedule {schedule.name!r}")
 
 
-def estimate_peak_sram_bytes(graph: Graph, schedule: Schedule) -> SramEstimate:
-    tensors = graph.infer_shapes()
+def estimate_peak_sram_bytes(
+    graph: Union[Graph, CompactGraph],
+    schedule: Schedule,
+    hw: Optional[HardwareConfig] = None,
+) -> SramEstimate:
+    """Peak working-SRAM bytes of ``schedule``.
+
+    Weights stream through and are not counted. Untiled schedules count
+    intermediates only; tiled ones also hold row tiles of the graph inputs
+    and outputs (``io_row_tiles``, see ``_io_tiles``).
+
+    When ``hw`` has ``memory_levels``, ``level_peaks`` also reports how full
+    each bounded off-chip level gets with the spilled intermediates.
+    """
+    est = _peak_sram_bytes(graph, schedule)
+    if hw is None or not hw.memory_levels:
+        return est
+    placement = place_spills(spilled_ranges(graph, schedule), _num_ops(graph), hw)
+    return replace(est, level_peaks=placement.peaks)
+
+
+def _peak_sram_bytes(graph: Union[Graph, CompactGraph], schedule: Schedule) -> SramEstimate:
+    est = _working_sram_bytes(graph, schedule)
+    extra = prefetch_bytes(graph, schedule)
+    if not extra:
+        return est
+    return replace(
+        est,
+        peak_bytes=est.peak_bytes + extra,
+        breakdown=dict(est.breakdown, prefetch_buffers=extra),
+    )
 
-    if schedule.name == "naive":
+
+def _working_sram_bytes(graph: Union[Graph, CompactGraph], schedule: Schedule) -> SramEstimate:
+    if isinstance(graph, CompactGraph):
+        return _compact_peak_sram_bytes(graph, schedule)
+    tensors = graph.shape_table()
+
+    if schedule.strategy == "naive":
         all_bytes = [t.nbytes() for t in graph.inputs.values()]
         for t in tensors.values():
             all_bytes.append(t.nbytes())
         peak = max(all_bytes) if all_bytes else 0
         return SramEstimate(peak_bytes=peak, breakdown={"peak_single_tensor": peak})
 
-    if schedule.name == "memory_aware":
-        inter_resident = 0
-        for op in graph.walk_ops():
-            for out_name in op.outputs:
-                if out_name in graph.outputs:
-                    continue
-                inter_resident += _effective_bytes(
-                    tensors[out_name], schedule.tile_shape
-                )
-        breakdown = {"intermediate_resident": inter_resident}
+    if schedule.strategy == "memory_aware":
+        ranges = compute_live_ranges(
+            graph, lambda t: _effective_bytes(t, schedule.tile_shape)
+        )
         if schedule.tile_shape is not None:
+            ranges += _io_tiles(graph, schedule.tile_shape)
+        residency = peak_residency(ranges, len(graph.ops))
+        breakdown = {"intermediate_resident": residency.peak_bytes}
+        if schedule.tile_shape is not None:
+            io = sum(
+                nbytes
+                for name, nbytes in residency.live.items()
+                if name in graph.inputs or name in graph.outputs
+            )
+            breakdown["intermediate_resident"] -= io
+            breakdown["io_row_tiles"] = io
             breakdown["tile_shape_elems"] = _prod(schedule.tile_shape)
-        return SramEstimate(peak_bytes=inter_resident, breakdown=breakdown)
+        return SramEstimate(
+            peak_bytes=residency.peak_bytes,
+            breakdown=breakdown,
+            live_at_peak=residency.live,
+            peak_op_index=residency.op_index,
+        )
+
+    if schedule.strategy == "fusion_groups" and schedule.fusion_groups is not None:
+        internal, _ = split_by_groups(
+            _intermediate_ranges(graph), schedule.fusion_groups, len(graph.ops)
+        )
+        residency = peak_residency(internal, len(graph.ops))
+        return SramEstimate(
+            peak_bytes=residency.peak_bytes,
+            breakdown={"group_internal_resident": residency.peak_bytes},
+            live_at_peak=residency.live,
+            peak_op_index=residency.op_index,
+        )
+
+    if schedule.strategy == "remat" and schedule.remat is not None:
+        layout = remat_layout(graph, dict(schedule.remat))
+        residency = peak_residency(list(layout.resident), len(graph.ops))
+        return SramEstimate(
+            peak_bytes=residency.peak_bytes,
+            breakdown={"intermediate_resident": residency.peak_bytes},
+            live_at_peak=residency.live,
+            peak_op_index=residency.op_index,
+        )
 
     raise ValueError(f"Unknown schedule {schedule.name!r}")
 
 
+@dataclass(frozen=True)
+class ScheduleEstimate:
+    """Hardware-independent estimates for one schedule; ``cost_on`` adds feasibility."""
+
+    schedule: Schedule
+    dram: DramEstimate
+    sram: SramEstimate
+    flops: FlopEstimate
+    # Intermediates the schedule writes off-chip, for placing in memory levels.
+    spills: Tuple[LiveRange, ...] = ()
+    num_ops: int = 0
+    tile_steps: int = 1
+
+    def cost_on(self, hw: HardwareConfig, infeasible_penalty: int = 10**15) -> ScheduleCost:
+        feasible = self.sram.peak_bytes <= hw.sram_bytes
+        penalty = 0 if feasible else infeasible_penalty
+        dram, sram = self.dram, self.sram
+        memory_time = None
+        memory_s = None
+        if hw.memory_levels:
+            placement = place_spills(self.spills, self.num_ops, hw)
+            dram = replace(dram, by_level=placement.traffic(dram.total_bytes))
+            sram = replace(sram, level_peaks=placement.peaks)
+            memory_time = memory_s = placement.memory_time_s(dram.by_level)
+        elif hw.dram_bandwidth_GBs:
+            memory_s = dram.total_bytes / (hw.dram_bandwidth_GBs * 1e9)
+        compute_s = self.flops.total_flops / (hw.compute_Gops * 1e9) if hw.compute_Gops else None
+        latency = schedule_latency_s(self.schedule, memory_s, compute_s, self.tile_steps)
+        return ScheduleCost(
+            schedule=self.schedule,
+            dram=dram,
+            sram=sram,
+            feasible=feasible,
+            penalized_cost=dram.total_bytes + penalty,
+            flops=self.flops,
+            latency_s=latency,
+            memory_time_s=memory_time,
+        )
+
+
+def recompute_flops(graph: Union[Graph, CompactGraph], schedule: Schedule) -> Dict[str, int]:
+    """FLOPs a remat schedule spends recomputing intermediates, keyed by tensor."""
+    if schedule.remat is None:
+        return {}
+    if isinstance(graph, CompactGraph):
+        graph = graph.to_graph()
+    return {k: v for k, v in remat_layout(graph, dict(schedule.remat)).extra_flops.items() if v}
+
+
+def estimate_schedule(
+    graph: Union[Graph, CompactGraph],
+    schedule: Schedule,
+    flops: Optional[FlopEstimate] = None,
+) -> ScheduleEstimate:
+    """All estimates for one schedule.
+
+    ``flops`` is ``estimate_flops(graph)``, for callers that estimate many
+    candidates of one graph; it is computed here when omitted.
+    """
+    count("candidates_evaluated")
+    with span("estimate_dram_bytes", schedule=schedule.name):
+        dram = estimate_dram_bytes(graph, schedule)
+    with span("estimate_peak_sram_bytes", schedule=schedule.name):
+        sram = estimate_peak_sram_bytes(graph, schedule)
+    with span("estimate_flops"):
+        if flops is None:
+            flops = estimate_flops(graph)
+        extra = recompute_flops(graph, schedule)
+        if extra:
+            breakdown = dict(flops.breakdown)
+            for name, n in extra.items():
+                breakdown[name] = breakdown.get(name, 0) + n
+            flops = FlopEstimate(
+                total_flops=flops.total_flops + sum(extra.values()), breakdown=breakdown
+            )
+    return ScheduleEstimate(
+        schedule=schedule,
+        dram=dram,
+        sram=sram,
+        flops=flops,
+        spills=spilled_ranges(graph, schedule),
+        num_ops=_num_ops(graph),
+        tile_steps=tile_steps(graph, schedule),
+    )
+
+
 def evaluate_schedule(
-    graph: Graph,
+    graph: Union[Graph, CompactGraph],
     schedule: Schedule,
     hw: HardwareConfig,
     infeasible_penalty: int = 10**15,
 ) -> ScheduleCost:
-    dram = estimate_dram_bytes(graph, schedule)
-    sram = estimate_peak_sram_bytes(graph, schedule)
-    feasible = sram.peak_bytes <= hw.sram_bytes
-    penalty = 0 if feasible else infeasible_penalty
-    penalized = dram.total_bytes + penalty
-    return ScheduleCost(
-        schedule=schedule,
-        dram=dram,
-        sram=sram,
-        feasible=feasible,
-        penalized_cost=penalized,
+    return estimate_schedule(graph, schedule).cost_on(hw, infeasible_penalty)
+
+
+def _graph_totals(graph: Graph) -> Tuple[int, int, int, int, int]:
+    """(input + output bytes, intermediate bytes, naive peak, memory_aware peak, FLOPs)."""
+
+    def compute() -> Tuple[int, int, int, int, int]:
+        tensors = graph.shape_table()
+        io_bytes = sum(t.nbytes() for t in graph.inputs.values())
+        io_bytes += sum(tensors[name].nbytes() for name in graph.outputs)
+        ranges = _intermediate_ranges(graph)
+        inter_bytes = sum(r.nbytes for r in ranges)
+        naive_peak = max((t.nbytes() for t in tensors.values()), default=0)
+        timeline = live_bytes_timeline(ranges, len(graph.ops))
+        flops = estimate_flops(graph).total_flops
+        return io_bytes, inter_bytes, naive_peak, max(timeline, default=0), flops
+
+    return graph._memoized("schedule_totals", compute)
+
+
+def schedule_totals(graph: Union[Graph, CompactGraph], schedule: Schedule) -> Tuple[int, int]:
+    """(DRAM bytes, peak SRAM bytes) for ``schedule`` without building breakdowns.
+
+    Matches ``estimate_dram_bytes(...).total_bytes`` and
+    ``estimate_peak_sram_bytes(...).peak_bytes``. For a ``Graph``, the untiled
+    naive and memory_aware totals come from one memoized walk per structural
+    version; anything else goes through the full estimators.
+    """
+    if isinstance(graph, Graph) and schedule.tile_shape is None:
+        if schedule.strategy == "naive":
+            io_bytes, inter_bytes, naive_peak, _, _ = _graph_totals(graph)
+            return io_bytes + 2 * inter_bytes, naive_peak
+        if schedule.strategy == "memory_aware":
+            io_bytes, _, _, mem_peak, _ = _graph_totals(graph)
+            return io_bytes, mem_peak
+    return (
+        _dram_bytes(graph, schedule).total_bytes,
+        _peak_sram_bytes(graph, schedule).peak_bytes,
     )
 
 
-def evaluate_candidates(graph: Graph, hw: HardwareConfig) -> Dict[str, ScheduleCost]:
+def total_flops(graph: Union[Graph, CompactGraph]) -> int:
+    """``estimate_flops(graph).total_flops``, memoized per structural version for a ``Graph``."""
+    if isinstance(graph, Graph):
+        return _graph_totals(graph)[4]
+    return estimate_flops(graph).total_flops
+
+
+def evaluate_candidates(graph: Union[Graph, CompactGraph], hw: HardwareConfig) -> Dict[str, ScheduleCost]:
     return {
         "naive": evaluate_schedule(graph, NAIVE_SCHEDULE, hw),
         "memory_aware": evaluate_schedule(graph, MEMORY_AWARE_SCHEDULE, hw),
     }
 
+
+# Native estimators for CompactGraph. They mirror the Graph versions above
+# but walk the flat ID arrays instead of name-keyed dicts.
+
+
+def _compact_flops(graph: CompactGraph) -> FlopEstimate:
+    names = graph.tensor_names
+    breakdown: Dict[str, int] = {}
+    for i in range(graph.num_ops):
+        kind = graph.kind_names[graph.op_kind[i]]
+        attrs = graph.attr_table[graph.op_attr[i]]
+        out_ids = graph.op_outputs(i)
+        out_elems = sum(_prod(graph.shape(t)) for t in out_ids)
+        # Ops with a compute_dtype also pay conversions; take the generic path.
+        fast = "compute_dtype" not in attrs
+        if fast and kind == "Linear":
+            flops = 2 * int(attrs["in_features"]) * out_elems  # type: ignore[arg-type]
+        elif fast and kind == "GELU":
+            flops = GELU_FLOPS_PER_ELEM * out_elems
+        else:
+            in_names = [names[t] for t in graph.op_inputs(i)]
+            op = Op(kind, in_names, [names[t] for t in out_ids], attrs)
+            flops = _op_flops(
+                op,
+                [graph.tensor(t) for t in graph.op_inputs(i)],
+                [graph.tensor(t) for t in out_ids],
+            )
+        breakdown[names[out_ids[0]] if out_ids else kind] = flops
+    return FlopEstimate(total_flops=sum(breakdown.values()), breakdown=breakdown)
+
+
+def _compact_effective_bytes(graph: CompactGraph, t: int, tile_shape: Tuple[int, ...]) -> int:
+    full_bytes = graph.nbytes()[t]
+    shape = graph.shape(t)
+    full_elems = _prod(shape)
+    if full_elems == 0:
+        return 0
+    return min(full_bytes, _tile_elems(shape, tile_shape) * (full_bytes // full_elems))
+
+
+def _compact_io_tiles(
+    graph: CompactGraph, tile_shape: Tuple[int, ...]
+) -> List[Tuple[int, int, int, int]]:
+    """``_io_tiles`` as (tensor id, start, end, bytes) entries."""
+    nbytes = graph.nbytes()
+    inputs = set(graph.input_ids)
+    outputs = set(graph.output_ids)
+    row_tile = max(1, int(tile_shape[0]))
+    feat_tile = max(1, int(tile_shape[-1]))
+    rules = [OP_RULES.get(kind) for kind in graph.kind_names]
+
+    def row_bytes(t: int) -> int:
+        shape = graph.shape(t)
+        if not shape:
+            return nbytes[t]
+        return _compact_effective_bytes(graph, t, (row_tile, int(shape[-1])))
+
+    loop_start: Dict[int, int] = {}
+    ranges: List[Tuple[int, int, int, int]] = []
+    for i in range(graph.num_ops):
+        in_ids = graph.op_inputs(i)
+        for t in dict.fromkeys(in_ids):
+            if t in inputs:
+                ranges.append((t, i, i, row_bytes(t)))
+        starts = [loop_start[t] for t in in_ids if t in loop_start]
+        rule = rules[graph.op_kind[i]]
+        chunked = bool(starts) and rule is not None and rule.elementwise
+        start = min(starts, default=i)
+        for t in graph.op_outputs(i):
+            shape = graph.shape(t)
+            if t in outputs:
+                if chunked:
+                    ranges.append((t, i, i, _compact_effective_bytes(graph, t, tile_shape)))
+                else:
+                    ranges.append((t, start, i, row_bytes(t)))
+            elif (chunked or not starts) and shape and int(shape[-1]) > feat_tile:
+                loop_start[t] = start
+    return ranges
+
+
+def _compact_tile_rereads(graph: CompactGraph, tile_shape: Tuple[int, ...]) -> Tuple[int, int]:
+    nbytes = graph.nbytes()
+    outputs = set(graph.output_ids)
+    row_tile = max(1, int(tile_shape[0]))
+    feat_tile = max(1, int(tile_shape[-1]))
+    rules = [OP_RULES.get(kind) for kind in graph.kind_names]
+    names = graph.tensor_names
+
+    weight_reread = 0
+    feat_tiles = 1
+    for i in range(graph.num_ops):
+        out_ids = graph.op_outputs(i)
+        if not out_ids:
+            continue
+        rule = rules[graph.op_kind[i]]
+        if rule is not None and rule.has_params:
+            in_ids = graph.op_inputs(i)
+            op = Op(
+                graph.kind_names[graph.op_kind[i]],
+                [names[t] for t in in_ids],
+                [names[t] for t in out_ids],
+                graph.attr_table[graph.op_attr[i]],
+            )
+            params = rule.param_bytes(
+                op, [graph.tensor(t) for t in in_ids], [graph.tensor(t) for t in out_ids]
+            )
+            shape = graph.shape(out_ids[0])
+            if params and shape:
+                rows = _prod(shape[:-1])
+                weight_reread += (_ceil_div(rows, row_tile) - 1) * params
+        for t in out_ids:
+            shape = graph.shape(t)
+            if t not in outputs and shape:
+                feat_tiles = max(feat_tiles, _ceil_div(int(shape[-1]), feat_tile))
+
+    input_bytes = sum(nbytes[t] for t in graph.input_ids)
+    return weight_reread, (feat_tiles - 1) * input_bytes
+
+
+def _compact_dram_bytes(graph: CompactGraph, schedule: Schedule) -> DramEstimate:
+    nbytes = graph.nbytes()
+    input_read = sum(nbytes[t] for t in graph.input_ids)
+    output_write = sum(nbytes[t] for t in graph.output_ids)
+
+    if schedule.strategy == "naive":
+        inter_bytes = sum(nbytes[t] for t in graph.intermediate_ids())
+        breakdown = {
+            "input_read": input_read,
+            "intermediate_write": inter_bytes,
+            "intermediate_read": inter_bytes,
+            "output_write": output_write,
+        }
+        total = input_read + output_write + 2 * inter_bytes
+        return DramEstimate(total_bytes=total, breakdown=breakdown)
+
+    if schedule.strategy == "memory_aware":
+        total = input_read + output_write
+        breakdown = {
+            "input_read": input_read,
+            "intermediate_write": 0,
+            "intermediate_read": 0,
+            "output_write": output_write,
+        }
+        if schedule.tile_shape is not None:
+            weight_reread, input_reread = _compact_tile_rereads(graph, schedule.tile_shape)
+            breakdown["weight_reread"] = weight_reread
+            breakdown["input_reread"] = input_reread
+            total += weight_reread + input_reread
+        return DramEstimate(total_bytes=total, breakdown=breakdown)
+
+    # Other strategies have no array-native estimator yet.
+    return _dram_bytes(graph.to_graph(), schedule)
+
+
+def _compact_peak_sram_bytes(graph: CompactGraph, schedule: Schedule) -> SramEstimate:
+    nbytes = graph.nbytes()
+
+    if schedule.strategy == "naive":
+        peak = max(nbytes) if len(nbytes) else 0
+        return SramEstimate(peak_bytes=peak, breakdown={"peak_single_tensor": peak})
+
+    if schedule.strategy == "memory_aware":
+        ids, start, end = graph.live_ranges()
+        tile = schedule.tile_shape
+        if tile is None:
+            ranges = [(t, start[t], end[t], nbytes[t]) for t in ids]
+        else:
+            ranges = [(t, start[t], end[t], _compact_effective_bytes(graph, t, tile)) for t in ids]
+            ranges += _compact_io_tiles(graph, tile)
+        delta = [0] * (graph.num_ops + 1)
+        for _, s, e, size in ranges:
+            delta[s] += size
+            delta[e + 1] -= size
+        peak, peak_idx, running = 0, None, 0
+        for i in range(graph.num_ops):
+            running += delta[i]
+            if running > peak:
+                peak, peak_idx = running, i
+        live: Dict[str, int] = {}
+        if peak_idx is not None:
+            live = {graph.tensor_names[t]: size for t, s, e, size in ranges if s <= peak_idx <= e}
+        breakdown = {"intermediate_resident": peak}
+        if tile is not None:
+            boundary = {graph.tensor_names[t] for t in (*graph.input_ids, *graph.output_ids)}
+            io = sum(size for name, size in live.items() if name in boundary)
+            breakdown["intermediate_resident"] -= io
+            breakdown["io_row_tiles"] = io
+            breakdown["tile_shape_elems"] = _prod(tile)
+        return SramEstimate(
+            peak_bytes=peak, breakdown=breakdown, live_at_peak=live, peak_op_index=peak_idx
+        )
+
+    return _working_sram_bytes(graph.to_graph(), schedule)
+
+
+def _require_numpy(feature: str = "design-space sweeps"):
+    try:
+        import numpy
+    except ImportError as e:  # pragma: no cover - depends on the environment
+        raise ImportError(f"{feature} requires numpy; install mlcompiler[sweep]") from e
+    return numpy
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    """Columnar results of a design-space sweep.
+
+    Shape-only quantities are 1-D arrays indexed by design point; anything
+    that depends on the hardware is a 2-D ``(n_shapes, n_hw)`` grid.
+    ``chosen`` holds indices into ``schedule_names``.
+    """
+
+    batch: "np.ndarray"
+    hidden: "np.ndarray"
+    ff: "np.ndarray"
+    sram_bytes: "np.ndarray"
+    schedule_names: Tuple[str, ...]
+    dram_bytes: Dict[str, "np.ndarray"]
+    peak_sram_bytes: Dict[str, "np.ndarray"]
+    feasible: Dict[str, "np.ndarray"]
+    chosen: "np.ndarray"
+    chosen_dram_bytes: "np.ndarray"
+
+    def __len__(self) -> int:
+        return int(self.chosen.size)
+
+    def chosen_names(self) -> "np.ndarray":
+        np = _require_numpy()
+        return np.asarray(self.schedule_names)[self.chosen]
+
+    def to_columns(self) -> Dict[str, "np.ndarray"]:
+        """Flatten the grid into equal-length columns, one row per design point."""
+        np = _require_numpy()
+        n_shapes, n_hw = self.chosen.shape
+        cols: Dict[str, "np.ndarray"] = {
+            "batch": np.repeat(self.batch, n_hw),
+            "hidden": np.repeat(self.hidden, n_hw),
+            "ff": np.repeat(self.ff, n_hw),
+            "sram_bytes": np.tile(self.sram_bytes, n_shapes),
+        }
+        for name in self.schedule_names:
+            cols[f"{name}_dram_bytes"] = np.repeat(self.dram_bytes[name], n_hw)
+            cols[f"{name}_peak_sram_bytes"] = np.repeat(self.peak_sram_bytes[name], n_hw)
+            cols[f"{name}_feasible"] = self.feasible[name].ravel()
+        cols["chosen"] = self.chosen.ravel()
+        cols["chosen_dram_bytes"] = self.chosen_dram_bytes.ravel()
+        return cols
+
+
+def sweep_linear_gelu_linear(
+    batch: "ArrayLike",
+    hidden: "ArrayLike",
+    ff: "ArrayLike",
+    sram_bytes: "ArrayLike",
+    dtype: Union[str, int] = "float16",
+    infeasible_penalty: int = 10**15,
+) -> SweepResult:
+    """Evaluate the ``Linear -> GELU -> Linear`` block over a design grid.
+
+    ``batch``, ``hidden`` and ``ff`` are broadcast against each other to give
+    the shape points; every shape point is crossed with every entry of
+    ``sram_bytes``. The closed-form estimates and the selection rule match
+    ``run_schedule_pass`` on the equivalent graph with the default candidates.
+    """
+    np = _require_numpy()
+    b, h, f = np.broadcast_arrays(
+        np.asarray(batch, dtype=np.int64),
+        np.asarray(hidden, dtype=np.int64),
+        np.asarray(ff, dtype=np.int64),
+    )
+    b, h, f = b.ravel(), h.ravel(), f.ravel()
+    sram = np.atleast_1d(np.asarray(sram_bytes, dtype=np.int64)).ravel()
+    elem = _dtype_bytes(dtype)
+
+    io_bytes = b * h * elem
+    inter_bytes = b * f * elem
+    boundary = 2 * io_bytes  # input_read + output_write
+
+    names = (NAIVE_SCHEDULE.name, MEMORY_AWARE_SCHEDULE.name)
+    dram = {
+        "naive": boundary + 4 * inter_bytes,
+        "memory_aware": boundary,
+    }
+    peak = {
+        "naive": np.maximum(io_bytes, inter_bytes),
+        "memory_aware": 2 * inter_bytes,
+    }
+    feasible = {name: peak[name][:, None] <= sram[None, :] for name in names}
+
+    # Same ordering as run_schedule_pass: lowest DRAM among feasible schedules
+    # (memory_aware wins ties), else lowest penalized cost (first wins ties).
+    dram_grid = np.stack([dram[name] for name in names], axis=-1)[:, None, :]
+    feas_grid = np.stack([feasible[name] for name in names], axis=-1)
+    pref = np.array([0 if name == "memory_aware" else 1 for name in names], dtype=np.int64)
+    feasible_key = np.where(feas_grid, dram_grid * 2 + pref, np.iinfo(np.int64).max)
+    penalized_key = dram_grid + np.where(feas_grid, 0, infeasible_penalty)
+    chosen = np.where(
+        feas_grid.any(axis=-1),
+        feasible_key.argmin(axis=-1),
+        penalized_key.argmin(axis=-1),
+    ).astype(np.int8)
+    chosen_dram = np.take_along_axis(
+        np.broadcast_to(dram_grid, feas_grid.shape),
+        chosen[..., None].astype(np.intp),
+        axis=-1,
+    )[..., 0]
+
+    return SweepResult(
+        batch=b,
+        hidden=h,
+        ff=f,
+        sram_bytes=sram,
+        schedule_names=names,
+        dram_bytes=dram,
+        peak_sram_bytes=peak,
+        feasible=feasible,
+        chosen=chosen,
+        chosen_dram_bytes=chosen_dram,
+    )
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .hardware import HardwareConfig
+from .ir import Graph
+from .liveness import LiveRange, compute_live_ranges
+from .schedule import FusionGroups
+
+
+@dataclass(frozen=True)
+class FusionPlan:
+    groups: FusionGroups
+    # Intermediate bytes written to and read back from DRAM at group boundaries.
+    materialized_bytes: int
+    peak_sram_bytes: int
+
+
+def group_index(groups: FusionGroups, num_ops: int) -> List[int]:
+    """Group number of every op; ``groups`` must tile ``range(num_ops)``."""
+    owner = [-1] * num_ops
+    for g, (start, stop) in enumerate(groups):
+        for idx in range(start, stop):
+            owner[idx] = g
+    if -1 in owner:
+        raise ValueError(f"fusion groups {groups} do not cover all {num_ops} ops")
+    return owner
+
+
+def split_by_groups(
+    ranges: Sequence[LiveRange], groups: FusionGroups, num_ops: int
+) -> Tuple[List[LiveRange], List[LiveRange]]:
+    """Partition intermediates into (group-internal, materialized)."""
+    owner = group_index(groups, num_ops)
+    internal, materialized = [], []
+    for r in ranges:
+        (internal if owner[r.start] == owner[r.end] else materialized).append(r)
+    return internal, materialized
+
+
+class _GrowingPeak:
+    """Peak live bytes over a growing op window, for ranges that end at its newest op.
+
+    Live bytes are kept as a difference array over the suffix maxima: the
+    ops whose live bytes exceed every later op's. ``gap[p]`` is how far
+    suffix maximum ``p`` sits above the next one, and ``nxt`` is a
+    union-find from any op to the first suffix maximum at or after it.
+    A range ending at the newest op raises every suffix maximum from its
+    start on, which only shrinks the gap just before that start; suffix
+    maxima it overtakes are merged away. Each op is merged at most once,
+    so ``add`` is O(1) amortized.
+    """
+
+    __slots__ = ("nxt", "prev", "gap", "peak")
+
+    def __init__(self) -> None:
+        self.nxt: List[int] = []
+        self.prev: List[int] = []
+        self.gap: List[int] = []
+        self.peak = 0
+
+    def _find(self, p: int) -> int:
+        nxt = self.nxt
+        while nxt[p] != p:
+            nxt[p] = nxt[nxt[p]]
+            p = nxt[p]
+        return p
+
+    def _merge_before(self, b: int) -> None:
+        # Drop suffix maxima just before ``b`` that no longer exceed it.
+        a = self.prev[b]
+        while a >= 0 and self.gap[a] <= 0:
+            self.nxt[a] = b
+            before = self.prev[a]
+            self.prev[b] = before
+            if before >= 0:
+                self.gap[before] += self.gap[a]
+            else:
+                self.peak -= self.gap[a]
+            a = before
+
+    def append(self, last_live: int) -> None:
+        """Open a new op with nothing live; ``last_live`` is the previous op's live bytes."""
+        q = len(self.nxt)
+        self.nxt.append(q)
+        self.prev.append(q - 1)
+        self.gap.append(0)
+        if q:
+            self.gap[q - 1] = last_live
+            self._merge_before(q)
+
+    def add(self, start: int, nbytes: int) -> None:
+        """Add ``nbytes`` live from op ``start`` through the newest op."""
+        b = self._find(start)
+        a = self.prev[b]
+        if a < 0:
+            self.peak += nbytes
+            return
+        self.gap[a] -= nbytes
+        self._merge_before(b)
+
+
+def plan_fusion_groups(graph: Graph, hw: HardwareConfig) -> FusionPlan:
+    """Split ``graph.ops`` into contiguous groups with minimal boundary traffic.
+
+    ``best[j]`` is the cheapest partition of the first ``j`` ops. For each
+    group start ``i`` the group is grown one op at a time while keeping a
+    running sum of bytes produced in the group that escape it (the DRAM
+    cost of closing the group here) and the liveness peak of the
+    intermediates that stay inside (see ``_GrowingPeak``), so each step
+    costs O(1) amortized per range. The peak only grows as the group grows,
+    so the scan stops at the first end that overflows SRAM. A single op is
+    always allowed so a partition exists even when nothing fits.
+    """
+    num_ops = len(graph.ops)
+    ranges = compute_live_ranges(graph)
+    produced: List[List[LiveRange]] = [[] for _ in range(num_ops)]
+    ending: List[List[LiveRange]] = [[] for _ in range(num_ops)]
+    for r in ranges:
+        produced[r.start].append(r)
+        ending[r.end].append(r)
+
+    best: List[Optional[int]] = [0] + [None] * num_ops
+    choice: List[int] = [0] * (num_ops + 1)
+    peak_of: Dict[Tuple[int, int], int] = {}
+
+    for i in range(num_ops):
+        base = best[i]
+        if base is None:
+            continue
+        escape = 0
+        window = _GrowingPeak()
+        last_live = 0
+        for j in range(i + 1, num_ops + 1):
+            last = j - 1
+            window.append(last_live)
+            last_live = 0
+            for r in produced[last]:
+                if r.end > last:
+                    escape += r.nbytes
+            for r in ending[last]:
+                if r.start < i:
+                    continue
+                if r.start < last:
+                    escape -= r.nbytes
+                window.add(r.start - i, r.nbytes)
+                last_live += r.nbytes
+            peak = window.peak
+            if peak > hw.sram_bytes and j > i + 1:
+                break
+            cost = base + 2 * escape
+            prev = best[j]
+            if prev is None or cost < prev:
+                best[j] = cost
+                choice[j] = i
+                peak_of[(i, j)] = peak
+            if peak > hw.sram_bytes:
+                break
+
+    groups: List[Tuple[int, int]] = []
+    j = num_ops
+    while j > 0:
+        groups.append((choice[j], j))
+        j = choice[j]
+    groups.reverse()
+    return FusionPlan(
+        groups=tuple(groups),
+        materialized_bytes=(best[num_ops] or 0) // 2,
+        peak_sram_bytes=max((peak_of[g] for g in groups), default=0),
+    )
+
+
+def generate_fusion_candidate(graph: Graph, hw: HardwareConfig) -> Optional[FusionGroups]:
+    """Groups worth offering as a candidate, or None if the plan is trivial."""
+    if not graph.ops:
+        return None
+    plan = plan_fusion_groups(graph, hw)
+    if len(plan.groups) <= 1:
+        return None
+    return plan.groups
@@ -1,7 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class MemoryLevel:
+    name: str
+    # None marks the unbounded backing store (HBM/DRAM).
+    capacity_bytes: Optional[int] = None
+    bandwidth_GBs: Optional[float] = None
 
 
 @dataclass(frozen=True)
@@ -9,3 +17,38 @@ class HardwareConfig:
     sram_bytes: int
     dram_bandwidth_GBs: Optional[float] = None
     compute_Gops: Optional[float] = None
+    # Memory outside the working SRAM, innermost first (e.g. shared L2, then
+    # HBM). The last level is the backing store and must be unbounded. Empty
+    # means a single DRAM level with ``dram_bandwidth_GBs``.
+    memory_levels: Tuple[MemoryLevel, ...] = ()
+    # sram_bytes and compute_Gops are per core; DRAM bandwidth is shared.
+    num_cores: int = 1
+    # Per-core link bandwidth for collectives between cores.
+    interconnect_GBs: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.num_cores < 1:
+            raise ValueError(f"num_cores must be at least 1, got {self.num_cores}")
+        levels = tuple(
+            MemoryLevel(**lvl) if isinstance(lvl, dict) else lvl  # from JSON / asdict
+            for lvl in self.memory_levels  # type: ignore[union-attr]
+        )
+        object.__setattr__(self, "memory_levels", levels)
+        if not levels:
+            return
+        names = [lvl.name for lvl in levels]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Memory level names must be unique, got {names}")
+        if levels[-1].capacity_bytes is not None:
+            raise ValueError(
+                f"Last memory level {levels[-1].name!r} is the backing store and must be unbounded"
+            )
+        for lvl in levels[:-1]:
+            if lvl.capacity_bytes is None or lvl.capacity_bytes < 0:
+                raise ValueError(f"Memory level {lvl.name!r} needs a non-negative capacity")
+
+    def levels(self) -> Tuple[MemoryLevel, ...]:
+        """Off-chip levels, innermost first; a lone DRAM level if none were given."""
+        if self.memory_levels:
+            return self.memory_levels
+        return (MemoryLevel("dram", None, self.dram_bandwidth_GBs),)
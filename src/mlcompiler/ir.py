@@ -1,7 +1,28 @@
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, List, Mapping, Sequence, Tuple, Union
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from .profiling import count, span
+
+if TYPE_CHECKING:
+    from .ops import OpRule
+
+_T = TypeVar("_T")
 
 
 _DTYPE_BYTES: Mapping[str, int] = {
@@ -29,6 +50,24 @@ def _dtype_bytes(dtype: Union[str, int]) -> int:
 
 
 @dataclass(frozen=True)
+class Sym:
+    """A named symbolic dimension, such as a dynamic batch size.
+
+    Shape inference carries it through ops that only inspect trailing dims
+    (Linear, elementwise, MatMul, ...). Byte counts need a concrete value:
+    see ``mlcompiler.symbolic`` for closed-form costs and ``bind``.
+    """
+
+    name: str
+
+    def __int__(self) -> int:
+        raise TypeError(f"Symbolic dim {self.name!r} has no concrete value; bind it first")
+
+    def __str__(self) -> str:
+        return self.name
+
+
+@dataclass(frozen=True, slots=True)
 class Tensor:
     shape: Tuple[int, ...]
     dtype: Union[str, int] = "float16"
@@ -40,7 +79,7 @@ class Tensor:
         return n * _dtype_bytes(self.dtype)
 
 
-@dataclass
+@dataclass(slots=True)
 class Op:
     name: str
     inputs: List[str]
@@ -48,32 +87,98 @@ class Op:
     attrs: Dict[str, object] = field(default_factory=dict)
 
     def infer_output_tensors(self, input_tensors: Sequence[Tensor]) -> List[Tensor]:
-        kind = self.name
-        if kind == "Linear":
-            if not input_tensors:
-                raise ValueError("Linear op requires one input tensor")
-            in_features = self.attrs.get("in_features")
-            out_features = self.attrs.get("out_features")
-            if in_features is None or out_features is None:
-                raise ValueError("Linear op requires attrs in_features and out_features")
-            in_features_i = int(in_features)
-            out_features_i = int(out_features)
-            inp = input_tensors[0]
-            if inp.shape and inp.shape[-1] != in_features_i:
-                raise ValueError(
-                    f"Linear expects last dim {in_features_i}, got {inp.shape[-1]}"
-                )
-            out_shape = inp.shape[:-1] + (out_features_i,)
-            out_dtype = self.attrs.get("dtype", inp.dtype)
-            return [Tensor(out_shape, out_dtype)]
-
-        if kind == "GELU":
-            if not input_tensors:
-                raise ValueError("GELU op requires one input tensor")
-            inp = input_tensors[0]
-            return [Tensor(inp.shape, inp.dtype)]
-
-        raise NotImplementedError(f"Shape inference not implemented for op {kind!r}")
+        rule = OP_RULES.get(self.name)
+        if rule is None:
+            raise NotImplementedError(f"Shape inference not implemented for op {self.name!r}")
+        outs = rule.infer(self, input_tensors)
+        # Set by the precision pass: outputs keep the compute dtype unless
+        # they are stored narrower.
+        dtype = self.attrs.get("storage_dtype") or self.attrs.get("compute_dtype")
+        if dtype is not None:
+            outs = [Tensor(t.shape, dtype) for t in outs]  # type: ignore[arg-type]
+        return outs
+
+
+# Op kind -> OpRule. Populated by ``mlcompiler.ops`` (imported by the package).
+OP_RULES: Dict[str, "OpRule"] = {}
+
+
+class _TrackedList(list):
+    """List of ops that bumps its owning graph's version on mutation."""
+
+    def __init__(self, owner: "Graph", items: Iterable[Op] = ()) -> None:
+        super().__init__(items)
+        self._owner = owner
+
+    def append(self, op: Op) -> None:
+        super().append(op)
+        self._owner._touch(appended=(op,))
+
+    def extend(self, ops: Iterable[Op]) -> None:
+        ops = list(ops)
+        super().extend(ops)
+        self._owner._touch(appended=ops)
+
+    def __iadd__(self, ops: Iterable[Op]) -> "_TrackedList":
+        self.extend(ops)
+        return self
+
+    def __reduce_ex__(self, protocol: int):
+        return (list, (list(self),))
+
+    def _mutating(name: str):  # type: ignore[misc]
+        base = getattr(list, name)
+
+        def method(self, *args, **kwargs):
+            result = base(self, *args, **kwargs)
+            self._owner._touch()
+            return result
+
+        method.__name__ = name
+        return method
+
+    insert = _mutating("insert")
+    pop = _mutating("pop")
+    remove = _mutating("remove")
+    clear = _mutating("clear")
+    sort = _mutating("sort")
+    reverse = _mutating("reverse")
+    __setitem__ = _mutating("__setitem__")
+    __delitem__ = _mutating("__delitem__")
+    __imul__ = _mutating("__imul__")
+    del _mutating
+
+
+class _TrackedDict(dict):
+    """Input tensor table that bumps its owning graph's version on mutation."""
+
+    def __init__(self, owner: "Graph", items: Mapping[str, Tensor]) -> None:
+        super().__init__(items)
+        self._owner = owner
+
+    def __reduce_ex__(self, protocol: int):
+        return (dict, (dict(self),))
+
+    def _mutating(name: str):  # type: ignore[misc]
+        base = getattr(dict, name)
+
+        def method(self, *args, **kwargs):
+            result = base(self, *args, **kwargs)
+            self._owner._touch()
+            return result
+
+        method.__name__ = name
+        return method
+
+    __setitem__ = _mutating("__setitem__")
+    __delitem__ = _mutating("__delitem__")
+    __ior__ = _mutating("__ior__")
+    pop = _mutating("pop")
+    popitem = _mutating("popitem")
+    clear = _mutating("clear")
+    update = _mutating("update")
+    setdefault = _mutating("setdefault")
+    del _mutating
 
 
 @dataclass
@@ -81,24 +186,192 @@ class Graph:
     ops: List[Op]
     inputs: Dict[str, Tensor]
     outputs: List[str]
+    _version: int = field(default=0, init=False, repr=False, compare=False)
+    _shape_cache: Optional[Dict[str, Tensor]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _shape_cache_version: int = field(default=-1, init=False, repr=False, compare=False)
+    # Other per-version derived data (e.g. structural hashes), dropped on any change.
+    _analyses: Dict[str, object] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __setattr__(self, name: str, value: object) -> None:
+        # Wrap ops/inputs so in-place edits are seen by the shape cache.
+        if name == "ops":
+            value = _TrackedList(self, value)  # type: ignore[arg-type]
+        elif name == "inputs":
+            value = _TrackedDict(self, value)  # type: ignore[arg-type]
+        object.__setattr__(self, name, value)
+        if name in ("ops", "inputs"):
+            self._touch()
+
+    def __getstate__(self) -> Dict[str, object]:
+        state = dict(self.__dict__)
+        state.pop("_shape_cache", None)
+        state.pop("_shape_cache_version", None)
+        state["_analyses"] = {}
+        return state
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self.ops = state["ops"]  # type: ignore[assignment]
+        self.inputs = state["inputs"]  # type: ignore[assignment]
+
+    @property
+    def version(self) -> int:
+        """Structural version; bumped whenever ``ops`` or ``inputs`` change."""
+        return self._version
+
+    def _touch(self, appended: Optional[Sequence[Op]] = None) -> None:
+        prev = getattr(self, "_version", 0)
+        object.__setattr__(self, "_version", prev + 1)
+        object.__setattr__(self, "_analyses", {})
+        cache = getattr(self, "_shape_cache", None)
+        if cache is None:
+            return
+        if appended is not None and self._shape_cache_version == prev:
+            # Appending ops only adds tensors, so extend the table in place.
+            try:
+                for op in appended:
+                    self._infer_op(op, cache)
+            except (KeyError, ValueError, NotImplementedError):
+                object.__setattr__(self, "_shape_cache", None)
+                return
+            object.__setattr__(self, "_shape_cache_version", prev + 1)
+            return
+        object.__setattr__(self, "_shape_cache", None)
+
+    def invalidate_shapes(self) -> None:
+        """Drop cached shapes and analyses, e.g. after editing an op's ``attrs`` in place."""
+        self._touch()
 
     def walk_ops(self) -> Iterable[Op]:
+        count("ops_walked", len(self.ops))
         return iter(self.ops)
 
+    def _memoized(self, key: str, compute: Callable[[], _T]) -> _T:
+        """Cache ``compute()`` until the next structural change."""
+        if key not in self._analyses:
+            self._analyses[key] = compute()
+        return self._analyses[key]  # type: ignore[return-value]
+
+    @staticmethod
+    def _infer_op(op: Op, tensors: Dict[str, Tensor]) -> None:
+        try:
+            ins = [tensors[name] for name in op.inputs]
+        except KeyError as e:
+            missing = e.args[0]
+            raise KeyError(f"Op {op.name} missing input tensor {missing!r}") from None
+        outs = op.infer_output_tensors(ins)
+        if len(outs) != len(op.outputs):
+            raise ValueError(
+                f"Op {op.name} produced {len(outs)} outputs, "
+                f"but outputs list has {len(op.outputs)} names"
+            )
+        for name, tensor in zip(op.outputs, outs):
+            tensors[name] = tensor
+
+    def producers(self) -> Dict[str, int]:
+        """Index of the op producing each tensor."""
+
+        def compute() -> Dict[str, int]:
+            producer: Dict[str, int] = {}
+            for idx, op in enumerate(self.ops):
+                for name in op.outputs:
+                    if name in producer:
+                        raise ValueError(f"Tensor {name!r} is produced by more than one op")
+                    producer[name] = idx
+            return producer
+
+        return self._memoized("producers", compute)
+
+    def consumers(self) -> Dict[str, List[int]]:
+        """Indices of the ops reading each tensor, ascending, without repeats."""
+
+        def compute() -> Dict[str, List[int]]:
+            readers: Dict[str, List[int]] = {}
+            for idx, op in enumerate(self.ops):
+                for name in op.inputs:
+                    users = readers.setdefault(name, [])
+                    if not users or users[-1] != idx:
+                        users.append(idx)
+            return readers
+
+        return self._memoized("consumers", compute)
+
+    def is_topologically_ordered(self) -> bool:
+        """True if every op only reads graph inputs or outputs of earlier ops."""
+
+        def compute() -> bool:
+            available = set(self.inputs)
+            for op in self.ops:
+                if any(name not in available for name in op.inputs):
+                    return False
+                available.update(op.outputs)
+            return True
+
+        return self._memoized("topologically_ordered", compute)
+
+    def topological_order(self) -> List[int]:
+        """Op indices in dependency order, in linear time (Kahn's algorithm).
+
+        Ops that are already in a valid position keep their relative order.
+        Raises ``KeyError`` for inputs nobody provides and ``ValueError`` if
+        the ops form a cycle.
+        """
+        return list(self._memoized("topological_order", self._kahn_order))
+
+    def _kahn_order(self) -> Tuple[int, ...]:
+        producer = self.producers()
+        num_ops = len(self.ops)
+        indegree = [0] * num_ops
+        successors: List[List[int]] = [[] for _ in range(num_ops)]
+        for idx, op in enumerate(self.ops):
+            deps = set()
+            for name in op.inputs:
+                if name in producer:
+                    deps.add(producer[name])
+                elif name not in self.inputs:
+                    raise KeyError(f"Op {op.name} missing input tensor {name!r}")
+            for dep in deps:
+                successors[dep].append(idx)
+            indegree[idx] = len(deps)
+
+        ready = deque(idx for idx in range(num_ops) if indegree[idx] == 0)
+        order: List[int] = []
+        while ready:
+            idx = ready.popleft()
+            order.append(idx)
+            for succ in successors[idx]:
+                indegree[succ] -= 1
+                if indegree[succ] == 0:
+                    ready.append(succ)
+        if len(order) != num_ops:
+            stuck = [
+                f"{self.ops[idx].name}->{','.join(self.ops[idx].outputs)}"
+                for idx in range(num_ops)
+                if indegree[idx] > 0
+            ]
+            raise ValueError(f"Graph has a cycle through ops: {', '.join(stuck)}")
+        return tuple(order)
+
+    def shape_table(self) -> Mapping[str, Tensor]:
+        """Read-only tensor table, inferred once per structural version."""
+        if self._shape_cache is None or self._shape_cache_version != self._version:
+            count("infer_shapes")
+            count("ops_walked", len(self.ops))
+            tensors: Dict[str, Tensor] = dict(self.inputs)
+            with span("infer_shapes", num_ops=len(self.ops)):
+                if self.is_topologically_ordered():
+                    for op in self.ops:
+                        self._infer_op(op, tensors)
+                else:
+                    for idx in self.topological_order():
+                        self._infer_op(self.ops[idx], tensors)
+            object.__setattr__(self, "_shape_cache", tensors)
+            object.__setattr__(self, "_shape_cache_version", self._version)
+        return MappingProxyType(self._shape_cache)  # type: ignore[arg-type]
+
     def infer_shapes(self) -> Dict[str, Tensor]:
-        tensors: Dict[str, Tensor] = dict(self.inputs)
-        for op in self.ops:
-            try:
-                ins = [tensors[name] for name in op.inputs]
-            except KeyError as e:
-                missing = e.args[0]
-                raise KeyError(f"Op {op.name} missing input tensor {missing!r}") from None
-            outs = op.infer_output_tensors(ins)
-            if len(outs) != len(op.outputs):
-                raise ValueError(
-                    f"Op {op.name} produced {len(outs)} outputs, "
-                    f"but outputs list has {len(op.outputs)} names"
-                )
-            for name, tensor in zip(op.outputs, outs):
-                tensors[name] = tensor
-        return tensors
+        return dict(self.shape_table())
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .ir import Graph, Tensor
+
+
+@dataclass(frozen=True)
+class LiveRange:
+    """Op positions ``[start, end]`` during which a tensor occupies SRAM."""
+
+    name: str
+    start: int
+    end: int
+    nbytes: int
+
+
+@dataclass(frozen=True)
+class PeakResidency:
+    peak_bytes: int
+    op_index: Optional[int]
+    live: Dict[str, int]
+
+
+def compute_live_ranges(
+    graph: Graph,
+    nbytes: Optional[Callable[[Tensor], int]] = None,
+) -> List[LiveRange]:
+    """Live ranges of the graph's intermediates, in production order.
+
+    A tensor is live from the op that produces it to its last consumer in
+    ``graph.ops``; an intermediate nobody reads is live only at its producer.
+    Graph inputs and outputs live in DRAM and are not included.
+    """
+    tensors = graph.shape_table()
+    size = nbytes if nbytes is not None else Tensor.nbytes
+    outputs = set(graph.outputs)
+
+    start: Dict[str, int] = {}
+    end: Dict[str, int] = {}
+    for idx, op in enumerate(graph.walk_ops()):
+        for name in op.inputs:
+            if name in start:
+                end[name] = idx
+        for name in op.outputs:
+            if name in outputs:
+                continue
+            start[name] = idx
+            end[name] = idx
+
+    return [
+        LiveRange(name=name, start=s, end=end[name], nbytes=size(tensors[name]))
+        for name, s in start.items()
+    ]
+
+
+def live_bytes_timeline(ranges: Sequence[LiveRange], num_ops: int) -> Tuple[int, ...]:
+    """Resident bytes while each op executes."""
+    delta = [0] * (num_ops + 1)
+    for r in ranges:
+        delta[r.start] += r.nbytes
+        delta[r.end + 1] -= r.nbytes
+    timeline = []
+    running = 0
+    for idx in range(num_ops):
+        running += delta[idx]
+        timeline.append(running)
+    return tuple(timeline)
+
+
+def peak_residency(ranges: List[LiveRange], num_ops: int) -> PeakResidency:
+    """Sweep the live ranges once and report the peak and what is live there."""
+    timeline = live_bytes_timeline(ranges, num_ops)
+    if not timeline or max(timeline) == 0:
+        return PeakResidency(peak_bytes=0, op_index=None, live={})
+    peak = max(timeline)
+    peak_idx = timeline.index(peak)
+    live = {r.name: r.nbytes for r in ranges if r.start <= peak_idx <= r.end}
+    return PeakResidency(peak_bytes=peak, op_index=peak_idx, live=live)
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Sequence, Tuple, Union
+
+from .ir import OP_RULES, Op, Tensor, _dtype_bytes
+
+
+InferFn = Callable[[Op, Sequence[Tensor]], List[Tensor]]
+CostFn = Callable[[Op, Sequence[Tensor], Sequence[Tensor]], int]
+
+
+def _numel(shape: Tuple[int, ...]) -> int:
+    n = 1
+    for d in shape:
+        n *= int(d)
+    return n
+
+
+def _out_elems(outs: Sequence[Tensor]) -> int:
+    return sum(_numel(t.shape) for t in outs)
+
+
+def _param_dtype(op: Op, outs: Sequence[Tensor]) -> Union[str, int]:
+    """Weights stay at the op's compute dtype even when its output is stored narrower."""
+    return op.attrs.get("compute_dtype", outs[0].dtype)  # type: ignore[return-value]
+
+
+def _no_params(op: Op, ins: Sequence[Tensor], outs: Sequence[Tensor]) -> int:
+    return 0
+
+
+def _no_flops(op: Op, ins: Sequence[Tensor], outs: Sequence[Tensor]) -> int:
+    return 0
+
+
+@dataclass(frozen=True)
+class OpRule:
+    """How the compiler treats one op kind.
+
+    ``infer`` maps input tensors to output tensors, ``flops`` counts
+    arithmetic, and ``param_bytes`` is the size of weights the op streams in
+    from DRAM. Activation traffic is not a per-op property: it depends on
+    what the schedule keeps on-chip, so the estimators derive it from live
+    ranges. ``elementwise`` marks ops that are cheap to recompute from one
+    input.
+    """
+
+    infer: InferFn
+    flops: CostFn = _no_flops
+    param_bytes: CostFn = _no_params
+    elementwise: bool = False
+
+    @property
+    def has_params(self) -> bool:
+        return self.param_bytes is not _no_params
+
+
+def conversion_flops(op: Op, ins: Sequence[Tensor], outs: Sequence[Tensor]) -> int:
+    """Quantize/dequantize work around an op whose ``compute_dtype`` differs from storage.
+
+    Outputs stored narrower are quantized on write; inputs stored narrower
+    are dequantized on read.
+    """
+    compute = op.attrs.get("compute_dtype")
+    if compute is None:
+        return 0
+    width = _dtype_bytes(compute)  # type: ignore[arg-type]
+    elems = sum(_numel(t.shape) for t in (*ins, *outs) if _dtype_bytes(t.dtype) < width)
+    return CONVERT_FLOPS_PER_ELEM * elems
+
+
+def register_op(kind: str, rule: OpRule, replace: bool = False) -> None:
+    if kind in OP_RULES and not replace:
+        raise ValueError(f"Op {kind!r} is already registered")
+    OP_RULES[kind] = rule
+
+
+def get_op_rule(kind: str) -> OpRule:
+    try:
+        return OP_RULES[kind]
+    except KeyError:
+        raise NotImplementedError(f"No rule registered for op {kind!r}") from None
+
+
+def registered_ops() -> List[str]:
+    return sorted(OP_RULES)
+
+
+def _require_inputs(kind: str, ins: Sequence[Tensor], n: int) -> None:
+    if len(ins) < n:
+        count = "one input tensor" if n == 1 else f"{n} input tensors"
+        raise ValueError(f"{kind} op requires {count}")
+
+
+def _require_attrs(op: Op, *names: str) -> List[int]:
+    values = [op.attrs.get(name) for name in names]
+    if any(v is None for v in values):
+        raise ValueError(f"{op.name} op requires attrs {' and '.join(names)}")
+    return [int(v) for v in values]  # type: ignore[arg-type]
+
+
+def _broadcast(kind: str, a: Tuple[int, ...], b: Tuple[int, ...]) -> Tuple[int, ...]:
+    out = []
+    for i in range(1, max(len(a), len(b)) + 1):
+        da = a[-i] if i <= len(a) else 1
+        db = b[-i] if i <= len(b) else 1
+        if da != db and 1 not in (da, db):
+            raise ValueError(f"{kind} cannot broadcast shapes {a} and {b}")
+        out.append(db if da == 1 else da)
+    return tuple(reversed(out))
+
+
+# Linear ---------------------------------------------------------------------
+
+
+def _linear_infer(op: Op, ins: Sequence[Tensor]) -> List[Tensor]:
+    if not ins:
+        raise ValueError("Linear op requires one input tensor")
+    in_features = op.attrs.get("in_features")
+    out_features = op.attrs.get("out_features")
+    if in_features is None or out_features is None:
+        raise ValueError("Linear op requires attrs in_features and out_features")
+    in_features_i = int(in_features)  # type: ignore[call-overload]
+    out_features_i = int(out_features)  # type: ignore[call-overload]
+    inp = ins[0]
+    if inp.shape and inp.shape[-1] != in_features_i:
+        raise ValueError(f"Linear expects last dim {in_features_i}, got {inp.shape[-1]}")
+    out_shape = inp.shape[:-1] + (out_features_i,)
+    out_dtype = op.attrs.get("dtype", inp.dtype)
+    return [Tensor(out_shape, out_dtype)]  # type: ignore[arg-type]
+
+
+def _linear_flops(op: Op, ins: Sequence[Tensor], outs: Sequence[Tensor]) -> int:
+    (in_features,) = _require_attrs(op, "in_features")
+    return 2 * in_features * _out_elems(outs)
+
+
+def _linear_params(op: Op, ins: Sequence[Tensor], outs: Sequence[Tensor]) -> int:
+    in_features, out_features = _require_attrs(op, "in_features", "out_features")
+    n = in_features * out_features + (out_features if op.attrs.get("bias") else 0)
+    return n * _dtype_bytes(_param_dtype(op, outs))
+
+
+# Elementwise ----------------------------------------------------------------
+
+# Rough per-element costs of the usual fused kernels.
+GELU_FLOPS_PER_ELEM = 8
+SOFTMAX_FLOPS_PER_ELEM = 5
+# Scale and round (or scale back) when a tensor is stored narrower than it is computed.
+CONVERT_FLOPS_PER_ELEM = 2
+LAYERNORM_FLOPS_PER_ELEM = 8
+
+
+def _same_as_input(op: Op, ins: Sequence[Tensor]) -> List[Tensor]:
+    _require_inputs(op.name, ins, 1)
+    return [Tensor(ins[0].shape, ins[0].dtype)]
+
+
+def _per_elem(flops_per_elem: int) -> CostFn:
+    def flops(op: Op, ins: Sequence[Tensor], outs: Sequence[Tensor]) -> int:
+        return flops_per_elem * _out_elems(outs)
+
+    return flops
+
+
+def _add_infer(op: Op, ins: Sequence[Tensor]) -> List[Tensor]:
+    _require_inputs(op.name, ins, 2)
+    shape = ins[0].shape
+    for t in ins[1:]:
+        shape = _broadcast(op.name, shape, t.shape)
+    return [Tensor(shape, ins[0].dtype)]
+
+
+def _layernorm_params(op: Op, ins: Sequence[Tensor], outs: Sequence[Tensor]) -> int:
+    if not op.attrs.get("elementwise_affine", True) or not outs[0].shape:
+        return 0
+    return 2 * int(outs[0].shape[-1]) * _dtype_bytes(_param_dtype(op, outs))
+
+
+# MatMul ---------------------------------------------------------------------
+
+
+def _matmul_infer(op: Op, ins: Sequence[Tensor]) -> List[Tensor]:
+    _require_inputs(op.name, ins, 2)
+    a, b = ins[0].shape, ins[1].shape
+    if len(a) < 2 or len(b) < 2:
+        raise ValueError(f"MatMul expects rank >= 2 operands, got {a} and {b}")
+    if a[-1] != b[-2]:
+        raise ValueError(f"MatMul inner dims differ: {a[-1]} vs {b[-2]}")
+    batch = _broadcast(op.name, a[:-2], b[:-2])
+    return [Tensor(batch + (a[-2], b[-1]), ins[0].dtype)]
+
+
+def _matmul_flops(op: Op, ins: Sequence[Tensor], outs: Sequence[Tensor]) -> int:
+    return 2 * int(ins[0].shape[-1]) * _out_elems(outs)
+
+
+# Layout ---------------------------------------------------------------------
+
+
+def _reshape_infer(op: Op, ins: Sequence[Tensor]) -> List[Tensor]:
+    _require_inputs(op.name, ins, 1)
+    target = op.attrs.get("shape")
+    if target is None:
+        raise ValueError("Reshape op requires attr shape")
+    dims = [int(d) for d in target]  # type: ignore[union-attr]
+    total = _numel(ins[0].shape)
+    if dims.count(-1) > 1:
+        raise ValueError(f"Reshape shape {tuple(dims)} has more than one -1")
+    if -1 in dims:
+        known = _numel(tuple(d for d in dims if d != -1))
+        if known == 0 or total % known:
+            raise ValueError(f"Cannot reshape {ins[0].shape} to {tuple(dims)}")
+        dims[dims.index(-1)] = total // known
+    if _numel(tuple(dims)) != total:
+        raise ValueError(f"Cannot reshape {ins[0].shape} to {tuple(dims)}")
+    return [Tensor(tuple(dims), ins[0].dtype)]
+
+
+def _transpose_infer(op: Op, ins: Sequence[Tensor]) -> List[Tensor]:
+    _require_inputs(op.name, ins, 1)
+    shape = ins[0].shape
+    perm = op.attrs.get("perm")
+    if perm is None:
+        if len(shape) < 2:
+            raise ValueError(f"Transpose needs rank >= 2 without perm, got {shape}")
+        order = list(range(len(shape) - 2)) + [len(shape) - 1, len(shape) - 2]
+    else:
+        order = [int(p) for p in perm]  # type: ignore[union-attr]
+    if sorted(order) != list(range(len(shape))):
+        raise ValueError(f"Transpose perm {tuple(order)} does not match rank {len(shape)}")
+    return [Tensor(tuple(shape[p] for p in order), ins[0].dtype)]
+
+
+# Multi-head attention -------------------------------------------------------
+
+
+def _mha_dims(op: Op, ins: Sequence[Tensor]) -> Tuple[int, int, int, int, int]:
+    """(batch, query len, key/value len, embed dim, heads)."""
+    _require_inputs(op.name, ins, 1)
+    embed_dim, num_heads = _require_attrs(op, "embed_dim", "num_heads")
+    q = ins[0].shape
+    kv = ins[1].shape if len(ins) > 1 else q
+    if len(q) != 3 or len(kv) != 3:
+        raise ValueError(f"MultiHeadAttention expects (batch, seq, embed) inputs, got {q}")
+    if q[-1] != embed_dim or kv[-1] != embed_dim:
+        raise ValueError(f"MultiHeadAttention expects last dim {embed_dim}, got {q[-1]}")
+    if embed_dim % num_heads:
+        raise ValueError(f"embed_dim {embed_dim} is not divisible by num_heads {num_heads}")
+    return int(q[0]), int(q[1]), int(kv[1]), embed_dim, num_heads
+
+
+def _mha_infer(op: Op, ins: Sequence[Tensor]) -> List[Tensor]:
+    _mha_dims(op, ins)
+    return [Tensor(ins[0].shape, ins[0].dtype)]
+
+
+def _mha_flops(op: Op, ins: Sequence[Tensor], outs: Sequence[Tensor]) -> int:
+    batch, q_len, kv_len, dim, heads = _mha_dims(op, ins)
+    projections = 2 * batch * (2 * q_len + 2 * kv_len) * dim * dim  # Q, K, V, out
+    attention = 4 * batch * q_len * kv_len * dim  # QK^T and AV over all heads
+    softmax = SOFTMAX_FLOPS_PER_ELEM * batch * heads * q_len * kv_len
+    return projections + attention + softmax
+
+
+def _mha_params(op: Op, ins: Sequence[Tensor], outs: Sequence[Tensor]) -> int:
+    _, _, _, dim, _ = _mha_dims(op, ins)
+    return 4 * dim * dim * _dtype_bytes(_param_dtype(op, outs))
+
+
+_BUILTIN_RULES: Dict[str, OpRule] = {
+    "Linear": OpRule(infer=_linear_infer, flops=_linear_flops, param_bytes=_linear_params),
+    "GELU": OpRule(
+        infer=_same_as_input, flops=_per_elem(GELU_FLOPS_PER_ELEM), elementwise=True
+    ),
+    "MatMul": OpRule(infer=_matmul_infer, flops=_matmul_flops),
+    "Add": OpRule(infer=_add_infer, flops=_per_elem(1), elementwise=True),
+    "Softmax": OpRule(infer=_same_as_input, flops=_per_elem(SOFTMAX_FLOPS_PER_ELEM)),
+    "LayerNorm": OpRule(
+        infer=_same_as_input,
+        flops=_per_elem(LAYERNORM_FLOPS_PER_ELEM),
+        param_bytes=_layernorm_params,
+    ),
+    "Reshape": OpRule(infer=_reshape_infer),
+    "Transpose": OpRule(infer=_transpose_infer),
+    "MultiHeadAttention": OpRule(infer=_mha_infer, flops=_mha_flops, param_bytes=_mha_params),
+}
+
+for _kind, _rule in _BUILTIN_RULES.items():
+    register_op(_kind, _rule, replace=True)
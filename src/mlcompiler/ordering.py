@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .ir import Graph
+from .liveness import compute_live_ranges, peak_residency
+
+
+ORDER_METHODS = ("given", "topological", "greedy", "exact", "auto")
+
+# Exact search enumerates every downward-closed set of ops; keep it small.
+_DEFAULT_MAX_EXACT_OPS = 16
+
+
+@dataclass(frozen=True)
+class OpOrder:
+    order: Tuple[int, ...]
+    peak_live_bytes: int
+    method: str
+
+
+class _Problem:
+    """Dependency and tensor-size tables shared by the ordering searches."""
+
+    def __init__(self, graph: Graph) -> None:
+        tensors = graph.shape_table()
+        producer = graph.producers()
+        outputs = set(graph.outputs)
+        num_ops = len(graph.ops)
+        self.num_ops = num_ops
+        self.preds: List[Tuple[int, ...]] = []
+        for op in graph.ops:
+            self.preds.append(tuple(sorted({producer[n] for n in op.inputs if n in producer})))
+        self.succs: List[List[int]] = [[] for _ in range(num_ops)]
+        for idx, preds in enumerate(self.preds):
+            for p in preds:
+                self.succs[p].append(idx)
+
+        # Only intermediates occupy SRAM, matching the memory_aware estimate.
+        self.out_bytes = [0] * num_ops
+        self.reads: List[List[str]] = [[] for _ in range(num_ops)]
+        self.size: Dict[str, int] = {}
+        self.readers: Dict[str, int] = {}
+        for idx, op in enumerate(graph.ops):
+            for name in op.outputs:
+                if name not in outputs:
+                    self.size[name] = tensors[name].nbytes()
+                    self.out_bytes[idx] += self.size[name]
+        for name, users in graph.consumers().items():
+            if name in self.size and name in producer:
+                self.readers[name] = len(users)
+                for idx in users:
+                    self.reads[idx].append(name)
+        self.outputs_of = [
+            [n for n in op.outputs if n in self.size] for op in graph.ops
+        ]
+
+
+def _peak_of(graph: Graph, order: Sequence[int]) -> int:
+    reordered = reorder_graph(graph, order)
+    return peak_residency(compute_live_ranges(reordered), len(reordered.ops)).peak_bytes
+
+
+def greedy_order(graph: Graph) -> List[int]:
+    """List scheduling: run the ready op that grows live memory the least.
+
+    Each step scores a ready op by the bytes it allocates minus the bytes it
+    frees (inputs it is the last remaining reader of). Ties go to the op that
+    comes first in ``graph.ops``.
+    """
+    prob = _Problem(graph)
+    remaining_preds = [len(p) for p in prob.preds]
+    remaining_readers = dict(prob.readers)
+    ready = [idx for idx in range(prob.num_ops) if remaining_preds[idx] == 0]
+    order: List[int] = []
+    while ready:
+        best_pos, best_key = 0, None
+        for pos, idx in enumerate(ready):
+            freed = sum(prob.size[n] for n in prob.reads[idx] if remaining_readers[n] == 1)
+            key = (prob.out_bytes[idx] - freed, idx)
+            if best_key is None or key < best_key:
+                best_pos, best_key = pos, key
+        idx = ready.pop(best_pos)
+        order.append(idx)
+        for name in prob.reads[idx]:
+            remaining_readers[name] -= 1
+        for succ in prob.succs[idx]:
+            remaining_preds[succ] -= 1
+            if remaining_preds[succ] == 0:
+                ready.append(succ)
+    if len(order) != prob.num_ops:
+        graph.topological_order()  # raises with the cycle
+    return order
+
+
+def exact_order(graph: Graph) -> List[int]:
+    """Order with the minimum possible peak of live intermediate bytes.
+
+    Dynamic programming over the sets of already-executed ops: the bytes
+    live after a set has run do not depend on the order within it, so each
+    set only keeps its best (lowest-peak) prefix. Exponential in the width
+    of the graph; intended for small graphs.
+    """
+    prob = _Problem(graph)
+    n = prob.num_ops
+    pred_mask = [sum(1 << p for p in preds) for preds in prob.preds]
+    reader_mask: Dict[str, int] = {}
+    for idx in range(n):
+        for name in prob.reads[idx]:
+            reader_mask[name] = reader_mask.get(name, 0) | (1 << idx)
+
+    def live_after(done: int) -> int:
+        total = 0
+        for idx in range(n):
+            if not done >> idx & 1:
+                continue
+            for name in prob.outputs_of[idx]:
+                if reader_mask.get(name, 0) & ~done:
+                    total += prob.size[name]
+        return total
+
+    # best[done] = (peak so far, previous set, last op)
+    best: Dict[int, Tuple[int, int, int]] = {0: (0, -1, -1)}
+    frontier = [0]
+    for _ in range(n):
+        nxt: Dict[int, Tuple[int, int, int]] = {}
+        for done in frontier:
+            peak, live = best[done][0], live_after(done)
+            for idx in range(n):
+                if done >> idx & 1 or pred_mask[idx] & ~done:
+                    continue
+                step_peak = max(peak, live + prob.out_bytes[idx])
+                after = done | (1 << idx)
+                if after not in nxt or step_peak < nxt[after][0]:
+                    nxt[after] = (step_peak, done, idx)
+        if not nxt:
+            break
+        best.update(nxt)
+        frontier = list(nxt)
+
+    full = (1 << n) - 1
+    if full not in best:
+        graph.topological_order()  # raises with the cycle
+    order: List[int] = []
+    state = full
+    while state:
+        _, prev, idx = best[state]
+        order.append(idx)
+        state = prev
+    order.reverse()
+    return order
+
+
+def order_for_memory(
+    graph: Graph,
+    method: str = "auto",
+    max_exact_ops: int = _DEFAULT_MAX_EXACT_OPS,
+) -> OpOrder:
+    """Pick an execution order for ``graph.ops``.
+
+    ``given`` keeps ``graph.ops`` when it is already valid (else falls back to
+    ``topological``), ``topological`` is a stable Kahn order, ``greedy`` and
+    ``exact`` minimize peak live bytes, and ``auto`` uses ``exact`` for
+    graphs up to ``max_exact_ops`` ops and ``greedy`` beyond.
+    """
+    if method not in ORDER_METHODS:
+        raise ValueError(f"Unknown order method {method!r}. Known: {list(ORDER_METHODS)}")
+    if method == "auto":
+        method = "exact" if len(graph.ops) <= max_exact_ops else "greedy"
+    if method == "given" and not graph.is_topologically_ordered():
+        method = "topological"
+
+    order: Sequence[int]
+    if method == "given":
+        order = range(len(graph.ops))
+    elif method == "topological":
+        order = graph.topological_order()
+    elif method == "greedy":
+        order = greedy_order(graph)
+    else:
+        order = exact_order(graph)
+    return OpOrder(order=tuple(order), peak_live_bytes=_peak_of(graph, order), method=method)
+
+
+def reorder_graph(graph: Graph, order: Optional[Sequence[int]]) -> Graph:
+    """Graph with the same ops, inputs and outputs, with ops in ``order``."""
+    if order is None or list(order) == list(range(len(graph.ops))):
+        return graph
+    if sorted(order) != list(range(len(graph.ops))):
+        raise ValueError("order must be a permutation of the op indices")
+    return Graph(
+        ops=[graph.ops[idx] for idx in order],
+        inputs=dict(graph.inputs),
+        outputs=list(graph.outputs),
+    )
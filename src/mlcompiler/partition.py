@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .compact import CompactGraph
+from .hardware import HardwareConfig
+from .ir import Graph, Op, Tensor
+from .ops import get_op_rule
+from .ordering import reorder_graph
+from .pass_schedule import OBJECTIVES, CompilationResult, _format_bytes, run_schedule_pass
+
+PARTITION_MODES = ("rows", "columns")
+
+# Ops the partitioner knows how to shard; other graphs run on one core.
+_SHARDABLE = frozenset({"Linear", "GELU"})
+
+
+@dataclass(frozen=True)
+class PartitionPlan:
+    """One way of running a graph on ``cores`` cores.
+
+    ``shard`` is the graph every core runs and ``result`` is the schedule
+    pass on it with per-core hardware. Byte counts are per core except
+    ``dram_bytes``, which sums schedule traffic and weight reads over all
+    cores.
+    """
+
+    mode: str  # "none", "rows" or "columns"
+    cores: int
+    shard: Graph
+    result: CompilationResult
+    weight_bytes: int
+    comm_bytes: int
+    dram_bytes: int
+    feasible: bool
+    # Per-core schedule latency plus weight loads and collectives; None when
+    # the hardware lacks the bandwidth or compute figures.
+    latency_s: Optional[float]
+
+    @property
+    def total_bytes(self) -> int:
+        """DRAM traffic of all cores plus bytes sent over the interconnect."""
+        return self.dram_bytes + self.cores * self.comm_bytes
+
+
+def shard_graph(graph: Graph, mode: str, cores: int) -> Optional[Tuple[Graph, int]]:
+    """The graph one core runs, and the bytes it exchanges with the other cores.
+
+    ``"rows"`` splits the leading (batch) dimension of the inputs: cores
+    share nothing but every core reads all the weights. ``"columns"``
+    alternates Megatron-style: a Linear on a replicated input splits its
+    output features, a Linear on a split input splits its input features
+    and all-reduces the partial sums (ring, ``2 (P - 1) / P`` of the output
+    per core), and GELU keeps whatever split it is given. Split graph
+    outputs are all-gathered at the end.
+
+    Returns None when the graph has ops other than Linear and GELU or a
+    dimension does not divide evenly by ``cores``.
+    """
+    if mode not in PARTITION_MODES:
+        raise ValueError(f"Unknown partition mode {mode!r}. Known: {list(PARTITION_MODES)}")
+    if any(op.name not in _SHARDABLE for op in graph.ops):
+        return None
+    if not graph.is_topologically_ordered():
+        graph = reorder_graph(graph, graph.topological_order())
+    if mode == "rows":
+        return _shard_rows(graph, cores)
+    return _shard_columns(graph, cores)
+
+
+def _shard_rows(graph: Graph, cores: int) -> Optional[Tuple[Graph, int]]:
+    inputs: Dict[str, Tensor] = {}
+    for name, t in graph.inputs.items():
+        if not t.shape or int(t.shape[0]) % cores:
+            return None
+        inputs[name] = Tensor((int(t.shape[0]) // cores,) + tuple(t.shape[1:]), t.dtype)
+    ops = [Op(op.name, list(op.inputs), list(op.outputs), dict(op.attrs)) for op in graph.ops]
+    return Graph(ops=ops, inputs=inputs, outputs=list(graph.outputs)), 0
+
+
+def _shard_columns(graph: Graph, cores: int) -> Optional[Tuple[Graph, int]]:
+    tensors = graph.shape_table()
+    split = {name: False for name in graph.inputs}
+    comm = 0
+    any_split = False
+    ops: List[Op] = []
+    for op in graph.walk_ops():
+        src, out = op.inputs[0], op.outputs[0]
+        attrs = dict(op.attrs)
+        if op.name == "Linear" and split[src]:
+            attrs["in_features"] = int(attrs["in_features"]) // cores  # type: ignore[call-overload]
+            comm += 2 * (cores - 1) * tensors[out].nbytes() // cores
+            split[out] = False
+        elif op.name == "Linear":
+            out_features = int(attrs["out_features"])  # type: ignore[call-overload]
+            if out_features % cores:
+                return None
+            attrs["out_features"] = out_features // cores
+            split[out] = any_split = True
+        else:
+            split[out] = split[src]
+        ops.append(Op(op.name, list(op.inputs), list(op.outputs), attrs))
+    if not any_split:
+        return None
+    for name in graph.outputs:
+        if split.get(name):
+            comm += (cores - 1) * tensors[name].nbytes() // cores
+    return Graph(ops=ops, inputs=dict(graph.inputs), outputs=list(graph.outputs)), comm
+
+
+def _weight_bytes(graph: Graph) -> int:
+    tensors = graph.shape_table()
+    total = 0
+    for op in graph.walk_ops():
+        ins = [tensors[name] for name in op.inputs]
+        outs = [tensors[name] for name in op.outputs]
+        total += get_op_rule(op.name).param_bytes(op, ins, outs)
+    return total
+
+
+def _core_hw(hw: HardwareConfig, cores: int) -> HardwareConfig:
+    """What one of ``cores`` busy cores sees: its own SRAM, a share of each off-chip bandwidth."""
+
+    def share(bw: Optional[float]) -> Optional[float]:
+        return bw / cores if bw else bw
+
+    return replace(
+        hw,
+        num_cores=1,
+        dram_bandwidth_GBs=share(hw.dram_bandwidth_GBs),
+        memory_levels=tuple(
+            replace(lvl, bandwidth_GBs=share(lvl.bandwidth_GBs)) for lvl in hw.memory_levels
+        ),
+    )
+
+
+def _core_counts(num_cores: int) -> List[int]:
+    counts = {num_cores}
+    n = 2
+    while n < num_cores:
+        counts.add(n)
+        n *= 2
+    return sorted(c for c in counts if c > 1)
+
+
+def _plan(
+    graph: Graph,
+    hw: HardwareConfig,
+    mode: str,
+    cores: int,
+    objective: str,
+    pass_kwargs: Dict[str, Any],
+) -> Optional[PartitionPlan]:
+    if mode == "none":
+        shard, comm = graph, 0
+    else:
+        sharded = shard_graph(graph, mode, cores)
+        if sharded is None:
+            return None
+        shard, comm = sharded
+    core_hw = _core_hw(hw, cores)
+    result = run_schedule_pass(shard, core_hw, objective=objective, **pass_kwargs)
+    cost = result.costs[result.chosen_schedule.name]
+    weights = _weight_bytes(shard)
+
+    latency = None
+    weight_bw = core_hw.levels()[-1].bandwidth_GBs
+    if cost.latency_s is not None and weight_bw and (not comm or hw.interconnect_GBs):
+        latency = cost.latency_s + weights / (weight_bw * 1e9)
+        if comm:
+            latency += comm / (hw.interconnect_GBs * 1e9)  # type: ignore[operator]
+    return PartitionPlan(
+        mode=mode,
+        cores=cores,
+        shard=shard,
+        result=result,
+        weight_bytes=weights,
+        comm_bytes=comm,
+        dram_bytes=cores * (cost.dram.total_bytes + weights),
+        feasible=cost.feasible,
+        latency_s=latency,
+    )
+
+
+def partition_candidates(
+    graph: Union[Graph, CompactGraph],
+    hw: HardwareConfig,
+    objective: str = "bytes",
+    **pass_kwargs: Any,
+) -> List[PartitionPlan]:
+    """Every legal partitioning of ``graph`` over up to ``hw.num_cores`` cores, best first.
+
+    Core counts are the powers of two below ``num_cores`` plus ``num_cores``
+    itself. Plans whose per-core schedule fits in SRAM come first; they are
+    ranked by ``total_bytes``, or by ``latency_s`` under
+    ``objective="latency"`` when every plan has one. Fewer cores win ties.
+    Extra keyword arguments go to ``run_schedule_pass`` for each shard.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective {objective!r}. Known: {list(OBJECTIVES)}")
+    if isinstance(graph, CompactGraph):
+        graph = graph.to_graph()
+    plans = [_plan(graph, hw, "none", 1, objective, pass_kwargs)]
+    for cores in _core_counts(hw.num_cores):
+        for mode in PARTITION_MODES:
+            plans.append(_plan(graph, hw, mode, cores, objective, pass_kwargs))
+    found = [p for p in plans if p is not None]
+    use_latency = objective == "latency" and all(p.latency_s is not None for p in found)
+    found.sort(
+        key=lambda p: (
+            not p.feasible,
+            p.latency_s if use_latency else 0.0,
+            p.total_bytes,
+            p.cores,
+        )
+    )
+    return found
+
+
+def plan_partition(
+    graph: Union[Graph, CompactGraph],
+    hw: HardwareConfig,
+    objective: str = "bytes",
+    **pass_kwargs: Any,
+) -> PartitionPlan:
+    """The cheapest way to run ``graph`` on ``hw``'s cores (see ``partition_candidates``)."""
+    return partition_candidates(graph, hw, objective, **pass_kwargs)[0]
+
+
+def describe_plan(plan: PartitionPlan) -> str:
+    """One-line summary of where a plan's bytes go."""
+    schedule = plan.result.chosen_schedule.name
+    if plan.mode == "none":
+        return f"single core, {schedule}: {_format_bytes(plan.total_bytes)} total"
+    return (
+        f"{plan.mode} across {plan.cores} cores, {schedule} per core: "
+        f"{_format_bytes(plan.total_bytes)} total "
+        f"(DRAM {_format_bytes(plan.dram_bytes)}, "
+        f"interconnect {_format_bytes(plan.cores * plan.comm_bytes)})"
+    )
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Union
+
+from .compact import CompactGraph
 from .hardware import HardwareConfig
 from .ir import Graph
 from .schedule import Schedule
@@ -14,8 +17,11 @@ class ScheduleChoice:
     estimated_intermediate_bytes: int
 
 
-def estimate_intermediate_bytes(graph: Graph) -> int:
-    tensors = graph.infer_shapes()
+def estimate_intermediate_bytes(graph: Union[Graph, CompactGraph]) -> int:
+    if isinstance(graph, CompactGraph):
+        nbytes = graph.nbytes()
+        return sum(nbytes[t] for t in graph.intermediate_ids())
+    tensors = graph.shape_table()
     total = 0
     for op in graph.walk_ops():
         for out_name in op.outputs:
@@ -25,7 +31,7 @@ def estimate_intermediate_bytes(graph: Graph) -> int:
     return total
 
 
-def choose_schedule(graph: Graph, hw: HardwareConfig) -> ScheduleChoice:
+def choose_schedule(graph: Union[Graph, CompactGraph], hw: HardwareConfig) -> ScheduleChoice:
     inter_bytes = estimate_intermediate_bytes(graph)
     result = run_schedule_pass(graph, hw)
     mem_cost = result.costs.get("memory_aware")
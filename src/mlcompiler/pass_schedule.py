@@ -1,17 +1,69 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 
-from .cost import ScheduleCost, evaluate_schedule
+from .compact import CompactGraph
+from .cost import (
+    ScheduleCost,
+    ScheduleEstimate,
+    estimate_flops,
+    estimate_schedule,
+    evaluate_schedule,
+    recompute_flops,
+    schedule_latency_s,
+    schedule_totals,
+    tile_steps,
+    total_flops,
+)
 from .hardware import HardwareConfig
 from .ir import Graph
-from .schedule import MEMORY_AWARE_SCHEDULE, NAIVE_SCHEDULE, Schedule
+from .fusion import generate_fusion_candidate
+from .ordering import order_for_memory, reorder_graph
+from .profiling import span
+from .remat import generate_remat_candidate
+from .schedule import (
+    MEMORY_AWARE_SCHEDULE,
+    NAIVE_SCHEDULE,
+    FusionGroups,
+    Schedule,
+    fusion_groups_schedule,
+    remat_schedule,
+)
+from .tiling import generate_tiled_candidates
 
 
-def generate_candidates(_graph: Graph) -> List[Schedule]:
+def generate_candidates(
+    graph: Union[Graph, CompactGraph],
+    hw: Optional[HardwareConfig] = None,
+    tiling: bool = False,
+    fusion: bool = False,
+    pipelining: bool = False,
+    remat: bool = False,
+) -> List[Schedule]:
     # Phase 3 defines two valid schedules.
-    return [NAIVE_SCHEDULE, MEMORY_AWARE_SCHEDULE]
+    candidates = [NAIVE_SCHEDULE, MEMORY_AWARE_SCHEDULE]
+    if hw is None or not (tiling or fusion or pipelining or remat):
+        return candidates
+    # These searches only pay off when the untiled intermediates do not fit.
+    untiled = evaluate_schedule(graph, MEMORY_AWARE_SCHEDULE, hw)
+    if untiled.feasible:
+        return candidates
+    if tiling:
+        candidates.extend(generate_tiled_candidates(graph, hw))
+    if pipelining:
+        candidates.extend(generate_tiled_candidates(graph, hw, buffers=2))
+    if fusion:
+        plain = graph.to_graph() if isinstance(graph, CompactGraph) else graph
+        groups = generate_fusion_candidate(plain, hw)
+        if groups is not None:
+            candidates.append(fusion_groups_schedule(groups))
+    if remat:
+        plain = graph.to_graph() if isinstance(graph, CompactGraph) else graph
+        actions = generate_remat_candidate(plain, hw)
+        if actions is not None:
+            candidates.append(remat_schedule(actions))
+    return candidates
 
 
 def _format_bytes(nbytes: int) -> str:
@@ -28,42 +80,107 @@ def _format_bytes(nbytes: int) -> str:
     return f"{nbytes}B"
 
 
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.1f}{unit}"
+    return f"{seconds / 1e-9:.1f}ns"
+
+
+OBJECTIVES = ("bytes", "latency")
+
+
+class _Deferred:
+    """Wraps a zero-argument function whose value a ``_LazyField`` computes on first read."""
+
+    __slots__ = ("fn",)
+
+    def __init__(self, fn: Callable[[], Any]) -> None:
+        self.fn = fn
+
+
+class _LazyField:
+    """Dataclass field that may be initialized with a ``_Deferred`` value."""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._slot = "_lazy_" + name
+
+    def __get__(self, obj: Any, owner: Optional[type] = None) -> Any:
+        if obj is None:
+            # No class-level default: the field stays required.
+            raise AttributeError(self._slot)
+        value = obj.__dict__[self._slot]
+        if isinstance(value, _Deferred):
+            value = value.fn()
+            obj.__dict__[self._slot] = value
+        return value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        obj.__dict__[self._slot] = value
+
+
 @dataclass(frozen=True)
 class CompilationResult:
     chosen_schedule: Schedule
-    costs: Dict[str, ScheduleCost]
-    reason: str
+    # Built on first access for results from run_schedule_pass(explain=False).
+    costs: Dict[str, ScheduleCost] = _LazyField()  # type: ignore[assignment]
+    reason: str = _LazyField()  # type: ignore[assignment]
+    # Execution order the costs were computed in, as indices into the input
+    # graph's ops; None when Graph.ops was used as given.
+    op_order: Optional[Tuple[int, ...]] = None
+    # Intermediates stored narrower than they are computed (see
+    # run_precision_pass); None when every tensor keeps its dtype.
+    storage_dtypes: Optional[Dict[str, Union[str, int]]] = None
 
+    @property
+    def fusion_groups(self) -> Optional[FusionGroups]:
+        """Op ranges fused together by the chosen schedule, if it partitions the graph.
 
-def run_schedule_pass(
-    graph: Graph,
-    hw: HardwareConfig,
-    candidates: Optional[Iterable[Schedule]] = None,
-) -> CompilationResult:
-    if candidates is None:
-        candidates = generate_candidates(graph)
+        Ranges index the execution order (``op_order`` when it is set).
+        """
+        return self.chosen_schedule.fusion_groups
 
-    costs: Dict[str, ScheduleCost] = {}
-    for schedule in candidates:
-        costs[schedule.name] = evaluate_schedule(graph, schedule, hw)
+    def __getstate__(self) -> Dict[str, Any]:
+        # Resolve deferred fields so pickles never carry closures.
+        self.costs, self.reason  # noqa: B018
+        return dict(self.__dict__)
 
-    feasible_costs = [c for c in costs.values() if c.feasible]
-    if feasible_costs:
-        best = min(
-            feasible_costs,
-            key=lambda c: (
-                c.dram.total_bytes,
-                0 if c.schedule.name == "memory_aware" else 1,
-            ),
-        )
-    else:
-        best = min(costs.values(), key=lambda c: c.penalized_cost)
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
 
+
+def _explain(
+    best: ScheduleCost,
+    costs: Dict[str, ScheduleCost],
+    hw: HardwareConfig,
+    feasible: bool,
+    use_latency: bool,
+) -> str:
+    """Human-readable justification for picking ``best`` out of ``costs``."""
     reason = "chosen by cost model"
     naive = costs.get("naive")
     mem = costs.get("memory_aware")
 
-    if feasible_costs:
+    if feasible and use_latency:
+        assert best.latency_s is not None and best.flops is not None
+        compute_s = best.flops.total_flops / (hw.compute_Gops * 1e9)  # type: ignore[operator]
+        memory_s = best.memory_time_s
+        if memory_s is None:
+            memory_s = best.dram.total_bytes / (hw.dram_bandwidth_GBs * 1e9)  # type: ignore[operator]
+        bound = "compute" if compute_s >= memory_s else "memory"
+        reason = (
+            f"{best.schedule.name} chosen: lowest estimated latency "
+            f"{_format_seconds(best.latency_s)} among feasible schedules ({bound}-bound)"
+        )
+    elif feasible and best.memory_time_s is not None:
+        traffic = ", ".join(
+            f"{name} {_format_bytes(nbytes)}" for name, nbytes in best.dram.by_level.items()
+        )
+        reason = (
+            f"{best.schedule.name} chosen: lowest memory time "
+            f"{_format_seconds(best.memory_time_s)} among feasible schedules ({traffic})"
+        )
+    elif feasible:
         if best.schedule.name == "memory_aware":
             if naive and naive.feasible:
                 reason = (
@@ -77,6 +194,16 @@ def run_schedule_pass(
                 )
             else:
                 reason = "memory_aware chosen: lowest DRAM among feasible schedules"
+        elif best.schedule.name != "naive":
+            reason = (
+                f"{best.schedule.name} chosen: lowest DRAM among feasible schedules "
+                f"({_format_bytes(best.dram.total_bytes)})"
+            )
+            if mem and not mem.feasible:
+                reason += (
+                    f"; memory_aware infeasible: peak SRAM {_format_bytes(mem.sram.peak_bytes)} "
+                    f"> {_format_bytes(hw.sram_bytes)}"
+                )
         else:
             if mem and not mem.feasible:
                 reason = (
@@ -102,9 +229,256 @@ def run_schedule_pass(
             + "; ".join(infeasible_msgs)
         )
 
+    return reason
+
+
+def run_schedule_pass(
+    graph: Union[Graph, CompactGraph],
+    hw: HardwareConfig,
+    candidates: Optional[Iterable[Schedule]] = None,
+    tiling: bool = False,
+    objective: str = "bytes",
+    fusion: bool = False,
+    order: str = "given",
+    explain: bool = True,
+    pipelining: bool = False,
+    remat: bool = False,
+) -> CompilationResult:
+    """Evaluate candidates on ``hw`` and pick one.
+
+    ``tiling`` and ``fusion`` add tiled memory_aware candidates and a
+    DP-chosen fusion-group partition when the untiled intermediates do not
+    fit in SRAM. ``pipelining`` adds double-buffered tiled candidates whose
+    tile transfers overlap compute; they move the same bytes as the serial
+    tiles but need more SRAM, so they only win under ``objective="latency"``.
+    ``remat`` adds a candidate that recomputes cheap elementwise
+    intermediates or spills others to bring the memory_aware peak under
+    SRAM (see ``plan_rematerialization``).
+
+    ``order`` picks the op execution order the costs assume (see
+    ``order_for_memory``); graphs whose ops are not in dependency order are
+    always sorted first.
+
+    ``objective="bytes"`` ranks feasible schedules by DRAM traffic.
+    ``objective="latency"`` ranks them by the roofline latency estimate and
+    falls back to bytes when ``hw`` lacks bandwidth or compute figures. When
+    ``hw.memory_levels`` gives every level a bandwidth, the bytes objective
+    ranks by time spent moving data across the levels instead of raw bytes.
+
+    With ``explain=False`` the schedule is picked from integer totals only
+    (see ``decide_schedule``). ``costs`` and ``reason`` are built the first
+    time they are read and match the ``explain=True`` result; the graph must
+    not change in between.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective {objective!r}. Known: {list(OBJECTIVES)}")
+    with span("run_schedule_pass"):
+        graph, op_order = _execution_order(graph, order)
+        if candidates is None:
+            with span("generate_candidates"):
+                candidates = generate_candidates(
+                    graph,
+                    hw,
+                    tiling=tiling,
+                    fusion=fusion,
+                    pipelining=pipelining,
+                    remat=remat,
+                )
+        if explain:
+            return _explained_result(graph, hw, candidates, objective, op_order)
+        candidates = list(candidates)
+        chosen = _decide(graph, hw, candidates, objective)
+        full = _deferred_result(graph, hw, candidates, objective, op_order)
+        return CompilationResult(
+            chosen_schedule=chosen,
+            costs=_Deferred(lambda: full().costs),  # type: ignore[arg-type]
+            reason=_Deferred(lambda: full().reason),  # type: ignore[arg-type]
+            op_order=op_order,
+        )
+
+
+def _execution_order(
+    graph: Union[Graph, CompactGraph], order: str
+) -> Tuple[Union[Graph, CompactGraph], Optional[Tuple[int, ...]]]:
+    if order == "given" and graph.is_topologically_ordered():
+        return graph, None
+    with span("order_ops", method=order):
+        plain = graph.to_graph() if isinstance(graph, CompactGraph) else graph
+        chosen_order = order_for_memory(plain, order).order
+        if list(chosen_order) == list(range(len(plain.ops))):
+            return graph, None
+        reordered = reorder_graph(plain, chosen_order)
+        if isinstance(graph, CompactGraph):
+            return CompactGraph.from_graph(reordered), chosen_order
+        return reordered, chosen_order
+
+
+def _explained_result(
+    graph: Union[Graph, CompactGraph],
+    hw: HardwareConfig,
+    candidates: Iterable[Schedule],
+    objective: str,
+    op_order: Optional[Tuple[int, ...]],
+) -> CompilationResult:
+    estimates: Dict[str, ScheduleEstimate] = {}
+    flops = estimate_flops(graph)
+    for schedule in candidates:
+        with span("evaluate_schedule", schedule=schedule.name):
+            estimates[schedule.name] = estimate_schedule(graph, schedule, flops)
+    return select_schedule(estimates, hw, objective=objective, op_order=op_order)
+
+
+def _deferred_result(
+    graph: Union[Graph, CompactGraph],
+    hw: HardwareConfig,
+    candidates: List[Schedule],
+    objective: str,
+    op_order: Optional[Tuple[int, ...]],
+) -> Callable[[], CompilationResult]:
+    """Runs the explained pass once, on first call, against the graph as it was."""
+    version = graph.version if isinstance(graph, Graph) else None
+    cell: List[CompilationResult] = []
+
+    def full() -> CompilationResult:
+        if not cell:
+            if isinstance(graph, Graph) and graph.version != version:
+                raise RuntimeError(
+                    "Graph changed after run_schedule_pass(explain=False); "
+                    "its costs and reason can no longer be built"
+                )
+            cell.append(_explained_result(graph, hw, candidates, objective, op_order))
+        return cell[0]
+
+    return full
+
+
+def _decide(
+    graph: Union[Graph, CompactGraph],
+    hw: HardwareConfig,
+    candidates: Iterable[Schedule],
+    objective: str,
+    infeasible_penalty: int = 10**15,
+) -> Schedule:
+    # Same ranking as _pick, on plain tuples. Later duplicates of a name
+    # replace earlier ones, as they do in the costs dict.
+    unique = {s.name: s for s in candidates}
+    if hw.memory_levels:
+        # Level placement needs live ranges, so there is no totals-only path.
+        flop_estimate = estimate_flops(graph)
+        costs = {
+            name: estimate_schedule(graph, s, flop_estimate).cost_on(hw, infeasible_penalty)
+            for name, s in unique.items()
+        }
+        if not costs:
+            raise ValueError("run_schedule_pass needs at least one candidate schedule")
+        return _pick(costs, objective)[0].schedule
+    use_latency = objective == "latency" and bool(hw.dram_bandwidth_GBs and hw.compute_Gops)
+    flops = total_flops(graph) if use_latency else 0
+    compute_s = flops / (hw.compute_Gops * 1e9) if use_latency else 0.0  # type: ignore[operator]
+    best: Optional[Schedule] = None
+    best_key: Tuple[Any, ...] = ()
+    for schedule in unique.values():
+        dram, peak = schedule_totals(graph, schedule)
+        pref = 0 if schedule.name == "memory_aware" else 1
+        if peak > hw.sram_bytes:
+            key: Tuple[Any, ...] = (1, dram + infeasible_penalty)
+        elif use_latency:
+            memory_s = dram / (hw.dram_bandwidth_GBs * 1e9)  # type: ignore[operator]
+            op_s = compute_s
+            if schedule.remat is not None:
+                extra = sum(recompute_flops(graph, schedule).values())
+                op_s += extra / (hw.compute_Gops * 1e9)  # type: ignore[operator]
+            latency = schedule_latency_s(schedule, memory_s, op_s, tile_steps(graph, schedule))
+            key = (0, latency, dram, pref)
+        else:
+            key = (0, dram, pref)
+        if best is None or key < best_key:
+            best, best_key = schedule, key
+    if best is None:
+        raise ValueError("run_schedule_pass needs at least one candidate schedule")
+    return best
+
+
+def decide_schedule(
+    graph: Union[Graph, CompactGraph],
+    hw: HardwareConfig,
+    candidates: Optional[Iterable[Schedule]] = None,
+    objective: str = "bytes",
+) -> Schedule:
+    """The schedule ``run_schedule_pass`` would choose, without costs or a reason.
+
+    Only integer totals are computed: no breakdown dicts, ``ScheduleCost``
+    objects or formatted strings. For a ``Graph`` the default candidates'
+    totals are memoized per structural version, so re-deciding for another
+    ``HardwareConfig`` is a handful of comparisons.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective {objective!r}. Known: {list(OBJECTIVES)}")
+    graph, _ = _execution_order(graph, "given")
+    if candidates is None:
+        candidates = generate_candidates(graph, hw)
+    return _decide(graph, hw, candidates, objective)
+
+
+def select_schedule(
+    estimates: Mapping[str, ScheduleEstimate],
+    hw: HardwareConfig,
+    objective: str = "bytes",
+    op_order: Optional[Tuple[int, ...]] = None,
+) -> CompilationResult:
+    """Pick a schedule from hardware-independent estimates.
+
+    Estimates only need recomputing when the graph or the candidate set
+    changes, so what-if tools can call this once per ``HardwareConfig``.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective {objective!r}. Known: {list(OBJECTIVES)}")
+    costs = {name: est.cost_on(hw) for name, est in estimates.items()}
+    best, feasible, use_latency = _pick(costs, objective)
+    with span("format_reason"):
+        reason = _explain(best, costs, hw, feasible, use_latency)
+
     return CompilationResult(
         chosen_schedule=best.schedule,
         costs=costs,
         reason=reason,
+        op_order=op_order,
     )
 
+
+def _pick(costs: Mapping[str, ScheduleCost], objective: str) -> Tuple[ScheduleCost, bool, bool]:
+    """Best cost, whether any candidate is feasible, and whether latency ranked them."""
+    feasible_costs = [c for c in costs.values() if c.feasible]
+    use_latency = objective == "latency" and all(
+        c.latency_s is not None for c in costs.values()
+    )
+    if feasible_costs and use_latency:
+        best = min(
+            feasible_costs,
+            key=lambda c: (
+                c.latency_s,
+                c.dram.total_bytes,
+                0 if c.schedule.name == "memory_aware" else 1,
+            ),
+        )
+    elif feasible_costs and all(c.memory_time_s is not None for c in costs.values()):
+        # Memory hierarchy: a byte to a fast level is cheaper than one to HBM.
+        best = min(
+            feasible_costs,
+            key=lambda c: (
+                c.memory_time_s,
+                c.dram.total_bytes,
+                0 if c.schedule.name == "memory_aware" else 1,
+            ),
+        )
+    elif feasible_costs:
+        best = min(
+            feasible_costs,
+            key=lambda c: (
+                c.dram.total_bytes,
+                0 if c.schedule.name == "memory_aware" else 1,
+            ),
+        )
+    else:
+        best = min(costs.values(), key=lambda c: c.penalized_cost)
+    return best, bool(feasible_costs), use_latency
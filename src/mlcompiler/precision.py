@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .compact import CompactGraph
+from .hardware import HardwareConfig
+from .ir import Graph, Op, _dtype_bytes
+from .pass_schedule import OBJECTIVES, CompilationResult, run_schedule_pass
+
+Dtype = Union[str, int]
+
+# Op kinds whose inputs and outputs must not be stored narrower than this.
+DEFAULT_PRECISION_FLOORS: Mapping[str, Dtype] = {
+    "Softmax": "float16",
+    "LayerNorm": "float16",
+}
+
+
+def apply_storage_dtypes(graph: Graph, dtypes: Mapping[str, Dtype]) -> Graph:
+    """Copy of ``graph`` whose intermediates in ``dtypes`` are stored at that dtype.
+
+    Every op touching such a tensor gets a ``compute_dtype`` attr (its
+    original output dtype), and producers get a ``storage_dtype``. Shape
+    inference then reports the stored dtype, and the cost model charges
+    quantize/dequantize work around the op.
+    """
+    tensors = graph.shape_table()
+    ops: List[Op] = []
+    for op in graph.ops:
+        attrs = dict(op.attrs)
+        if any(name in dtypes for name in (*op.inputs, *op.outputs)):
+            attrs["compute_dtype"] = tensors[op.outputs[0]].dtype
+            if op.outputs and op.outputs[0] in dtypes:
+                attrs["storage_dtype"] = dtypes[op.outputs[0]]
+        ops.append(Op(op.name, list(op.inputs), list(op.outputs), attrs))
+    return Graph(ops=ops, inputs=dict(graph.inputs), outputs=list(graph.outputs))
+
+
+def _storage_options(
+    graph: Graph, allowed: Sequence[Dtype], floors: Mapping[str, Dtype]
+) -> Dict[str, List[Dtype]]:
+    """Narrower dtypes each intermediate may be stored at, widest first."""
+    tensors = graph.shape_table()
+    outputs = set(graph.outputs)
+    floor: Dict[str, int] = {}
+    for op in graph.ops:
+        if op.name in floors:
+            width = _dtype_bytes(floors[op.name])
+            for name in (*op.inputs, *op.outputs):
+                floor[name] = max(floor.get(name, 0), width)
+    options: Dict[str, List[Dtype]] = {}
+    for op in graph.ops:
+        # A storage dtype applies to all of an op's outputs; keep it simple.
+        if len(op.outputs) != 1 or op.outputs[0] in outputs:
+            continue
+        name = op.outputs[0]
+        width = _dtype_bytes(tensors[name].dtype)
+        narrower = [
+            d for d in allowed if floor.get(name, 0) <= _dtype_bytes(d) < width
+        ]
+        if narrower:
+            options[name] = sorted(narrower, key=lambda d: -_dtype_bytes(d))
+    return options
+
+
+def run_precision_pass(
+    graph: Union[Graph, CompactGraph],
+    hw: HardwareConfig,
+    allowed: Sequence[Dtype] = ("float16", "int8"),
+    floors: Optional[Mapping[str, Dtype]] = None,
+    objective: str = "bytes",
+    **pass_kwargs: Any,
+) -> CompilationResult:
+    """Pick storage dtypes for intermediates, then schedule the narrowed graph.
+
+    A configuration is scored by its chosen schedule: feasible first, then
+    (under ``objective="latency"``) latency, then DRAM bytes, then the
+    quantize/dequantize FLOPs, then peak SRAM. Narrowing is only kept when
+    it buys something, so a graph that already runs on-chip is unchanged.
+
+    The search narrows, one step at a time, the largest tensor live at the
+    memory_aware SRAM peak until that schedule fits or nothing there can
+    narrow. It keeps the best configuration seen, then widens back any
+    tensor whose narrowing no longer pays. ``floors`` maps op kinds to the
+    narrowest dtype they may read or write (``DEFAULT_PRECISION_FLOORS``
+    by default). The result's ``storage_dtypes`` lists the narrowed
+    tensors. Its costs describe ``apply_storage_dtypes(graph,
+    result.storage_dtypes)``.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective {objective!r}. Known: {list(OBJECTIVES)}")
+    if isinstance(graph, CompactGraph):
+        graph = graph.to_graph()
+    options = _storage_options(
+        graph, allowed, DEFAULT_PRECISION_FLOORS if floors is None else floors
+    )
+
+    def evaluate(dtypes: Dict[str, Dtype]) -> Tuple[Tuple[Any, ...], CompilationResult]:
+        narrowed = apply_storage_dtypes(graph, dtypes) if dtypes else graph
+        result = run_schedule_pass(narrowed, hw, objective=objective, **pass_kwargs)
+        cost = result.costs[result.chosen_schedule.name]
+        flops = cost.flops.total_flops if cost.flops is not None else 0
+        latency = cost.latency_s if objective == "latency" and cost.latency_s is not None else 0.0
+        key = (
+            not cost.feasible,
+            latency,
+            cost.dram.total_bytes,
+            flops,
+            cost.sram.peak_bytes,
+        )
+        return key, result
+
+    current: Dict[str, Dtype] = {}
+    best_key, best_result = evaluate(current)
+    best = dict(current)
+    result = best_result
+    while True:
+        mem = result.costs.get("memory_aware")
+        if mem is None or mem.feasible:
+            break
+        live = mem.sram.live_at_peak
+        narrowable = [
+            name
+            for name in sorted(live, key=lambda n: -live[n])
+            if name in options and options[name][-1] != current.get(name)
+        ]
+        if not narrowable:
+            break
+        name = narrowable[0]
+        step = options[name]
+        at = step.index(current[name]) + 1 if name in current else 0
+        current = {**current, name: step[at]}
+        key, result = evaluate(current)
+        if key < best_key:
+            best_key, best_result, best = key, result, dict(current)
+
+    for name in sorted(best, key=lambda n: -_dtype_bytes(best[n])):
+        trial = {k: v for k, v in best.items() if k != name}
+        key, result = evaluate(trial)
+        if key <= best_key:
+            best_key, best_result, best = key, result, trial
+
+    return replace(best_result, storage_dtypes=best or None)
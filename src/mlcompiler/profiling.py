@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+# The profiler currently collecting, if any. Instrumented code checks this one
+# global, so a disabled profiler costs a function call and a None test.
+_ACTIVE: Optional["Profiler"] = None
+
+
+@dataclass(frozen=True)
+class SpanEvent:
+    name: str
+    start_ns: int
+    dur_ns: int
+    tid: int
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Profiler:
+    """Collects timed spans and counters while installed by ``profile()``."""
+
+    events: List[SpanEvent] = field(default_factory=list)
+    counters: Dict[str, int] = field(default_factory=dict)
+    origin_ns: int = field(default_factory=time.perf_counter_ns)
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def stage_totals(self) -> Dict[str, Dict[str, float]]:
+        """Calls and total/mean wall time (seconds) per span name."""
+        totals: Dict[str, Dict[str, float]] = {}
+        for ev in self.events:
+            row = totals.setdefault(ev.name, {"calls": 0, "total_s": 0.0})
+            row["calls"] += 1
+            row["total_s"] += ev.dur_ns / 1e9
+        for row in totals.values():
+            row["mean_s"] = row["total_s"] / row["calls"]
+        return totals
+
+    def summary(self) -> str:
+        """Plain-text table of span totals (slowest first) followed by counters."""
+        totals = self.stage_totals()
+        lines = [f"{'stage':<28} {'calls':>7} {'total ms':>10} {'mean us':>10}"]
+        for name, row in sorted(totals.items(), key=lambda kv: -kv[1]["total_s"]):
+            lines.append(
+                f"{name:<28} {int(row['calls']):>7} "
+                f"{row['total_s'] * 1e3:>10.3f} {row['mean_s'] * 1e6:>10.1f}"
+            )
+        if self.counters:
+            lines.append("")
+            lines.append(f"{'counter':<28} {'value':>7}")
+            for name in sorted(self.counters):
+                lines.append(f"{name:<28} {self.counters[name]:>7}")
+        return "\n".join(lines)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Trace-event JSON loadable by chrome://tracing and Perfetto."""
+        pid = os.getpid()
+        trace: List[Dict[str, Any]] = []
+        end_us = 0.0
+        for ev in self.events:
+            ts = (ev.start_ns - self.origin_ns) / 1e3
+            dur = ev.dur_ns / 1e3
+            end_us = max(end_us, ts + dur)
+            trace.append(
+                {
+                    "name": ev.name,
+                    "cat": "mlcompiler",
+                    "ph": "X",
+                    "ts": ts,
+                    "dur": dur,
+                    "pid": pid,
+                    "tid": ev.tid,
+                    "args": ev.args,
+                }
+            )
+        if self.counters:
+            trace.append(
+                {
+                    "name": "counters",
+                    "ph": "C",
+                    "ts": end_us,
+                    "pid": pid,
+                    "args": dict(self.counters),
+                }
+            )
+        return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+class _Span:
+    __slots__ = ("_profiler", "_name", "_args", "_start")
+
+    def __init__(self, profiler: Profiler, name: str, args: Dict[str, Any]) -> None:
+        self._profiler = profiler
+        self._name = name
+        self._args = args
+        self._start = 0
+
+    def __enter__(self) -> "_Span":
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        end = time.perf_counter_ns()
+        self._profiler.events.append(
+            SpanEvent(self._name, self._start, end - self._start, threading.get_ident(), self._args)
+        )
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, **args: Any):
+    """Time a block as one trace event when profiling is enabled."""
+    profiler = _ACTIVE
+    if profiler is None:
+        return _NULL_SPAN
+    return _Span(profiler, name, args)
+
+
+def count(name: str, n: int = 1) -> None:
+    """Bump a named counter when profiling is enabled."""
+    profiler = _ACTIVE
+    if profiler is not None:
+        profiler.count(name, n)
+
+
+def is_profiling() -> bool:
+    return _ACTIVE is not None
+
+
+@contextmanager
+def profile(profiler: Optional[Profiler] = None) -> Iterator[Profiler]:
+    """Install a profiler for the duration of the block.
+
+    Collection is process-global (not per thread); nested ``profile()`` blocks
+    restore the outer profiler on exit.
+    """
+    global _ACTIVE
+    prof = profiler if profiler is not None else Profiler()
+    prev = _ACTIVE
+    _ACTIVE = prof
+    try:
+        yield prof
+    finally:
+        _ACTIVE = prev
@@ -0,0 +1,707 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Set, Tuple, Union
+
+from .compact import CompactGraph
+from .cost import (
+    DramEstimate,
+    ScheduleEstimate,
+    SramEstimate,
+    _ceil_div,
+    _prod,
+    _require_numpy,
+    estimate_schedule,
+)
+from .fusion import split_by_groups
+from .ir import OP_RULES, Graph, Op, Tensor, _dtype_bytes
+from .liveness import compute_live_ranges
+from .ops import _param_dtype
+from .ordering import reorder_graph
+from .schedule import Schedule
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# (tensor, column chunk or None for the whole row tile, instance). Instances
+# above 0 are copies a remat schedule recomputes for one reader.
+_Key = Tuple[str, Optional[int], int]
+
+# Analytic breakdown entries that the executor reports under another name.
+_ALIASES = {"recompute_reread": "input_reread"}
+
+_LAYERNORM_EPS = 1e-5
+
+
+@dataclass(frozen=True)
+class ExecutionReport:
+    """What running a schedule moved, next to what the cost model predicted.
+
+    ``dram`` and ``sram`` use the estimators' breakdown keys. Weight loads
+    are reported too: ``weight_read`` for the first pass over each weight and
+    ``weight_reread`` for the rest. ``sram.peak_bytes`` counts what the
+    estimates count: intermediates, plus the input and output row tiles
+    (``io_row_tiles``) of a tiled schedule. ``sram.breakdown["total_resident"]``
+    adds everything else that was on-chip at the same time, weights included.
+    """
+
+    schedule: Schedule
+    dram: DramEstimate
+    sram: SramEstimate
+    estimate: ScheduleEstimate
+    outputs: Dict[str, "np.ndarray"]
+    # Largest gap between ``outputs`` and a plain op-by-op evaluation.
+    max_abs_error: float
+    # Number of individual DRAM reads and writes.
+    transfers: int
+
+    def differences(self) -> Dict[str, int]:
+        """Measured minus estimated bytes, for every quantity that differs."""
+        diffs: Dict[str, int] = {}
+        gap = self.dram.total_bytes - self.estimate.dram.total_bytes
+        if gap:
+            diffs["dram_bytes"] = gap
+        estimated: Dict[str, int] = {}
+        for key, value in self.estimate.dram.breakdown.items():
+            key = _ALIASES.get(key, key)
+            estimated[key] = estimated.get(key, 0) + value
+        for key in dict.fromkeys([*self.dram.breakdown, *estimated]):
+            gap = self.dram.breakdown.get(key, 0) - estimated.get(key, 0)
+            if gap:
+                diffs[f"dram.{key}"] = gap
+        gap = self.sram.peak_bytes - self.estimate.sram.peak_bytes
+        if gap:
+            diffs["peak_sram_bytes"] = gap
+        return diffs
+
+
+@dataclass(frozen=True)
+class _Step:
+    """One op execution within a row tile."""
+
+    op: int
+    # "full": whole row tile; "split": one chunk of output features;
+    # "accumulate": one chunk of input features added into the output;
+    # "chunk": an elementwise op on one chunk.
+    mode: str
+    reads: Tuple[_Key, ...]
+    writes: Tuple[_Key, ...]
+    chunk: Optional[int] = None
+
+
+def execute_schedule(
+    graph: Union[Graph, CompactGraph],
+    schedule: Schedule,
+    inputs: Optional[Mapping[str, Any]] = None,
+    seed: int = 0,
+) -> ExecutionReport:
+    """Run ``graph`` with NumPy under ``schedule`` and count every transfer.
+
+    Missing ``inputs`` and all weights are drawn from a generator seeded with
+    ``seed``. Values are computed in float64; byte counts use the graph's
+    dtypes.
+
+    Untiled schedules run op by op. Kept intermediates stay in SRAM from
+    their producer to their last reader; spilled ones (every intermediate
+    under naive, group boundaries under fusion_groups, remat spills) are
+    written to DRAM and loaded by each reader; remat recomputations rerun
+    the producer right before each reader. Graph inputs and weights are
+    loaded from DRAM by every op that reads them.
+
+    A tiled schedule runs the graph once per ``tile_shape[0]`` rows, with
+    every leading dimension flattened into rows as the cost model does.
+    Within a row tile, a Linear whose output is only read by elementwise ops
+    and Linears produces ``tile_shape[-1]`` output features at a time; the
+    elementwise ops follow chunk by chunk, and the next Linear accumulates
+    its output one input chunk at a time. Other ops see whole row tiles.
+    Prefetch buffers of pipelined schedules are not simulated.
+    """
+    np = _require_numpy("the reference executor")
+    if isinstance(graph, CompactGraph):
+        graph = graph.to_graph()
+    if not graph.is_topologically_ordered():
+        graph = reorder_graph(graph, graph.topological_order())
+    estimate = estimate_schedule(graph, schedule)
+    tensors = graph.shape_table()
+    ops = list(graph.walk_ops())
+    rng = np.random.default_rng(seed)
+
+    dram: Dict[str, "np.ndarray"] = {}
+    for name, t in graph.inputs.items():
+        given = None if inputs is None else inputs.get(name)
+        shape = tuple(int(d) for d in t.shape)
+        value = rng.standard_normal(shape) if given is None else np.asarray(given, dtype=np.float64)
+        if value.shape != shape:
+            raise ValueError(f"Input {name!r} has shape {value.shape}, expected {shape}")
+        dram[name] = value
+    weights = [_make_weights(np, rng, op, tensors) for op in ops]
+
+    policy = _policies(graph, schedule)
+    rows = _common_rows(tensors)
+    if schedule.tile_shape is not None and rows is not None:
+        row_tile = max(1, min(int(schedule.tile_shape[0]), rows))
+        feat_tile = max(1, int(schedule.tile_shape[-1]))
+        steps = _tiled_steps(graph, ops, tensors, feat_tile)
+    else:
+        if schedule.tile_shape is not None:
+            raise ValueError("Tiled execution needs every tensor to have the same number of rows")
+        row_tile = rows if rows is not None else 1
+        feat_tile = 0
+        steps = _untiled_steps(graph, ops, policy)
+    # Row tiles that cover whole leading-dimension slices keep their shape;
+    # others are (rows, features) views, which only row-local ops accept.
+    shaped = all(row_tile % _prod(t.shape[1:-1]) == 0 for t in tensors.values() if t.shape)
+    if rows is not None and row_tile < rows:
+        _check_row_local(ops, tensors, shaped)
+    if rows is None:
+        tiles = [None]
+    else:
+        tiles = [slice(r, min(r + row_tile, rows)) for r in range(0, rows, row_tile)]
+
+    machine = _Machine(graph, tensors, policy, feat_tile, shaped, schedule.tile_shape is not None)
+    for rows_slice in tiles:
+        machine.run_tile(np, ops, weights, steps, dram, rows_slice)
+
+    reference = _evaluate(np, graph, ops, weights, {n: dram[n] for n in graph.inputs})
+    outputs = {name: dram[name] for name in graph.outputs}
+    error = max(
+        (float(np.max(np.abs(outputs[n] - reference[n]), initial=0.0)) for n in graph.outputs),
+        default=0.0,
+    )
+    return ExecutionReport(
+        schedule=schedule,
+        dram=machine.dram_estimate(ops, tensors),
+        sram=machine.sram_estimate(),
+        estimate=estimate,
+        outputs=outputs,
+        max_abs_error=error,
+        transfers=machine.transfers,
+    )
+
+
+def _policies(graph: Graph, schedule: Schedule) -> Dict[str, str]:
+    """Per intermediate: "keep" on-chip, "spill" to DRAM, or "recompute"."""
+    ranges = compute_live_ranges(graph)
+    if schedule.strategy == "naive":
+        return {r.name: "spill" for r in ranges}
+    if schedule.strategy == "memory_aware":
+        return {r.name: "keep" for r in ranges}
+    if schedule.strategy == "fusion_groups" and schedule.fusion_groups is not None:
+        _, materialized = split_by_groups(ranges, schedule.fusion_groups, len(graph.ops))
+        spilled = {r.name for r in materialized}
+        return {r.name: "spill" if r.name in spilled else "keep" for r in ranges}
+    if schedule.strategy == "remat" and schedule.remat is not None:
+        actions = dict(schedule.remat)
+        return {r.name: actions.get(r.name, "keep") for r in ranges}
+    raise ValueError(f"Unknown schedule {schedule.name!r}")
+
+
+def _common_rows(tensors: Mapping[str, Tensor]) -> Optional[int]:
+    """The row count (leading dimensions flattened) every tensor shares, or None."""
+    rows = {_prod(t.shape[:-1]) if t.shape else None for t in tensors.values()}
+    if len(rows) != 1:
+        return None
+    return rows.pop()
+
+
+def _check_row_local(ops: Sequence[Op], tensors: Mapping[str, Tensor], shaped: bool) -> None:
+    """Raise unless every op computes each row tile on its own.
+
+    Ops over the last dimension work on any rows; ops that mix the inner
+    dimensions need ``shaped`` tiles of whole leading-dimension slices.
+    """
+    for op in ops:
+        ins = [tensors[n].shape for n in op.inputs]
+        out = tensors[op.outputs[0]].shape if op.outputs else ()
+        if op.name in ("Linear", "Softmax", "LayerNorm"):
+            ok = len(out) >= 2
+        elif op.name == "GELU":
+            ok = True
+        elif op.name == "Add":
+            ok = all(s == out for s in ins)
+        elif op.name == "MatMul":
+            ok = shaped and len(out) >= 3 and all(len(s) == len(out) for s in ins)
+        elif op.name == "Transpose":
+            perm = op.attrs.get("perm")
+            leading = int(perm[0]) == 0 if perm is not None else len(out) >= 3  # type: ignore[index]
+            ok = shaped and leading
+        elif op.name in ("MultiHeadAttention", "Reshape"):
+            ok = shaped and len(out) >= 2
+        else:
+            ok = False
+        if not ok:
+            raise ValueError(f"{op.name} producing {op.outputs} cannot be split into row tiles")
+
+
+def _untiled_steps(graph: Graph, ops: Sequence[Op], policy: Mapping[str, str]) -> List[_Step]:
+    producer = {name: idx for idx, op in enumerate(ops) for name in op.outputs}
+    copies: Dict[str, int] = {}
+    steps: List[_Step] = []
+
+    def read(name: str, made: Dict[str, _Key]) -> _Key:
+        if policy.get(name) != "recompute":
+            return (name, None, 0)
+        if name not in made:
+            idx = producer[name]
+            reads = tuple(read(n, made) for n in ops[idx].inputs)
+            copies[name] = copies.get(name, 0) + 1
+            made[name] = (name, None, copies[name])
+            steps.append(_Step(idx, "full", reads, (made[name],)))
+        return made[name]
+
+    for idx, op in enumerate(ops):
+        if len(op.outputs) == 1 and policy.get(op.outputs[0]) == "recompute":
+            continue
+        made: Dict[str, _Key] = {}
+        reads = tuple(read(n, made) for n in op.inputs)
+        steps.append(_Step(idx, "full", reads, tuple((n, None, 0) for n in op.outputs)))
+    return steps
+
+
+def _tiled_steps(
+    graph: Graph, ops: Sequence[Op], tensors: Mapping[str, Tensor], feat_tile: int
+) -> List[_Step]:
+    """Steps for one row tile, streaming feature chunks where the ops allow it.
+
+    A tensor whose chunks would have to outlive the chunk loop that makes
+    them is produced whole instead, and the layout is redone.
+    """
+    blocked: Set[str] = set()
+    while True:
+        steps = _chunked_layout(graph, ops, tensors, feat_tile, blocked)
+        if isinstance(steps, list):
+            return steps
+        blocked |= steps
+
+
+def _chunked_layout(
+    graph: Graph,
+    ops: Sequence[Op],
+    tensors: Mapping[str, Tensor],
+    feat_tile: int,
+    blocked: Set[str],
+) -> Union[List[_Step], Set[str]]:
+    consumers: Dict[str, List[int]] = {}
+    for idx, op in enumerate(ops):
+        for name in op.inputs:
+            consumers.setdefault(name, []).append(idx)
+
+    # Whether every reader of a tensor can take it one feature chunk at a time.
+    streamable: Dict[str, bool] = {}
+    for idx in reversed(range(len(ops))):
+        for name in ops[idx].outputs:
+            shape = tensors[name].shape
+            ok = name not in blocked and len(shape) >= 2
+            for c in consumers.get(name, ()):
+                reader = ops[c]
+                if reader.name == "Linear":
+                    continue
+                ok = ok and (
+                    reader.name in ("GELU", "Add")
+                    and streamable.get(reader.outputs[0], False)
+                    and all(tensors[n].shape == shape for n in reader.inputs)
+                )
+            streamable[name] = ok
+
+    chunked: Set[str] = set()
+    steps: List[_Step] = []
+    group: List[_Step] = []
+    made_in_group: Set[str] = set()
+
+    def flush(upto: int) -> Optional[Set[str]]:
+        late = {
+            n for n in made_in_group & chunked if any(c > upto for c in consumers.get(n, ()))
+        }
+        if late:
+            return late
+        widths = [int(tensors[n].shape[-1]) for n in made_in_group & chunked]
+        for f in range(_ceil_div(max(widths, default=0), feat_tile)):
+            for step in group:
+                op = ops[step.op]
+                width_of = op.inputs[0] if step.mode == "accumulate" else op.outputs[0]
+                if f * feat_tile >= int(tensors[width_of].shape[-1]):
+                    continue
+                steps.append(
+                    _Step(
+                        step.op,
+                        step.mode,
+                        tuple((n, f if n in chunked else None, 0) for n, _, _ in step.reads),
+                        tuple((n, f if n in chunked else None, 0) for n, _, _ in step.writes),
+                        chunk=f,
+                    )
+                )
+        group.clear()
+        made_in_group.clear()
+        return None
+
+    for idx, op in enumerate(ops):
+        ins_chunked = [n for n in op.inputs if n in chunked]
+        out = op.outputs[0] if len(op.outputs) == 1 else None
+        if op.name == "Linear" and ins_chunked:
+            mode = "accumulate"
+        elif op.name in ("GELU", "Add") and ins_chunked:
+            mode = "chunk"
+            chunked.add(out)  # type: ignore[arg-type]
+        elif (
+            op.name == "Linear"
+            and out is not None
+            and feat_tile < int(tensors[out].shape[-1])
+            and streamable.get(out, False)
+        ):
+            mode = "split"
+            chunked.add(out)
+        else:
+            mode = "full"
+        reads = tuple((n, None, 0) for n in op.inputs)
+        writes = tuple((n, None, 0) for n in op.outputs)
+        whole_from_group = [n for n in op.inputs if n in made_in_group and n not in chunked]
+        if mode in ("chunk", "accumulate") and whole_from_group:
+            # The whole tensor is only complete after the chunk loop.
+            return set(ins_chunked)
+        if mode == "full" or (mode == "split" and whole_from_group):
+            if group:
+                late = flush(idx - 1)
+                if late:
+                    return late
+        if mode == "full":
+            steps.append(_Step(idx, mode, reads, writes))
+            continue
+        group.append(_Step(idx, mode, reads, writes))
+        made_in_group.update(op.outputs)
+    late = flush(len(ops))
+    if late:
+        return late
+    return steps
+
+
+class _Machine:
+    """Simulated SRAM and DRAM; counts every transfer and the resident bytes."""
+
+    def __init__(
+        self,
+        graph: Graph,
+        tensors: Mapping[str, Tensor],
+        policy: Mapping[str, str],
+        feat_tile: int,
+        shaped: bool,
+        tiled: bool,
+    ) -> None:
+        self.feat_tile = feat_tile
+        self.shaped = shaped
+        self.tiled = tiled
+        # Kinds of buffers the estimate for this schedule counts.
+        self.counted = {"intermediate", "input", "output"} if tiled else {"intermediate"}
+        self.inputs = set(graph.inputs)
+        self.outputs = set(graph.outputs)
+        self.tensors = tensors
+        self.policy = policy
+        self.transfers = 0
+        self.traffic: Dict[str, int] = {
+            "intermediate_write": 0,
+            "intermediate_read": 0,
+            "output_write": 0,
+        }
+        self.input_bytes: Dict[str, int] = {}
+        self.weight_bytes: Dict[int, int] = {}
+        self.resident: Dict[Any, Tuple[int, str, str]] = {}
+        self.current = {"counted": 0, "total": 0}
+        self.peak = {"counted": 0, "total": 0}
+        self.intermediate_at_peak = 0
+        self.live_at_peak: Dict[str, int] = {}
+        self.peak_op: Optional[int] = None
+
+    def _alloc(self, key: Any, nbytes: int, kind: str, name: str) -> None:
+        self.resident[key] = (nbytes, kind, name)
+        self.current["total"] += nbytes
+        if kind in self.counted:
+            self.current["counted"] += nbytes
+
+    def _free(self, key: Any) -> None:
+        nbytes, kind, _ = self.resident.pop(key)
+        self.current["total"] -= nbytes
+        if kind in self.counted:
+            self.current["counted"] -= nbytes
+
+    def _record(self, op: int) -> None:
+        self.peak["total"] = max(self.peak["total"], self.current["total"])
+        if self.current["counted"] > self.peak["counted"]:
+            self.peak["counted"] = self.current["counted"]
+            self.peak_op = op
+            live: Dict[str, int] = {}
+            self.intermediate_at_peak = 0
+            for nbytes, kind, name in self.resident.values():
+                if kind in self.counted:
+                    live[name] = live.get(name, 0) + nbytes
+                if kind == "intermediate":
+                    self.intermediate_at_peak += nbytes
+            self.live_at_peak = live
+
+    def _nbytes(self, name: str, value: "np.ndarray") -> int:
+        return int(value.size) * _dtype_bytes(self.tensors[name].dtype)
+
+    def run_tile(
+        self,
+        np: Any,
+        ops: Sequence[Op],
+        weights: Sequence[Dict[str, "np.ndarray"]],
+        steps: Sequence[_Step],
+        dram: Dict[str, "np.ndarray"],
+        rows: Optional[slice],
+    ) -> None:
+        last_read: Dict[_Key, int] = {}
+        last_write: Dict[_Key, int] = {}
+        for i, step in enumerate(steps):
+            for key in step.reads:
+                last_read[key] = i
+            for key in step.writes:
+                last_write[key] = i
+        sram: Dict[_Key, "np.ndarray"] = {}
+
+        for i, step in enumerate(steps):
+            op = ops[step.op]
+            cols = self._cols(step)
+            staged: List[Any] = []
+            args: List["np.ndarray"] = []
+            for pos, key in enumerate(step.reads):
+                name, chunk, _ = key
+                if key in sram:
+                    value = sram[key]
+                    if chunk is None and step.mode == "chunk":
+                        value = value[..., cols]
+                    args.append(value)
+                    continue
+                # Streamed from DRAM for this step only.
+                value = self._rows(dram[name], rows)
+                if step.mode == "chunk" or chunk is not None:
+                    value = value[..., cols]
+                nbytes = self._nbytes(name, value)
+                if name in self.inputs:
+                    self.input_bytes[name] = self.input_bytes.get(name, 0) + nbytes
+                    kind = "input"
+                else:
+                    self.traffic["intermediate_read"] += nbytes
+                    kind = "intermediate"
+                self.transfers += 1
+                staged.append(("load", pos))
+                self._alloc(staged[-1], nbytes, kind, name)
+                args.append(value)
+
+            params = self._weight_slice(op, step, weights[step.op], cols)
+            if params:
+                nbytes = sum(int(w.size) for w in params.values()) * _dtype_bytes(
+                    _param_dtype(op, [self.tensors[n] for n in op.outputs])
+                )
+                self.weight_bytes[step.op] = self.weight_bytes.get(step.op, 0) + nbytes
+                self.transfers += 1
+                staged.append(("weights",))
+                self._alloc(staged[-1], nbytes, "weight", op.name)
+
+            results = _run(np, op, args, params, [self.tensors[n].shape for n in op.outputs])
+            for key, value in zip(step.writes, results):
+                name = key[0]
+                kind = "output" if name in self.outputs else "intermediate"
+                if step.mode == "accumulate" and key in sram:
+                    sram[key] = sram[key] + value
+                    continue
+                sram[key] = value
+                self._alloc(key, self._nbytes(name, value), kind, name)
+            self._record(step.op)
+
+            for item in staged:
+                self._free(item)
+            for key in step.writes:
+                if last_write[key] != i:
+                    continue
+                name, chunk, _ = key
+                value = sram[key]
+                if name in self.outputs or self.policy.get(name) == "spill":
+                    target = dram.setdefault(
+                        name, np.zeros(tuple(int(d) for d in self.tensors[name].shape))
+                    )
+                    self._store(target, rows, cols if chunk is not None else slice(None), value)
+                    label = "output_write" if name in self.outputs else "intermediate_write"
+                    self.traffic[label] += self._nbytes(name, value)
+                    self.transfers += 1
+                    if self.policy.get(name) == "spill":
+                        # Readers load it back from DRAM.
+                        del sram[key]
+                        self._free(key)
+                        continue
+                if last_read.get(key, -1) <= i:
+                    del sram[key]
+                    self._free(key)
+            for key in step.reads:
+                if key in sram and last_read[key] == i and last_write.get(key, -1) <= i:
+                    del sram[key]
+                    self._free(key)
+
+    def _rows(self, value: "np.ndarray", rows: Optional[slice]) -> "np.ndarray":
+        if rows is None:
+            return value
+        flat = value.reshape(-1, value.shape[-1])[rows]
+        return flat.reshape((-1,) + value.shape[1:]) if self.shaped else flat
+
+    def _store(
+        self, target: "np.ndarray", rows: Optional[slice], cols: slice, value: "np.ndarray"
+    ) -> None:
+        if rows is None:
+            target[..., cols] = value
+            return
+        flat = target.reshape(-1, target.shape[-1])
+        flat[rows, cols] = value.reshape(-1, value.shape[-1])
+
+    def _cols(self, step: _Step) -> slice:
+        if step.chunk is None:
+            return slice(None)
+        return slice(step.chunk * self.feat_tile, (step.chunk + 1) * self.feat_tile)
+
+    def _weight_slice(
+        self, op: Op, step: _Step, params: Dict[str, "np.ndarray"], cols: slice
+    ) -> Dict[str, "np.ndarray"]:
+        if not params:
+            return {}
+        if step.mode == "split":
+            return {k: v[..., cols] for k, v in params.items()}
+        if step.mode == "accumulate":
+            part = {"weight": params["weight"][cols]}
+            if "bias" in params and step.chunk == 0:
+                part["bias"] = params["bias"]
+            return part
+        return params
+
+    def dram_estimate(self, ops: Sequence[Op], tensors: Mapping[str, Tensor]) -> DramEstimate:
+        input_read = input_reread = 0
+        for name, loaded in self.input_bytes.items():
+            first = min(loaded, tensors[name].nbytes())
+            input_read += first
+            input_reread += loaded - first
+        weight_read = weight_reread = 0
+        for idx, loaded in self.weight_bytes.items():
+            op = ops[idx]
+            full = OP_RULES[op.name].param_bytes(
+                op, [tensors[n] for n in op.inputs], [tensors[n] for n in op.outputs]
+            )
+            first = min(loaded, full)
+            weight_read += first
+            weight_reread += loaded - first
+        breakdown = {
+            "input_read": input_read,
+            "intermediate_write": self.traffic["intermediate_write"],
+            "intermediate_read": self.traffic["intermediate_read"],
+            "output_write": self.traffic["output_write"],
+            "weight_read": weight_read,
+            "weight_reread": weight_reread,
+            "input_reread": input_reread,
+        }
+        return DramEstimate(total_bytes=sum(breakdown.values()), breakdown=breakdown)
+
+    def sram_estimate(self) -> SramEstimate:
+        breakdown = {"intermediate_resident": self.intermediate_at_peak}
+        if self.tiled:
+            breakdown["io_row_tiles"] = self.peak["counted"] - self.intermediate_at_peak
+        breakdown["total_resident"] = self.peak["total"]
+        return SramEstimate(
+            peak_bytes=self.peak["counted"],
+            breakdown=breakdown,
+            live_at_peak=self.live_at_peak,
+            peak_op_index=self.peak_op,
+        )
+
+
+def _make_weights(
+    np: Any, rng: Any, op: Op, tensors: Mapping[str, Tensor]
+) -> Dict[str, "np.ndarray"]:
+    """Random weights sized like ``OpRule.param_bytes`` counts them."""
+    if op.name == "Linear":
+        n_in = int(op.attrs["in_features"])  # type: ignore[call-overload]
+        n_out = int(op.attrs["out_features"])  # type: ignore[call-overload]
+        params = {"weight": rng.standard_normal((n_in, n_out)) / math.sqrt(n_in)}
+        if op.attrs.get("bias"):
+            params["bias"] = rng.standard_normal(n_out)
+        return params
+    if op.name == "LayerNorm":
+        shape = tensors[op.outputs[0]].shape
+        if not op.attrs.get("elementwise_affine", True) or not shape:
+            return {}
+        dim = int(shape[-1])
+        return {
+            "weight": 1.0 + 0.1 * rng.standard_normal(dim),
+            "bias": 0.1 * rng.standard_normal(dim),
+        }
+    if op.name == "MultiHeadAttention":
+        dim = int(op.attrs["embed_dim"])  # type: ignore[call-overload]
+        return {k: rng.standard_normal((dim, dim)) / math.sqrt(dim) for k in ("q", "k", "v", "o")}
+    return {}
+
+
+def _softmax(np: Any, x: "np.ndarray") -> "np.ndarray":
+    e = np.exp(x - x.max(axis=-1, keepdims=True))
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+def _run(
+    np: Any,
+    op: Op,
+    args: Sequence["np.ndarray"],
+    params: Mapping[str, "np.ndarray"],
+    out_shapes: Sequence[Tuple[Any, ...]],
+) -> List["np.ndarray"]:
+    """Reference kernel for one op; works on whole tensors, row tiles and chunks."""
+    x = args[0] if args else None
+    if op.name == "Linear":
+        y = x @ params["weight"]
+        return [y + params["bias"] if "bias" in params else y]
+    if op.name == "GELU":
+        return [0.5 * x * (1.0 + np.tanh(math.sqrt(2.0 / math.pi) * (x + 0.044715 * x**3)))]
+    if op.name == "Add":
+        total = args[0]
+        for other in args[1:]:
+            total = total + other
+        return [total]
+    if op.name == "Softmax":
+        return [_softmax(np, x)]
+    if op.name == "LayerNorm":
+        mean = x.mean(axis=-1, keepdims=True)
+        y = (x - mean) / np.sqrt(x.var(axis=-1, keepdims=True) + _LAYERNORM_EPS)
+        return [y * params["weight"] + params["bias"] if params else y]
+    if op.name == "MatMul":
+        return [np.matmul(args[0], args[1])]
+    if op.name == "Reshape":
+        return [x.reshape((-1,) + tuple(int(d) for d in out_shapes[0][1:]))]
+    if op.name == "Transpose":
+        perm = op.attrs.get("perm")
+        if perm is None:
+            perm = tuple(range(x.ndim - 2)) + (x.ndim - 1, x.ndim - 2)
+        return [np.transpose(x, tuple(int(p) for p in perm))]  # type: ignore[union-attr]
+    if op.name == "MultiHeadAttention":
+        kv = args[1] if len(args) > 1 else x
+        heads = int(op.attrs["num_heads"])  # type: ignore[call-overload]
+        batch, q_len, dim = x.shape
+        head_dim = dim // heads
+
+        def split(t: "np.ndarray") -> "np.ndarray":
+            return t.reshape(t.shape[0], t.shape[1], heads, head_dim).transpose(0, 2, 1, 3)
+
+        q, k, v = split(x @ params["q"]), split(kv @ params["k"]), split(kv @ params["v"])
+        attn = _softmax(np, q @ k.transpose(0, 1, 3, 2) / math.sqrt(head_dim))
+        out = (attn @ v).transpose(0, 2, 1, 3).reshape(batch, q_len, dim)
+        return [out @ params["o"]]
+    raise NotImplementedError(f"The reference executor has no kernel for op {op.name!r}")
+
+
+def _evaluate(
+    np: Any,
+    graph: Graph,
+    ops: Sequence[Op],
+    weights: Sequence[Mapping[str, "np.ndarray"]],
+    inputs: Mapping[str, "np.ndarray"],
+) -> Dict[str, "np.ndarray"]:
+    """Plain op-by-op evaluation, the ground truth for ``max_abs_error``."""
+    tensors = graph.shape_table()
+    values = dict(inputs)
+    for idx, op in enumerate(ops):
+        ins = [values[n] for n in op.inputs]
+        outs = _run(np, op, ins, weights[idx], [tensors[n].shape for n in op.outputs])
+        values.update(zip(op.outputs, outs))
+    return values
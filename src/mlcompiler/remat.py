@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Set, Tuple
+
+from .hardware import HardwareConfig
+from .ir import OP_RULES, Graph, Op
+from .liveness import LiveRange, compute_live_ranges, peak_residency
+from .ops import conversion_flops
+from .schedule import RematActions
+
+REMAT_ACTIONS = ("keep", "spill", "recompute")
+
+# FLOPs worth one byte of DRAM traffic when the hardware gives no rates;
+# roughly the compute/bandwidth balance of current accelerators.
+DEFAULT_FLOPS_PER_BYTE = 100.0
+
+
+@dataclass(frozen=True)
+class RematLayout:
+    """Where each intermediate lives under a set of remat actions.
+
+    ``resident`` is SRAM occupancy: kept tensors stay from their producer
+    to their last read, spilled tensors only at their producer and at each
+    read, and recomputed tensors never (their producer reruns inside each
+    reader). ``spilled`` holds the off-chip live ranges of spilled tensors.
+    """
+
+    resident: Tuple[LiveRange, ...]
+    spilled: Tuple[LiveRange, ...]
+    # Extra FLOPs per recomputed tensor: one rerun per read beyond the first.
+    extra_flops: Dict[str, int]
+    # Graph inputs read again from DRAM by recomputations at extra points.
+    reread_bytes: int
+
+
+@dataclass(frozen=True)
+class RematPlan:
+    actions: RematActions
+    extra_flops: int
+    spilled_bytes: int
+    peak_sram_bytes: int
+
+
+def remat_layout(graph: Graph, actions: Mapping[str, str]) -> RematLayout:
+    """Live ranges and extra work for ``actions``; unlisted intermediates are kept.
+
+    Only single-output elementwise ops (``OpRule.elementwise``) can be
+    recomputed. A recomputed tensor is read wherever its readers are, so its
+    own inputs must stay available until then.
+    """
+    return graph._memoized(
+        f"remat_layout:{sorted(actions.items())!r}", lambda: _layout(graph, actions)
+    )
+
+
+def _layout(graph: Graph, actions: Mapping[str, str]) -> RematLayout:
+    tensors = graph.shape_table()
+    ops = list(graph.walk_ops())
+    ranges = {r.name: r for r in compute_live_ranges(graph)}
+    producer: Dict[str, int] = {}
+    consumers: Dict[str, List[int]] = {}
+    for idx, op in enumerate(ops):
+        for name in op.inputs:
+            consumers.setdefault(name, []).append(idx)
+        for name in op.outputs:
+            producer[name] = idx
+
+    for name, action in actions.items():
+        if action not in REMAT_ACTIONS:
+            raise ValueError(f"Unknown remat action {action!r}. Known: {list(REMAT_ACTIONS)}")
+        if name not in ranges:
+            raise ValueError(f"{name!r} is not an intermediate of the graph")
+        if action == "recompute" and not _recomputable(ops[producer[name]], consumers):
+            raise ValueError(f"{name!r} is not produced by a single-output elementwise op")
+
+    # Op positions where each tensor must be on-chip, latest producers first
+    # so a recomputed reader's positions are known before its inputs'.
+    reads: Dict[str, Set[int]] = {}
+    order = sorted(producer, key=lambda n: -producer[n]) + list(graph.inputs)
+    for name in order:
+        points: Set[int] = set()
+        for idx in consumers.get(name, ()):
+            out = ops[idx].outputs[0] if ops[idx].outputs else None
+            if out is not None and actions.get(out) == "recompute":
+                points |= reads[out]
+            else:
+                points.add(idx)
+        reads[name] = points
+
+    resident: List[LiveRange] = []
+    spilled: List[LiveRange] = []
+    extra: Dict[str, int] = {}
+    for name, r in ranges.items():
+        action = actions.get(name, "keep")
+        end = max(reads[name], default=r.start)
+        if action == "keep":
+            resident.append(LiveRange(name, r.start, max(end, r.start), r.nbytes))
+        elif action == "spill":
+            for point in sorted({r.start} | reads[name]):
+                resident.append(LiveRange(name, point, point, r.nbytes))
+            spilled.append(LiveRange(name, r.start, max(end, r.start), r.nbytes))
+        else:
+            op = ops[r.start]
+            ins = [tensors[n] for n in op.inputs]
+            outs = [tensors[n] for n in op.outputs]
+            flops = OP_RULES[op.name].flops(op, ins, outs) + conversion_flops(op, ins, outs)
+            extra[name] = max(0, len(reads[name]) - 1) * flops
+
+    reread = 0
+    for name, t in graph.inputs.items():
+        direct = set(consumers.get(name, ()))
+        reread += max(0, len(reads[name]) - len(direct)) * t.nbytes()
+    return RematLayout(tuple(resident), tuple(spilled), extra, reread)
+
+
+def _recomputable(op: Op, consumers: Mapping[str, List[int]]) -> bool:
+    rule = OP_RULES.get(op.name)
+    return (
+        rule is not None
+        and rule.elementwise
+        and len(op.outputs) == 1
+        and bool(consumers.get(op.outputs[0]))
+    )
+
+
+def plan_rematerialization(graph: Graph, hw: HardwareConfig) -> RematPlan:
+    """Decide, per intermediate, whether to keep it on-chip, spill it or recompute it.
+
+    Starting from memory_aware (everything kept), each step looks at the
+    tensors live at the SRAM peak and applies the change with the lowest
+    cost per byte it takes off the peak. Recomputing costs its extra FLOPs,
+    spilling its DRAM round trip; the two are compared in time on ``hw``,
+    or at ``DEFAULT_FLOPS_PER_BYTE`` when ``hw`` has no rates. The search
+    stops once the peak fits in SRAM or no change lowers it, then returns
+    to "keep" any tensor the final plan no longer needs to move.
+    """
+    if hw.compute_Gops and hw.dram_bandwidth_GBs:
+        flops_per_byte = hw.compute_Gops / hw.dram_bandwidth_GBs
+    else:
+        flops_per_byte = DEFAULT_FLOPS_PER_BYTE
+    ops = list(graph.walk_ops())
+    consumers: Dict[str, List[int]] = {}
+    for idx, op in enumerate(ops):
+        for name in op.inputs:
+            consumers.setdefault(name, []).append(idx)
+    recomputable = {
+        op.outputs[0] for op in ops if op.outputs and _recomputable(op, consumers)
+    }
+
+    def score(actions: Dict[str, str]) -> Tuple[int, float]:
+        layout = remat_layout(graph, actions)
+        peak = peak_residency(list(layout.resident), len(ops))
+        moved = 2 * sum(r.nbytes for r in layout.spilled) + layout.reread_bytes
+        return peak.peak_bytes, sum(layout.extra_flops.values()) / flops_per_byte + moved
+
+    actions: Dict[str, str] = {}
+    peak, cost = score(actions)
+    while peak > hw.sram_bytes:
+        layout = remat_layout(graph, actions)
+        live = peak_residency(list(layout.resident), len(ops)).live
+        best: Optional[Tuple[float, Dict[str, str], int, float]] = None
+        for name in sorted(live):
+            current = actions.get(name, "keep")
+            for action in ("recompute", "spill"):
+                if action == current or (action == "recompute" and name not in recomputable):
+                    continue
+                trial = {**actions, name: action}
+                trial_peak, trial_cost = score(trial)
+                if trial_peak >= peak:
+                    continue
+                per_byte = (trial_cost - cost) / (peak - trial_peak)
+                if best is None or per_byte < best[0]:
+                    best = (per_byte, trial, trial_peak, trial_cost)
+        if best is None:
+            break
+        _, actions, peak, cost = best
+
+    tensors = graph.shape_table()
+    for name in sorted(actions, key=lambda n: -tensors[n].nbytes()):
+        trial = {k: v for k, v in actions.items() if k != name}
+        trial_peak, trial_cost = score(trial)
+        if trial_peak <= max(peak, hw.sram_bytes) and trial_cost <= cost:
+            actions, peak, cost = trial, trial_peak, trial_cost
+
+    layout = remat_layout(graph, actions)
+    return RematPlan(
+        actions=tuple(sorted(actions.items())),
+        extra_flops=sum(layout.extra_flops.values()),
+        spilled_bytes=sum(r.nbytes for r in layout.spilled),
+        peak_sram_bytes=peak,
+    )
+
+
+def generate_remat_candidate(graph: Graph, hw: HardwareConfig) -> Optional[RematActions]:
+    """Actions worth offering as a candidate, or None if the plan keeps everything."""
+    if not graph.ops:
+        return None
+    plan = plan_rematerialization(graph, hw)
+    return plan.actions or None
@@ -5,6 +5,10 @@ from typing import Optional, Tuple
 
 
 TileShape = Tuple[int, ...]
+# Contiguous [start, stop) ranges of Graph.ops.
+FusionGroups = Tuple[Tuple[int, int], ...]
+# (intermediate, "spill" | "recompute") pairs; unlisted intermediates stay on-chip.
+RematActions = Tuple[Tuple[str, str], ...]
 
 
 @dataclass(frozen=True)
@@ -12,6 +16,18 @@ class Schedule:
     name: str
     description: str
     tile_shape: Optional[TileShape] = None
+    # Cost-model family for variants of a base schedule (e.g. tiled
+    # memory_aware); empty means the name itself is the family.
+    kind: str = ""
+    fusion_groups: Optional[FusionGroups] = None
+    # Buffers per streamed tile: 1 loads each tile and then computes on it;
+    # 2 or more prefetch the next tile while the current one computes.
+    buffers: int = 1
+    remat: Optional[RematActions] = None
+
+    @property
+    def strategy(self) -> str:
+        return self.kind or self.name
 
 
 NAIVE_SCHEDULE = Schedule(
@@ -24,3 +40,53 @@ MEMORY_AWARE_SCHEDULE = Schedule(
     description="Keep intermediates on-chip; conceptually tile if needed.",
     tile_shape=None,
 )
+
+
+def tiled_memory_aware_schedule(tile_shape: TileShape) -> Schedule:
+    dims = "x".join(str(d) for d in tile_shape)
+    return Schedule(
+        name=f"memory_aware_tiled_{dims}",
+        description=f"Keep {dims} tiles of intermediates on-chip; stream the rest.",
+        tile_shape=tuple(tile_shape),
+        kind="memory_aware",
+    )
+
+
+def pipelined_memory_aware_schedule(tile_shape: TileShape, buffers: int = 2) -> Schedule:
+    if buffers < 2:
+        raise ValueError(f"A pipelined schedule needs at least 2 buffers, got {buffers}")
+    dims = "x".join(str(d) for d in tile_shape)
+    return Schedule(
+        name=f"memory_aware_pipelined_{dims}_x{buffers}",
+        description=(
+            f"Stream {dims} tiles through {buffers} buffers so tile transfers "
+            "overlap compute."
+        ),
+        tile_shape=tuple(tile_shape),
+        kind="memory_aware",
+        buffers=buffers,
+    )
+
+
+def fusion_groups_schedule(groups: FusionGroups) -> Schedule:
+    return Schedule(
+        name="fusion_groups",
+        description=(
+            f"Fuse ops into {len(groups)} groups; keep group-internal intermediates "
+            "on-chip and materialize group boundaries to DRAM."
+        ),
+        fusion_groups=tuple((int(a), int(b)) for a, b in groups),
+    )
+
+
+def remat_schedule(actions: RematActions) -> Schedule:
+    recomputed = sum(1 for _, action in actions if action == "recompute")
+    spilled = sum(1 for _, action in actions if action == "spill")
+    return Schedule(
+        name="remat",
+        description=(
+            f"Recompute {recomputed} and spill {spilled} intermediates; "
+            "keep the rest on-chip."
+        ),
+        remat=tuple((str(name), str(action)) for name, action in actions),
+    )
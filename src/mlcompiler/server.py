@@ -0,0 +1,394 @@
+"""Local asyncio compile server.
+
+Clients talk newline-delimited JSON over a Unix socket or localhost TCP.
+A request is::
+
+    {"id": 7, "graph": <graph record, see mlcompiler.stream>,
+     "hw": {"sram_bytes": 1048576}, "options": {"tiling": true}}
+
+and the response is ``{"id": 7, "result": <result record>}`` or
+``{"id": 7, "error": "..."}``. Responses on one connection may arrive out of
+order, so match them by ``id``. ``{"id": ..., "op": "stats"}`` returns
+``CompileServer.stats()``.
+
+Identical requests share one compile while it is in flight, and the most
+recent ``recent_results`` answers are kept in an LRU for repeats that arrive
+later. Wire requests are keyed by their canonical JSON, so a repeat is
+answered without parsing the graph; ``compile()`` keys by ``structural_hash``.
+Distinct requests are micro-batched, up to ``max_batch`` or ``batch_window_s``,
+and each batch is handed to a worker pool. The pending queue is bounded, so
+when it is full the server stops reading from sockets until workers catch up.
+"""
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import hashlib
+import json
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+
+from .batch import _describe
+from .cache import structural_hash
+from .hardware import HardwareConfig
+from .ir import Graph
+from .pass_schedule import CompilationResult, run_schedule_pass
+from .stream import graph_from_record, graph_to_record, result_to_record
+
+# Graphs from the wire stay as records so parsing happens in the workers.
+_Job = Tuple[Union[Graph, Dict[str, Any]], HardwareConfig, Dict[str, Any]]
+# Outcome of one job: (result, None) or (None, error message).
+_Outcome = Tuple[Optional[CompilationResult], Optional[str]]
+
+# Only the most recent latencies feed the percentiles.
+_LATENCY_WINDOW = 10_000
+
+
+class CompileError(RuntimeError):
+    """A request reached the pass but the graph failed to compile."""
+
+
+def _compile_jobs(jobs: List[_Job]) -> List[_Outcome]:
+    outcomes: List[_Outcome] = []
+    for graph, hw, options in jobs:
+        try:
+            if isinstance(graph, dict):
+                graph = graph_from_record(graph)
+            outcomes.append((run_schedule_pass(graph, hw, **options), None))
+        except Exception as e:
+            outcomes.append((None, _describe(e)))
+    return outcomes
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+class CompileServer:
+    """Coalescing, micro-batching front end for ``run_schedule_pass``.
+
+    ``workers`` batches run at once. With ``executor=None`` they go to a
+    process pool of that size, created on ``start()``; pass any
+    ``concurrent.futures.Executor`` to use it instead.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        max_batch: int = 32,
+        batch_window_s: float = 0.002,
+        max_queue: int = 1024,
+        recent_results: int = 1024,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        if workers < 1:
+            raise ValueError(f"workers must be positive, got {workers}")
+        if max_batch < 1 or max_queue < 1:
+            raise ValueError("max_batch and max_queue must be positive")
+        self.workers = workers
+        self.max_batch = max_batch
+        self.batch_window_s = batch_window_s
+        self.max_queue = max_queue
+        self.recent_results = recent_results
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._queue: Optional["asyncio.Queue[Tuple[str, _Job]]"] = None
+        self._inflight: Dict[str, "asyncio.Future[CompilationResult]"] = {}
+        self._recent: "OrderedDict[str, CompilationResult]" = OrderedDict()
+        self._connections: Dict["asyncio.Task[None]", asyncio.StreamWriter] = {}
+        self._batcher: Optional["asyncio.Task[None]"] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._running: set = set()
+        self._latencies: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._requests = 0
+        self._coalesced = 0
+        self._recent_hits = 0
+        self._batches = 0
+        self._batched_jobs = 0
+
+    async def start(self) -> None:
+        if self._batcher is not None:
+            return
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._slots = asyncio.Semaphore(self.workers)
+        self._batcher = asyncio.get_running_loop().create_task(self._batch_loop())
+
+    async def close(self) -> None:
+        handlers = list(self._connections.items())
+        for _, writer in handlers:
+            writer.close()
+        if handlers:
+            await asyncio.gather(*(task for task, _ in handlers), return_exceptions=True)
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def __aenter__(self) -> "CompileServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.close()
+
+    async def compile(
+        self, graph: Graph, hw: HardwareConfig, **options: Any
+    ) -> CompilationResult:
+        """Compile through the coalescing/batching path; raises ``CompileError`` on failure."""
+        key = "graph:" + structural_hash(graph, hw, None, **options)
+        return await self._submit(key, (graph, hw, options))
+
+    async def _submit(self, key: str, job: _Job) -> CompilationResult:
+        if self._queue is None:
+            raise RuntimeError("CompileServer.start() has not been called")
+        start = time.perf_counter()
+        self._requests += 1
+        try:
+            recent = self._recent.get(key)
+            if recent is not None:
+                self._recent_hits += 1
+                self._recent.move_to_end(key)
+                return recent
+            future = self._inflight.get(key)
+            if future is not None:
+                self._coalesced += 1
+            else:
+                future = asyncio.get_running_loop().create_future()
+                self._inflight[key] = future
+                try:
+                    # Blocks while the queue is full: this is the backpressure.
+                    await self._queue.put((key, job))
+                except BaseException:
+                    self._inflight.pop(key, None)
+                    future.cancel()
+                    raise
+            return await asyncio.shield(future)
+        finally:
+            self._latencies.append(time.perf_counter() - start)
+
+    def _remember(self, key: str, result: CompilationResult) -> None:
+        if self.recent_results <= 0:
+            return
+        self._recent[key] = result
+        while len(self._recent) > self.recent_results:
+            self._recent.popitem(last=False)
+
+    async def _batch_loop(self) -> None:
+        assert self._queue is not None and self._slots is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window_s
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._slots.acquire()
+            task = loop.create_task(self._run_batch(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, _Job]]) -> None:
+        assert self._slots is not None
+        self._batches += 1
+        self._batched_jobs += len(batch)
+        try:
+            try:
+                outcomes = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, _compile_jobs, [job for _, job in batch]
+                )
+            except Exception as e:
+                error = _describe(e)
+                outcomes = [(None, error)] * len(batch)
+            for (key, _), (result, error) in zip(batch, outcomes):
+                future = self._inflight.pop(key, None)
+                if future is None or future.done():
+                    continue
+                if error is None:
+                    assert result is not None
+                    self._remember(key, result)
+                    future.set_result(result)
+                else:
+                    future.set_exception(CompileError(error))
+        finally:
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Request counters and latency percentiles (seconds) over recent requests."""
+        lat = sorted(self._latencies)
+        return {
+            "requests": self._requests,
+            "coalesced": self._coalesced,
+            "recent_hits": self._recent_hits,
+            "batches": self._batches,
+            "mean_batch_size": self._batched_jobs / self._batches if self._batches else 0.0,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "in_flight": len(self._inflight),
+            "latency_p50_s": _percentile(lat, 0.50),
+            "latency_p90_s": _percentile(lat, 0.90),
+            "latency_p99_s": _percentile(lat, 0.99),
+            "latency_max_s": lat[-1] if lat else 0.0,
+        }
+
+    # Wire protocol -----------------------------------------------------------
+
+    async def _answer(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        req_id = message.get("id")
+        if message.get("op") == "stats":
+            return {"id": req_id, "stats": self.stats()}
+        try:
+            record, hw_fields = message["graph"], message["hw"]
+            options = dict(message.get("options") or {})
+            hw = HardwareConfig(**hw_fields)
+            canonical = json.dumps([record, hw_fields, options], sort_keys=True, separators=(",", ":"))
+            key = "wire:" + hashlib.sha256(canonical.encode()).hexdigest()
+            result = await self._submit(key, (record, hw, options))
+        except CompileError as e:
+            return {"id": req_id, "error": str(e)}
+        except Exception as e:
+            return {"id": req_id, "error": _describe(e)}
+        return {"id": req_id, "result": result_to_record(result)}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        handler = asyncio.current_task()
+        assert handler is not None
+        self._connections[handler] = writer
+        lock = asyncio.Lock()
+        pending: set = set()
+
+        async def respond(line: bytes) -> None:
+            try:
+                message = json.loads(line)
+            except ValueError as e:
+                reply: Dict[str, Any] = {"id": None, "error": _describe(e)}
+            else:
+                reply = await self._answer(message)
+            async with lock:
+                writer.write(json.dumps(reply, separators=(",", ":")).encode() + b"\n")
+                await writer.drain()
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.get_running_loop().create_task(respond(line))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+                # Per-connection cap so one client cannot queue unbounded work.
+                while len(pending) >= self.max_queue:
+                    await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            self._connections.pop(handler, None)
+            writer.close()
+
+    async def serve_unix(self, path: str) -> asyncio.AbstractServer:
+        await self.start()
+        return await asyncio.start_unix_server(self._handle, path=path, limit=2**26)
+
+    async def serve_tcp(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.AbstractServer:
+        await self.start()
+        return await asyncio.start_server(self._handle, host=host, port=port, limit=2**26)
+
+
+class CompileClient:
+    """Pipelined client for ``CompileServer``'s JSON-lines protocol."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._next_id = 0
+        self._waiting: Dict[int, "asyncio.Future[Dict[str, Any]]"] = {}
+        self._pump = asyncio.get_running_loop().create_task(self._read_loop())
+
+    @classmethod
+    async def connect_unix(cls, path: str) -> "CompileClient":
+        reader, writer = await asyncio.open_unix_connection(path, limit=2**26)
+        return cls(reader, writer)
+
+    @classmethod
+    async def connect_tcp(cls, host: str, port: int) -> "CompileClient":
+        reader, writer = await asyncio.open_connection(host, port, limit=2**26)
+        return cls(reader, writer)
+
+    async def _read_loop(self) -> None:
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                reply = json.loads(line)
+                future = self._waiting.pop(reply.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(reply)
+        finally:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("compile server closed the connection"))
+            self._waiting.clear()
+
+    async def _call(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        req_id = self._next_id
+        self._next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[req_id] = future
+        message["id"] = req_id
+        self._writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+        await self._writer.drain()
+        return await future
+
+    async def compile(self, graph: Graph, hw: HardwareConfig, **options: Any) -> Dict[str, Any]:
+        """Result record (see ``mlcompiler.stream``); raises ``CompileError`` on failure."""
+        return await self.compile_record(graph_to_record(graph), hw, **options)
+
+    async def compile_record(
+        self, record: Dict[str, Any], hw: HardwareConfig, **options: Any
+    ) -> Dict[str, Any]:
+        """Like ``compile`` for a graph already in interchange form."""
+        reply = await self._call(
+            {"graph": record, "hw": dataclasses.asdict(hw), "options": options}
+        )
+        if "error" in reply:
+            raise CompileError(reply["error"])
+        return reply["result"]
+
+    async def stats(self) -> Dict[str, Any]:
+        return (await self._call({"op": "stats"}))["stats"]
+
+    async def close(self) -> None:
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        self._pump.cancel()
+        try:
+            await self._pump
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,300 @@
+"""Streaming JSONL interchange for graphs and compilation results.
+
+Graph records
+-------------
+One JSON object per line::
+
+    {"format": 1,
+     "id": "block0/mlp",                      # optional; defaults to the line number
+     "inputs": {"x": {"shape": [32, 1024], "dtype": "float16"}},
+     "ops": [{"name": "Linear", "inputs": ["x"], "outputs": ["y"],
+              "attrs": {"in_features": 1024, "out_features": 4096}}],
+     "outputs": ["y"]}
+
+``dtype`` defaults to ``"float16"`` and ``attrs`` to ``{}``. A symbolic dim
+(``Sym("B")``) is written as ``{"sym": "B"}``. JSON arrays in
+``attrs`` are read back as tuples. Blank lines are skipped. Paths ending in
+``.gz`` are read and written through gzip.
+
+Result records
+--------------
+``compile_jsonl`` writes one object per input graph, in input order::
+
+    {"id": ..., "chosen": "memory_aware", "reason": ..., "op_order": null,
+     "fusion_groups": null, "costs": {"naive": {...}, "memory_aware": {...}}}
+
+plus ``"storage_dtypes": {"tensor": dtype}`` for results that narrow
+intermediates (see ``run_precision_pass``). On hardware with
+``memory_levels`` each cost also has ``dram_by_level``, ``level_peaks`` and,
+when every level has a bandwidth, ``memory_time_s``. A graph that fails to
+parse or compile gives ``{"id": ..., "error": "ValueError: ..."}``. Only one window of graphs is held in memory at a time, however large
+the input dump is.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import IO, Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .batch import BatchItem, _compile_chunk, _describe
+from .hardware import HardwareConfig
+from .ir import Graph, Op, Sym, Tensor
+from .pass_schedule import CompilationResult
+
+FORMAT_VERSION = 1
+
+PathOrFile = Union[str, "os.PathLike[str]", IO[str]]
+
+
+def _tuplify(value: Any) -> Any:
+    if isinstance(value, list):
+        return tuple(_tuplify(v) for v in value)
+    if isinstance(value, dict):
+        return {k: _tuplify(v) for k, v in value.items()}
+    return value
+
+
+def _listify(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return [_listify(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _listify(v) for k, v in value.items()}
+    return value
+
+
+def _dim_to_json(dim: Any) -> Any:
+    return {"sym": dim.name} if isinstance(dim, Sym) else int(dim)
+
+
+def _dim_from_json(dim: Any) -> Any:
+    if isinstance(dim, dict):
+        if set(dim) != {"sym"} or not isinstance(dim["sym"], str):
+            raise ValueError(f"Bad symbolic dim {dim!r}; expected {{\"sym\": name}}")
+        return Sym(dim["sym"])
+    return int(dim)
+
+
+def graph_to_record(graph: Graph, graph_id: Optional[str] = None) -> Dict[str, Any]:
+    record: Dict[str, Any] = {"format": FORMAT_VERSION}
+    if graph_id is not None:
+        record["id"] = graph_id
+    record["inputs"] = {
+        name: {"shape": [_dim_to_json(d) for d in t.shape], "dtype": t.dtype}
+        for name, t in graph.inputs.items()
+    }
+    record["ops"] = [
+        {
+            "name": op.name,
+            "inputs": list(op.inputs),
+            "outputs": list(op.outputs),
+            "attrs": _listify(op.attrs),
+        }
+        for op in graph.walk_ops()
+    ]
+    record["outputs"] = list(graph.outputs)
+    return record
+
+
+def graph_from_record(record: Dict[str, Any]) -> Graph:
+    version = record.get("format", FORMAT_VERSION)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported graph record format {version!r}")
+    try:
+        inputs = {
+            name: Tensor(
+                tuple(_dim_from_json(d) for d in spec["shape"]), spec.get("dtype", "float16")
+            )
+            for name, spec in record["inputs"].items()
+        }
+        ops = [
+            Op(
+                name=o["name"],
+                inputs=list(o["inputs"]),
+                outputs=list(o["outputs"]),
+                attrs=_tuplify(o.get("attrs", {})),
+            )
+            for o in record["ops"]
+        ]
+        outputs = list(record["outputs"])
+    except KeyError as e:
+        raise ValueError(f"Graph record missing field {e.args[0]!r}") from None
+    return Graph(ops=ops, inputs=inputs, outputs=outputs)
+
+
+def result_to_record(result: CompilationResult, graph_id: Optional[str] = None) -> Dict[str, Any]:
+    costs = {}
+    for name, c in result.costs.items():
+        entry: Dict[str, Any] = {
+            "feasible": c.feasible,
+            "dram_bytes": c.dram.total_bytes,
+            "dram_breakdown": dict(c.dram.breakdown),
+            "peak_sram_bytes": c.sram.peak_bytes,
+            "sram_breakdown": dict(c.sram.breakdown),
+            "penalized_cost": c.penalized_cost,
+            "flops": c.flops.total_flops if c.flops is not None else None,
+            "latency_s": c.latency_s,
+        }
+        if c.dram.by_level or c.sram.level_peaks:
+            entry["dram_by_level"] = dict(c.dram.by_level)
+            entry["level_peaks"] = dict(c.sram.level_peaks)
+        if c.memory_time_s is not None:
+            entry["memory_time_s"] = c.memory_time_s
+        costs[name] = entry
+    groups = result.fusion_groups
+    record: Dict[str, Any] = {
+        "id": graph_id,
+        "chosen": result.chosen_schedule.name,
+        "reason": result.reason,
+        "op_order": list(result.op_order) if result.op_order is not None else None,
+        "fusion_groups": [list(g) for g in groups] if groups is not None else None,
+        "costs": costs,
+    }
+    if result.storage_dtypes is not None:
+        record["storage_dtypes"] = dict(result.storage_dtypes)
+    return record
+
+
+@contextmanager
+def _open_text(target: PathOrFile, mode: str) -> Iterator[IO[str]]:
+    if hasattr(target, "read") or hasattr(target, "write"):
+        yield target  # type: ignore[misc]
+        return
+    path = os.fspath(target)  # type: ignore[arg-type]
+    if path.endswith(".gz"):
+        f: IO[str] = gzip.open(path, mode + "t", encoding="utf-8")  # type: ignore[assignment]
+    else:
+        f = open(path, mode, encoding="utf-8")
+    with f:
+        yield f
+
+
+def iter_graph_records(source: PathOrFile) -> Iterator[Tuple[str, Union[Graph, str]]]:
+    """Yield ``(id, graph)`` per line, or ``(id, error message)`` for bad lines."""
+    with _open_text(source, "r") as f:
+        for lineno, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            graph_id = str(lineno)
+            try:
+                record = json.loads(line)
+                graph_id = str(record.get("id", graph_id))
+                yield graph_id, graph_from_record(record)
+            except (ValueError, TypeError, AttributeError) as e:
+                yield graph_id, f"line {lineno}: {_describe(e)}"
+
+
+def read_graphs(source: PathOrFile) -> Iterator[Tuple[str, Graph]]:
+    """Lazily yield ``(id, Graph)`` pairs; raises ``ValueError`` on a bad line."""
+    for graph_id, item in iter_graph_records(source):
+        if isinstance(item, str):
+            raise ValueError(item)
+        yield graph_id, item
+
+
+def write_graphs(graphs: Iterable[Tuple[Optional[str], Graph]], target: PathOrFile) -> int:
+    n = 0
+    with _open_text(target, "w") as f:
+        for graph_id, graph in graphs:
+            f.write(json.dumps(graph_to_record(graph, graph_id), separators=(",", ":")))
+            f.write("\n")
+            n += 1
+    return n
+
+
+def _records_for(
+    ids: List[str], items: List[BatchItem], errors: Dict[int, str]
+) -> Iterator[Dict[str, Any]]:
+    it = iter(items)
+    for pos, graph_id in enumerate(ids):
+        if pos in errors:
+            yield {"id": graph_id, "error": errors[pos]}
+            continue
+        item = next(it)
+        if item.ok:
+            yield result_to_record(item.result, graph_id)  # type: ignore[arg-type]
+        else:
+            yield {"id": graph_id, "error": item.error}
+
+
+def compile_stream(
+    source: PathOrFile,
+    hw: HardwareConfig,
+    workers: int = 1,
+    chunk_size: int = 64,
+    **pass_kwargs: Any,
+) -> Iterator[Dict[str, Any]]:
+    """Compile every graph in ``source`` and yield result records in input order.
+
+    Graphs are read ``chunk_size`` at a time. With ``workers > 1`` chunks go
+    to a process pool, at most ``2 * workers`` in flight, so memory stays
+    bounded by the window rather than the input size.
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be positive, got {workers}")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+
+    def chunks() -> Iterator[Tuple[List[str], List[Graph], Dict[int, str]]]:
+        ids: List[str] = []
+        graphs: List[Graph] = []
+        errors: Dict[int, str] = {}
+        for graph_id, item in iter_graph_records(source):
+            if isinstance(item, str):
+                errors[len(ids)] = item
+            else:
+                graphs.append(item)
+            ids.append(graph_id)
+            if len(ids) >= chunk_size:
+                yield ids, graphs, errors
+                ids, graphs, errors = [], [], {}
+        if ids:
+            yield ids, graphs, errors
+
+    if workers == 1:
+        for ids, graphs, errors in chunks():
+            yield from _records_for(ids, _compile_chunk(0, graphs, hw, pass_kwargs), errors)
+        return
+
+    window: Deque[Tuple[List[str], Dict[int, str], int, "Future[List[BatchItem]]"]] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for ids, graphs, errors in chunks():
+            future = pool.submit(_compile_chunk, 0, graphs, hw, pass_kwargs)
+            window.append((ids, errors, len(graphs), future))
+            if len(window) >= 2 * workers:
+                yield from _drain_one(window)
+        while window:
+            yield from _drain_one(window)
+
+
+def _drain_one(
+    window: Deque[Tuple[List[str], Dict[int, str], int, "Future[List[BatchItem]]"]]
+) -> Iterator[Dict[str, Any]]:
+    ids, errors, n_graphs, future = window.popleft()
+    try:
+        items = future.result()
+    except Exception as e:
+        error = _describe(e)
+        items = [BatchItem(index=i, result=None, error=error) for i in range(n_graphs)]
+    yield from _records_for(ids, items, errors)
+
+
+def compile_jsonl(
+    source: PathOrFile,
+    target: PathOrFile,
+    hw: HardwareConfig,
+    workers: int = 1,
+    chunk_size: int = 64,
+    **pass_kwargs: Any,
+) -> int:
+    """Stream ``source`` graphs through the pass into ``target``; returns records written."""
+    n = 0
+    with _open_text(target, "w") as f:
+        for record in compile_stream(source, hw, workers, chunk_size, **pass_kwargs):
+            f.write(json.dumps(record, separators=(",", ":")))
+            f.write("\n")
+            n += 1
+    return n
@@ -0,0 +1,393 @@
+"""Closed-form costs for graphs with symbolic dims.
+
+Put ``Sym("batch")`` (or any other name) in an input ``Tensor.shape`` and
+shape inference carries it through. ``symbolic_estimate`` then gives a
+schedule's DRAM bytes as a polynomial in the symbols and its peak SRAM as a
+max of polynomials. ``schedule_table`` uses those to precompute, for one
+symbol, the integer ranges where each candidate wins; choosing a schedule
+at run time is then a table lookup instead of a compile.
+
+Only the untiled naive and memory_aware schedules have closed forms: tile
+re-reads involve ceiling divisions and fusion groups are chosen against a
+concrete SRAM size.
+"""
+
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .hardware import HardwareConfig
+from .ir import Graph, Sym, Tensor, _dtype_bytes
+from .liveness import compute_live_ranges
+from .schedule import MEMORY_AWARE_SCHEDULE, NAIVE_SCHEDULE, Schedule
+
+# Sorted (symbol, power) pairs; () is the constant term.
+Monomial = Tuple[Tuple[str, int], ...]
+
+
+def _mul_monomials(a: Monomial, b: Monomial) -> Monomial:
+    powers = dict(a)
+    for name, p in b:
+        powers[name] = powers.get(name, 0) + p
+    return tuple(sorted(powers.items()))
+
+
+class Poly:
+    """Polynomial with integer coefficients over named symbols."""
+
+    __slots__ = ("terms",)
+
+    def __init__(self, terms: Optional[Mapping[Monomial, int]] = None) -> None:
+        self.terms: Dict[Monomial, int] = {m: c for m, c in (terms or {}).items() if c}
+
+    @classmethod
+    def const(cls, value: int) -> "Poly":
+        return cls({(): int(value)})
+
+    @classmethod
+    def of_dim(cls, dim: Union[int, Sym]) -> "Poly":
+        if isinstance(dim, Sym):
+            return cls({((dim.name, 1),): 1})
+        return cls.const(int(dim))
+
+    @staticmethod
+    def _coerce(other: Union["Poly", int]) -> "Poly":
+        return other if isinstance(other, Poly) else Poly.const(other)
+
+    def __add__(self, other: Union["Poly", int]) -> "Poly":
+        terms = dict(self.terms)
+        for m, c in self._coerce(other).terms.items():
+            terms[m] = terms.get(m, 0) + c
+        return Poly(terms)
+
+    __radd__ = __add__
+
+    def __neg__(self) -> "Poly":
+        return Poly({m: -c for m, c in self.terms.items()})
+
+    def __sub__(self, other: Union["Poly", int]) -> "Poly":
+        return self + -self._coerce(other)
+
+    def __mul__(self, other: Union["Poly", int]) -> "Poly":
+        terms: Dict[Monomial, int] = {}
+        for ma, ca in self.terms.items():
+            for mb, cb in self._coerce(other).terms.items():
+                m = _mul_monomials(ma, mb)
+                terms[m] = terms.get(m, 0) + ca * cb
+        return Poly(terms)
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, int):
+            other = Poly.const(other)
+        return isinstance(other, Poly) and self.terms == other.terms
+
+    def __hash__(self) -> int:
+        return hash(frozenset(self.terms.items()))
+
+    @property
+    def symbols(self) -> FrozenSet[str]:
+        return frozenset(name for m in self.terms for name, _ in m)
+
+    def evaluate(self, values: Mapping[str, int]) -> int:
+        total = 0
+        for m, c in self.terms.items():
+            for name, p in m:
+                if name not in values:
+                    raise KeyError(f"No value for symbolic dim {name!r}")
+                c *= int(values[name]) ** p
+            total += c
+        return total
+
+    def coefficients(self, name: str, bindings: Mapping[str, int]) -> List[int]:
+        """Coefficients in ``name``, lowest power first, with other symbols bound."""
+        coeffs: Dict[int, int] = {}
+        for m, c in self.terms.items():
+            power = 0
+            for sym, p in m:
+                if sym == name:
+                    power = p
+                elif sym in bindings:
+                    c *= int(bindings[sym]) ** p
+                else:
+                    raise KeyError(f"No value for symbolic dim {sym!r}")
+            coeffs[power] = coeffs.get(power, 0) + c
+        degree = max(coeffs, default=0)
+        return [coeffs.get(k, 0) for k in range(degree + 1)]
+
+    def dominated_by(self, other: "Poly") -> bool:
+        """True if ``self <= other`` for every non-negative value of the symbols."""
+        return all(c >= 0 for c in (other - self).terms.values())
+
+    def __str__(self) -> str:
+        if not self.terms:
+            return "0"
+        parts = []
+        for m, c in sorted(self.terms.items(), key=lambda mc: (-sum(p for _, p in mc[0]), mc[0])):
+            syms = "*".join(name if p == 1 else f"{name}^{p}" for name, p in m)
+            parts.append(syms if c == 1 and syms else f"{c}*{syms}" if syms else str(c))
+        return " + ".join(parts)
+
+    def __repr__(self) -> str:
+        return f"Poly({self})"
+
+
+@dataclass(frozen=True)
+class PolyMax:
+    """Max of polynomials, with terms another term dominates dropped."""
+
+    terms: Tuple[Poly, ...]
+
+    @classmethod
+    def of(cls, polys: Iterable[Poly]) -> "PolyMax":
+        kept: List[Poly] = []
+        for p in polys:
+            if any(p.dominated_by(q) for q in kept):
+                continue
+            kept = [q for q in kept if not q.dominated_by(p)]
+            kept.append(p)
+        return cls(tuple(kept))
+
+    def evaluate(self, values: Mapping[str, int]) -> int:
+        return max((p.evaluate(values) for p in self.terms), default=0)
+
+    def __str__(self) -> str:
+        if len(self.terms) == 1:
+            return str(self.terms[0])
+        return "max(" + ", ".join(str(p) for p in self.terms) + ")"
+
+
+def symbolic_nbytes(tensor: Tensor) -> Poly:
+    n = Poly.const(_dtype_bytes(tensor.dtype))
+    for d in tensor.shape:
+        n = n * Poly.of_dim(d)
+    return n
+
+
+def bind(graph: Graph, **values: int) -> Graph:
+    """Copy of ``graph`` with the symbolic input dims in ``values`` made concrete."""
+
+    def dim(d: Union[int, Sym]) -> Union[int, Sym]:
+        return int(values[d.name]) if isinstance(d, Sym) and d.name in values else d
+
+    inputs = {
+        name: Tensor(tuple(dim(d) for d in t.shape), t.dtype) for name, t in graph.inputs.items()
+    }
+    return Graph(ops=list(graph.ops), inputs=inputs, outputs=list(graph.outputs))
+
+
+@dataclass(frozen=True)
+class SymbolicEstimate:
+    schedule: Schedule
+    dram_bytes: Poly
+    peak_sram_bytes: PolyMax
+
+    def at(self, **values: int) -> Tuple[int, int]:
+        """(DRAM bytes, peak SRAM bytes) for concrete symbol values."""
+        return self.dram_bytes.evaluate(values), self.peak_sram_bytes.evaluate(values)
+
+
+def symbolic_estimate(graph: Graph, schedule: Schedule) -> SymbolicEstimate:
+    """Closed-form DRAM and peak SRAM of ``schedule``; matches the concrete estimators."""
+    if schedule.tile_shape is not None or schedule.strategy not in ("naive", "memory_aware"):
+        raise ValueError(f"No closed-form cost for schedule {schedule.name!r}")
+    tensors = graph.shape_table()
+    io = sum((symbolic_nbytes(t) for t in graph.inputs.values()), Poly())
+    io = io + sum((symbolic_nbytes(tensors[name]) for name in graph.outputs), Poly())
+    ranges = compute_live_ranges(graph, symbolic_nbytes)  # type: ignore[arg-type]
+
+    if schedule.strategy == "naive":
+        inter = sum((r.nbytes for r in ranges), Poly())
+        sizes = [symbolic_nbytes(t) for t in graph.inputs.values()]
+        sizes += [symbolic_nbytes(t) for t in tensors.values()]
+        return SymbolicEstimate(schedule, io + 2 * inter, PolyMax.of(sizes))
+
+    delta: List[Poly] = [Poly() for _ in range(len(graph.ops) + 1)]
+    for r in ranges:
+        delta[r.start] = delta[r.start] + r.nbytes
+        delta[r.end + 1] = delta[r.end + 1] - r.nbytes
+    running = Poly()
+    timeline = []
+    for i in range(len(graph.ops)):
+        running = running + delta[i]
+        timeline.append(running)
+    return SymbolicEstimate(schedule, io, PolyMax.of(timeline))
+
+
+# Integer root isolation -----------------------------------------------------
+
+
+def _eval(coeffs: Sequence[int], x: int) -> int:
+    total = 0
+    for c in reversed(coeffs):
+        total = total * x + c
+    return total
+
+
+def _sign(v: int) -> int:
+    return (v > 0) - (v < 0)
+
+
+def _difference(coeffs: Sequence[int]) -> List[int]:
+    """Coefficients of ``p(x) - p(x - 1)``."""
+    shifted = [0] * len(coeffs)
+    for k, c in enumerate(coeffs):
+        # c * (x - 1)^k, expanded with binomial coefficients.
+        binom = 1
+        for j in range(k + 1):
+            shifted[j] += c * binom * (-1) ** (k - j)
+            binom = binom * (k - j) // (j + 1)
+    diff = [a - b for a, b in zip(coeffs, shifted)]
+    while len(diff) > 1 and diff[-1] == 0:
+        diff.pop()
+    return diff
+
+
+def _sign_changes(coeffs: Sequence[int], lo: int, hi: int) -> List[int]:
+    """Integers ``x`` in ``(lo, hi]`` where the sign of ``p(x)`` differs from ``p(x - 1)``.
+
+    Exact: the changes of the forward difference split ``[lo, hi]`` into
+    runs where ``p`` is monotone on the integers, and within a run the sign
+    can only move one way, so a binary search finds each change.
+    """
+    if len(coeffs) <= 1 or lo >= hi:
+        return []
+    cuts = _sign_changes(_difference(coeffs), lo, hi)
+    bounds = [lo] + cuts + [hi + 1]
+    changes: List[int] = []
+    for start, stop in zip(bounds, bounds[1:]):
+        if start > lo and _sign(_eval(coeffs, start)) != _sign(_eval(coeffs, start - 1)):
+            changes.append(start)
+        cur = start
+        while cur < stop - 1:
+            s = _sign(_eval(coeffs, cur))
+            a, b = cur + 1, stop - 1
+            if _sign(_eval(coeffs, b)) == s:
+                break
+            while a < b:
+                mid = (a + b) // 2
+                if _sign(_eval(coeffs, mid)) == s:
+                    a = mid + 1
+                else:
+                    b = mid
+            changes.append(a)
+            cur = a
+    return sorted(set(changes))
+
+
+# Schedule tables ------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class DimRange:
+    lo: int
+    hi: int  # inclusive
+    schedule: Schedule
+    feasible: bool
+
+
+@dataclass(frozen=True)
+class ScheduleTable:
+    """Winning schedule for every value of one symbolic dim in ``[lo, hi]``."""
+
+    dim: str
+    ranges: Tuple[DimRange, ...]
+    estimates: Mapping[str, SymbolicEstimate]
+
+    def range_at(self, value: int) -> DimRange:
+        starts = [r.lo for r in self.ranges]
+        i = bisect.bisect_right(starts, value) - 1
+        if i < 0 or value > self.ranges[i].hi:
+            raise ValueError(
+                f"{self.dim}={value} is outside the table "
+                f"[{self.ranges[0].lo}, {self.ranges[-1].hi}]"
+            )
+        return self.ranges[i]
+
+    def lookup(self, value: int) -> Schedule:
+        return self.range_at(value).schedule
+
+
+def _last_fitting(
+    peak: PolyMax, name: str, bindings: Mapping[str, int], lo: int, hi: int, cap: int
+) -> int:
+    """Largest ``x`` in ``[lo, hi]`` whose peak fits ``cap``, or ``lo - 1``.
+
+    Byte counts have non-negative coefficients, so the peak never shrinks
+    as the dim grows.
+    """
+
+    def fits(x: int) -> bool:
+        return peak.evaluate({**bindings, name: x}) <= cap
+
+    if not fits(lo):
+        return lo - 1
+    a, b = lo, hi
+    while a < b:
+        mid = (a + b + 1) // 2
+        if fits(mid):
+            a = mid
+        else:
+            b = mid - 1
+    return a
+
+
+def schedule_table(
+    graph: Graph,
+    hw: HardwareConfig,
+    dim: str,
+    lo: int,
+    hi: int,
+    candidates: Optional[Iterable[Schedule]] = None,
+    bindings: Optional[Mapping[str, int]] = None,
+) -> ScheduleTable:
+    """Precompute the schedule ``run_schedule_pass`` picks for ``dim`` in ``[lo, hi]``.
+
+    Other symbolic dims must be fixed in ``bindings``. Breakpoints come from
+    the closed forms: each candidate's last fitting value (from its peak
+    SRAM) and the integer sign changes of every pairwise DRAM difference.
+    The choice cannot change between breakpoints, so it is decided once per
+    piece with the bytes-objective rule.
+    """
+    if lo > hi:
+        raise ValueError(f"Empty range [{lo}, {hi}]")
+    bindings = dict(bindings or {})
+    schedules = list(candidates) if candidates is not None else [NAIVE_SCHEDULE, MEMORY_AWARE_SCHEDULE]
+    pref = {s.name: 0 if s.name == "memory_aware" else 1 for s in schedules}
+    estimates = {s.name: symbolic_estimate(graph, s) for s in schedules}
+    names = list(estimates)
+
+    points = {lo}
+    last_fit: Dict[str, int] = {}
+    for name, est in estimates.items():
+        last_fit[name] = _last_fitting(est.peak_sram_bytes, dim, bindings, lo, hi, hw.sram_bytes)
+        if lo <= last_fit[name] < hi:
+            points.add(last_fit[name] + 1)
+    drams = {name: est.dram_bytes.coefficients(dim, bindings) for name, est in estimates.items()}
+    for i, a in enumerate(names):
+        for b in names[i + 1 :]:
+            n = max(len(drams[a]), len(drams[b]))
+            diff = [
+                (drams[a][k] if k < len(drams[a]) else 0) - (drams[b][k] if k < len(drams[b]) else 0)
+                for k in range(n)
+            ]
+            points.update(_sign_changes(diff, lo, hi))
+
+    starts = sorted(points)
+    ranges: List[DimRange] = []
+    for start, stop in zip(starts, starts[1:] + [hi + 1]):
+        feasible = [n for n in names if last_fit[n] >= start]
+        pool = feasible or names
+        best = min(
+            pool,
+            key=lambda n: (_eval(drams[n], start), pref[n] if feasible else 0),
+        )
+        schedule = estimates[best].schedule
+        if ranges and ranges[-1].schedule == schedule and ranges[-1].feasible == bool(feasible):
+            ranges[-1] = DimRange(ranges[-1].lo, stop - 1, schedule, bool(feasible))
+        else:
+            ranges.append(DimRange(start, stop - 1, schedule, bool(feasible)))
+    return ScheduleTable(dim=dim, ranges=tuple(ranges), estimates=estimates)
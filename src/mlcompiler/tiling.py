@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, Union
+
+from .compact import CompactGraph
+from .cost import _prod, estimate_dram_bytes, estimate_peak_sram_bytes
+from .hardware import HardwareConfig
+from .ir import Graph
+from .schedule import (
+    Schedule,
+    TileShape,
+    pipelined_memory_aware_schedule,
+    tiled_memory_aware_schedule,
+)
+
+
+@dataclass(frozen=True)
+class TileCandidate:
+    tile_shape: TileShape
+    dram_bytes: int
+    peak_sram_bytes: int
+
+
+def _tile_sizes(extent: int) -> List[int]:
+    """Legal tile extents for one dimension, largest first: powers of two and the full extent."""
+    sizes = {extent}
+    size = 1
+    while size < extent:
+        sizes.add(size)
+        size *= 2
+    return sorted(sizes, reverse=True)
+
+
+def _tiled_extents(graph: Graph) -> Optional[Tuple[int, int]]:
+    """Largest (row, feature) extents of the intermediates; rows flatten every leading dimension."""
+    tensors = graph.shape_table()
+    outputs = set(graph.outputs)
+    rows, feats = 0, 0
+    for op in graph.walk_ops():
+        for name in op.outputs:
+            shape = tensors[name].shape
+            if name in outputs or len(shape) < 2:
+                continue
+            rows = max(rows, _prod(shape[:-1]))
+            feats = max(feats, int(shape[-1]))
+    if rows == 0 or feats == 0:
+        return None
+    return rows, feats
+
+
+def _tiled_schedule(tile: TileShape, buffers: int) -> Schedule:
+    if buffers > 1:
+        return pipelined_memory_aware_schedule(tile, buffers)
+    return tiled_memory_aware_schedule(tile)
+
+
+def search_tile_shapes(
+    graph: Union[Graph, CompactGraph], hw: HardwareConfig, buffers: int = 1
+) -> List[TileCandidate]:
+    """Branch-and-bound search over (row, feature) tiles that fit in SRAM.
+
+    Peak SRAM grows and DRAM re-reads shrink monotonically with both tile
+    extents. So for each row extent (largest first) only the largest feasible
+    feature extent can be Pareto-optimal, and once the full-width tile at some
+    row extent cannot beat the best feasible tile found so far, no smaller
+    row extent can either. Returns the non-dominated feasible tiles, cheapest
+    DRAM first.
+
+    With ``buffers > 1`` the footprint includes the prefetch buffers of a
+    pipelined schedule, so larger tiles may no longer fit.
+    """
+    if isinstance(graph, CompactGraph):
+        graph = graph.to_graph()
+    extents = _tiled_extents(graph)
+    if extents is None:
+        return []
+    rows, feats = extents
+    feat_sizes = _tile_sizes(feats)
+
+    def evaluate(tile: TileShape) -> TileCandidate:
+        schedule = _tiled_schedule(tile, buffers)
+        return TileCandidate(
+            tile_shape=tile,
+            dram_bytes=estimate_dram_bytes(graph, schedule).total_bytes,
+            peak_sram_bytes=estimate_peak_sram_bytes(graph, schedule).peak_bytes,
+        )
+
+    found: List[TileCandidate] = []
+    best_dram: Optional[int] = None
+    for row_tile in _tile_sizes(rows):
+        widest = evaluate((row_tile, feat_sizes[0]))
+        if best_dram is not None and widest.dram_bytes >= best_dram:
+            break
+        # Narrowest tile at this row extent is the smallest footprint we can reach.
+        if evaluate((row_tile, feat_sizes[-1])).peak_sram_bytes > hw.sram_bytes:
+            continue
+        for feat_tile in feat_sizes:
+            cand = widest if feat_tile == feat_sizes[0] else evaluate((row_tile, feat_tile))
+            if cand.peak_sram_bytes > hw.sram_bytes:
+                continue
+            if best_dram is not None and cand.dram_bytes >= best_dram:
+                break
+            found.append(cand)
+            best_dram = cand.dram_bytes
+            break
+
+    found.sort(key=lambda c: (c.dram_bytes, c.peak_sram_bytes))
+    frontier: List[TileCandidate] = []
+    for cand in found:
+        if not frontier or cand.peak_sram_bytes < frontier[-1].peak_sram_bytes:
+            frontier.append(cand)
+    return frontier
+
+
+def generate_tiled_candidates(
+    graph: Union[Graph, CompactGraph],
+    hw: HardwareConfig,
+    max_candidates: int = 4,
+    buffers: int = 1,
+) -> List[Schedule]:
+    return [
+        _tiled_schedule(c.tile_shape, buffers)
+        for c in search_tile_shapes(graph, hw, buffers)[:max_candidates]
+    ]
@@ -0,0 +1,53 @@
+"""Graph builders shared by the test modules."""
+
+from typing import Sequence
+
+from mlcompiler import Graph, Op, Tensor
+
+
+def make_linear_gelu_linear(batch, hidden: int, ff: int, dtype: str = "float16") -> Graph:
+    """``Linear(hidden -> ff) -> GELU -> Linear(ff -> hidden)``.
+
+    ``batch`` may be symbolic, or a tuple of leading dimensions.
+    """
+    ops = [
+        Op(
+            name="Linear",
+            inputs=["x"],
+            outputs=["linear1"],
+            attrs={"in_features": hidden, "out_features": ff},
+        ),
+        Op(name="GELU", inputs=["linear1"], outputs=["gelu"], attrs={}),
+        Op(
+            name="Linear",
+            inputs=["gelu"],
+            outputs=["linear2"],
+            attrs={"in_features": ff, "out_features": hidden},
+        ),
+    ]
+    leading = batch if isinstance(batch, tuple) else (batch,)
+    return Graph(ops=ops, inputs={"x": Tensor(leading + (hidden,), dtype)}, outputs=["linear2"])
+
+
+def make_mlp_chain(batch: int, hidden: int, ffs: Sequence[int], dtype: str = "float16") -> Graph:
+    """One ``Linear -> GELU -> Linear`` block per entry of ``ffs``, named ``up{i}``, ``act{i}``, ``down{i}``."""
+    ops = []
+    prev = "x"
+    for i, ff in enumerate(ffs):
+        ops += [
+            Op(
+                name="Linear",
+                inputs=[prev],
+                outputs=[f"up{i}"],
+                attrs={"in_features": hidden, "out_features": ff},
+            ),
+            Op(name="GELU", inputs=[f"up{i}"], outputs=[f"act{i}"], attrs={}),
+            Op(
+                name="Linear",
+                inputs=[f"act{i}"],
+                outputs=[f"down{i}"],
+                attrs={"in_features": ff, "out_features": hidden},
+            ),
+        ]
+        prev = f"down{i}"
+    return Graph(ops=ops, inputs={"x": Tensor((batch, hidden), dtype)}, outputs=[prev])
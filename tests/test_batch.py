@@ -0,0 +1,40 @@
+from mlcompiler import (
+    Graph,
+    HardwareConfig,
+    Op,
+    Tensor,
+    compile_many,
+    run_schedule_pass,
+)
+
+from graph_builders import make_linear_gelu_linear
+
+
+def _batch():
+    graphs = [make_linear_gelu_linear(1 + i % 7, 64 * (1 + i % 5), 256) for i in range(40)]
+    graphs[3] = Graph(
+        ops=[Op(name="Unknown", inputs=["x"], outputs=["y"], attrs={})],
+        inputs={"x": Tensor((2, 2))},
+        outputs=["y"],
+    )
+    return graphs
+
+
+def test_compile_many_preserves_order_and_isolates_errors():
+    graphs = _batch()
+    hw = HardwareConfig(sram_bytes=64 * 1024)
+    items = compile_many(graphs, hw, workers=2)
+
+    assert [item.index for item in items] == list(range(len(graphs)))
+    assert not items[3].ok
+    assert "NotImplementedError" in items[3].error
+    for graph, item in zip(graphs, items):
+        if item.ok:
+            assert item.result == run_schedule_pass(graph, hw)
+
+
+def test_compile_many_serial_forwards_pass_options():
+    graphs = [make_linear_gelu_linear(32, 4096, 16384)]
+    hw = HardwareConfig(sram_bytes=1 * 1024 * 1024)
+    (item,) = compile_many(graphs, hw, workers=1, tiling=True)
+    assert item.result.chosen_schedule.tile_shape is not None
@@ -0,0 +1,45 @@
+import importlib.util
+import pathlib
+
+_BENCH = pathlib.Path(__file__).resolve().parents[1] / "benchmarks" / "bench_pipeline.py"
+
+
+def _load_bench():
+    spec = importlib.util.spec_from_file_location("bench_pipeline", _BENCH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_suite_report_and_compare():
+    bench = _load_bench()
+    g = bench.make_residual_stack(12)
+    assert len(g.ops) == 12
+    assert bench.make_mlp_chain(50).shape_table() == bench.make_mlp_chain(50).shape_table()
+
+    report = bench.run_suite(sizes=[10, 20], repeats=1)
+    assert len(report["results"]) == len(bench.GENERATORS) * 2 * len(bench.STAGES)
+    assert all(r["wall_s"] > 0 and r["peak_mem_bytes"] > 0 for r in report["results"])
+    assert bench.compare(report, report) == []
+
+    slower = {
+        "results": [
+            dict(r, wall_s=r["wall_s"] * 2 + 1.0, peak_mem_bytes=r["peak_mem_bytes"])
+            for r in report["results"]
+        ]
+    }
+    regressions = bench.compare(report, slower, threshold=0.1, min_wall_s=0.0)
+    assert len(regressions) == len(report["results"])
+    assert {r["metric"] for r in regressions} == {"wall_s"}
+
+
+def test_fusion_stage_on_skip_ladder():
+    bench = _load_bench()
+    g = bench.make_skip_ladder(9)
+    assert [op.inputs[-1] for op in g.ops[4:]] == ["e2", "e1", "e0", "x", "x"]
+
+    report = bench.run_suite(
+        sizes=[40, 80], generators=["skip_ladder"], stages=["plan_fusion_groups"], repeats=1
+    )
+    assert [r["num_ops"] for r in report["results"]] == [40, 80]
+    assert all(r["wall_s"] > 0 for r in report["results"])
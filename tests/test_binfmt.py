@@ -0,0 +1,117 @@
+import pickle
+
+import pytest
+
+from mlcompiler import (
+    CompactGraph,
+    HardwareConfig,
+    MemoryLevel,
+    Op,
+    run_precision_pass,
+    run_schedule_pass,
+)
+from mlcompiler.binfmt import (
+    ResultSetView,
+    dumps_graph,
+    dumps_results,
+    loads_graph,
+    loads_results,
+    open_graph,
+    open_results,
+    write_graph,
+    write_results,
+)
+
+from graph_builders import make_linear_gelu_linear, make_mlp_chain
+
+
+def test_graph_round_trip_and_mmap(tmp_path):
+    g = make_mlp_chain(32, 1024, [4096] * 20)
+    g.ops.append(Op(name="Reshape", inputs=[g.outputs[0]], outputs=["r"], attrs={"shape": (4, 8, -1)}))
+    g.outputs = ["r"]
+    data = dumps_graph(g)
+    assert loads_graph(data) == g
+    assert len(data) < len(pickle.dumps(g))
+
+    path = tmp_path / "g.mlcg"
+    write_graph(g, str(path))
+    with open_graph(str(path)) as view:
+        assert view.num_ops == len(g.ops)
+        assert view.has_shapes
+        assert view.op(5) == g.ops[5]
+        assert view.op(len(g.ops) - 1).attrs == {"shape": (4, 8, -1)}
+        tensors = g.shape_table()
+        assert view.tensor(7) == tensors[view.tensor_name(7)]
+        compact = view.to_compact()
+    hw = HardwareConfig(sram_bytes=1 * 1024 * 1024)
+    assert run_schedule_pass(compact, hw) == run_schedule_pass(g, hw)
+
+    assert loads_graph(dumps_graph(CompactGraph.from_graph(g), include_shapes=False)) == g
+    with pytest.raises(ValueError):
+        loads_graph(b"MLCR" + data[4:])
+
+
+
+def test_graph_round_trip_keeps_attr_containers():
+    g = make_linear_gelu_linear(batch=32, hidden=64, ff=256)
+    reshape_attrs = {"shape": (8, -1), "tag": {"ids": [1, (2, 3)]}}
+    g.ops.append(Op(name="Transpose", inputs=["linear2"], outputs=["t"], attrs={"perm": [1, 0]}))
+    g.ops.append(Op(name="Reshape", inputs=["t"], outputs=["r"], attrs=reshape_attrs))
+    g.outputs = ["r"]
+    back = loads_graph(dumps_graph(g))
+    assert back == g
+    assert type(back.ops[3].attrs["perm"]) is list
+    assert back.ops[4].attrs == reshape_attrs
+    assert type(back.ops[4].attrs["tag"]["ids"][1]) is tuple
+
+def test_result_set_round_trip_and_lazy_cost(tmp_path):
+    hw = HardwareConfig(sram_bytes=1 * 1024 * 1024, dram_bandwidth_GBs=900.0, compute_Gops=1000.0)
+    graphs = [make_mlp_chain(32, w, [4 * w]) for w in (256, 1024, 4096)]
+    results = [run_schedule_pass(g, hw) for g in graphs]
+    results.append(run_schedule_pass(graphs[2], hw, fusion=True, order="auto"))
+    results.append(run_schedule_pass(graphs[2], HardwareConfig(sram_bytes=1 * 1024 * 1024)))
+
+    assert loads_results(dumps_results(results)) == results
+
+    path = tmp_path / "r.mlcr"
+    write_results(results, str(path), ids=[f"g{i}" for i in range(len(results))])
+    with open_results(str(path)) as view:
+        assert len(view) == len(results)
+        assert view.id(2) == "g2"
+        assert view.reason(2) == results[2].reason
+        assert view.chosen(2) == results[2].chosen_schedule
+        assert view.cost(2, "memory_aware") == results[2].costs["memory_aware"]
+        assert view.cost(4, "naive").latency_s is None
+        assert view.schedule_names(3) == list(results[3].costs)
+        with pytest.raises(KeyError):
+            view.cost(0, "fusion_groups")
+
+
+def test_result_set_keeps_storage_dtypes():
+    g = make_linear_gelu_linear(batch=32, hidden=1024, ff=4096)
+    hw = HardwareConfig(sram_bytes=400 * 1024)
+    narrowed = run_precision_pass(g, hw)
+    assert narrowed.storage_dtypes == {"linear1": "int8"}
+    results = [narrowed, run_schedule_pass(g, hw), narrowed]
+
+    loaded = loads_results(dumps_results(results))
+    assert loaded == results
+    assert [r.storage_dtypes for r in loaded] == [{"linear1": "int8"}, None, {"linear1": "int8"}]
+    with ResultSetView(dumps_results(results)) as view:
+        assert view.storage_dtypes(1) is None
+        assert view.storage_dtypes(2) == {"linear1": "int8"}
+
+
+def test_result_set_keeps_memory_level_costs():
+    g = make_linear_gelu_linear(batch=32, hidden=1024, ff=4096)
+    levels = (MemoryLevel("l2", 300 * 1024, 2000.0), MemoryLevel("hbm", None, 100.0))
+    hw = HardwareConfig(sram_bytes=256 * 1024, memory_levels=levels)
+    result = run_schedule_pass(g, hw)
+    naive = result.costs["naive"]
+    assert naive.dram.by_level and naive.sram.level_peaks and naive.memory_time_s is not None
+
+    mixed = [result, run_schedule_pass(g, HardwareConfig(sram_bytes=256 * 1024))]
+    loaded = loads_results(dumps_results(mixed))
+    assert loaded == mixed
+    assert loaded[0].costs["naive"].dram.by_level == naive.dram.by_level
+    assert loaded[1].costs["naive"].memory_time_s is None
@@ -0,0 +1,43 @@
+import pytest
+
+from mlcompiler import (
+    HardwareConfig,
+    estimate_schedule,
+    run_schedule_pass,
+    select_schedule,
+    sram_curve,
+)
+from mlcompiler.pass_schedule import generate_candidates
+
+from graph_builders import make_linear_gelu_linear
+
+
+def test_curve_matches_repeated_passes():
+    g = make_linear_gelu_linear(batch=32, hidden=4096, ff=16384)
+    curve = sram_curve(g)
+
+    # naive needs 1MB (one tensor at a time), memory_aware needs 2MB.
+    assert curve.breakpoints == (1024 * 1024, 2 * 1024 * 1024)
+    assert [iv.schedule.name for iv in curve.intervals] == ["memory_aware", "naive", "memory_aware"]
+    assert [iv.feasible for iv in curve.intervals] == [False, True, True]
+    assert curve.intervals[-1].sram_hi is None
+
+    probes = {0, 1}
+    for bp in curve.breakpoints:
+        probes.update({bp - 1, bp, bp + 1})
+    for sram in sorted(probes):
+        expected = run_schedule_pass(g, HardwareConfig(sram_bytes=sram))
+        got = curve.at(sram)
+        assert got.schedule == expected.chosen_schedule
+        assert got.dram_bytes == expected.costs[expected.chosen_schedule.name].dram.total_bytes
+
+    with pytest.raises(ValueError):
+        curve.at(-1)
+
+
+def test_select_schedule_reuses_estimates():
+    g = make_linear_gelu_linear(batch=32, hidden=2048, ff=8192)
+    estimates = {s.name: estimate_schedule(g, s) for s in generate_candidates(g)}
+    for sram in (256 * 1024, 1024 * 1024, 8 * 1024 * 1024):
+        hw = HardwareConfig(sram_bytes=sram)
+        assert select_schedule(estimates, hw) == run_schedule_pass(g, hw)
@@ -0,0 +1,83 @@
+from mlcompiler import (
+    CompilationCache,
+    HardwareConfig,
+    Tensor,
+    cached_run_schedule_pass,
+    run_schedule_pass,
+    structural_hash,
+)
+
+from graph_builders import make_linear_gelu_linear
+
+
+def test_structural_hash_tracks_everything_the_pass_reads():
+    g = make_linear_gelu_linear(2, 8, 16)
+    hw = HardwareConfig(sram_bytes=1024)
+    key = structural_hash(g, hw)
+
+    assert key == structural_hash(make_linear_gelu_linear(2, 8, 16), hw)
+    assert key != structural_hash(g, HardwareConfig(sram_bytes=2048))
+    assert key != structural_hash(g, hw, tiling=True)
+
+    g.inputs["x"] = Tensor((4, 8))
+    assert key != structural_hash(g, hw)
+
+    g2 = make_linear_gelu_linear(2, 8, 16)
+    g2.outputs.append("gelu")
+    assert key != structural_hash(g2, hw)
+
+    # In-place op edits need an explicit invalidation.
+    g3 = make_linear_gelu_linear(2, 8, 16)
+    assert structural_hash(g3, hw) == key
+    g3.ops[0].attrs["bias"] = True
+    g3.invalidate_shapes()
+    assert structural_hash(g3, hw) != key
+
+
+def test_cache_roundtrip_across_instances(tmp_path):
+    path = str(tmp_path / "cache.db")
+    g = make_linear_gelu_linear(32, 1024, 4096)
+    hw = HardwareConfig(sram_bytes=1 * 1024 * 1024)
+
+    with CompilationCache(path) as cache:
+        first = cached_run_schedule_pass(g, hw, cache)
+        assert len(cache) == 1
+    with CompilationCache(path) as cache:
+        assert cache.get(structural_hash(g, hw)) == first
+        assert cached_run_schedule_pass(g, hw, cache) == run_schedule_pass(g, hw)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    hw = HardwareConfig(sram_bytes=1024)
+    graphs = [make_linear_gelu_linear(2, 8, 16 + i) for i in range(6)]
+    with CompilationCache(str(tmp_path / "cache.db"), max_bytes=10**9) as cache:
+        for g in graphs:
+            cached_run_schedule_pass(g, hw, cache)
+        entry_bytes = cache.total_bytes() // len(graphs)
+
+    limit = 3 * entry_bytes + entry_bytes // 2
+    with CompilationCache(str(tmp_path / "cache.db"), max_bytes=limit) as cache:
+        cache.get(structural_hash(graphs[0], hw))  # refresh the oldest entry
+        cached_run_schedule_pass(make_linear_gelu_linear(2, 8, 99), hw, cache)
+        assert cache.total_bytes() <= cache.max_bytes
+        assert cache.get(structural_hash(graphs[0], hw)) is not None
+        assert cache.get(structural_hash(graphs[1], hw)) is None
+
+
+def test_memory_hits_refresh_the_on_disk_lru(tmp_path):
+    path = str(tmp_path / "cache.db")
+    hw = HardwareConfig(sram_bytes=1024)
+    graphs = [make_linear_gelu_linear(2, 8, 16 + i) for i in range(4)]
+    keys = [structural_hash(g, hw) for g in graphs]
+    with CompilationCache(path, max_bytes=10**9) as warm:
+        for g in graphs[:3]:
+            cached_run_schedule_pass(g, hw, warm)
+        entry_bytes = warm.total_bytes() // 3
+        # Only ever hits the in-process LRU.
+        assert warm.get(keys[0]) is not None
+
+    limit = 3 * entry_bytes + entry_bytes // 2
+    with CompilationCache(path, max_bytes=limit) as cache:
+        cached_run_schedule_pass(graphs[3], hw, cache)
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[1]) is None
@@ -0,0 +1,72 @@
+import pytest
+
+from mlcompiler import (
+    CompactGraph,
+    Graph,
+    HardwareConfig,
+    estimate_dram_bytes,
+    estimate_flops,
+    estimate_peak_sram_bytes,
+    run_schedule_pass,
+)
+from mlcompiler.schedule import (
+    MEMORY_AWARE_SCHEDULE,
+    NAIVE_SCHEDULE,
+    tiled_memory_aware_schedule,
+)
+
+from graph_builders import make_mlp_chain
+
+
+def test_roundtrip_is_lossless_and_interns():
+    g = make_mlp_chain(batch=4, hidden=8, ffs=[32] * 5, dtype="fp16")
+    g.ops[0].attrs["note"] = ["unhashable"]
+    compact = CompactGraph.from_graph(g)
+
+    assert compact.num_ops == 15
+    assert compact.kind_names == ["Linear", "GELU"]
+    assert len(compact.attr_table) == 4  # up-proj, down-proj, GELU, and the odd one out
+    back = compact.to_graph()
+    assert back == g
+    back.ops[3].attrs["out_features"] = 1
+    assert g.ops[3].attrs["out_features"] == 32
+
+
+def test_native_estimates_match_graph():
+    g = make_mlp_chain(batch=16, hidden=64, ffs=[256] * 4, dtype="fp16")
+    compact = CompactGraph.from_graph(g)
+    for schedule in (
+        NAIVE_SCHEDULE,
+        MEMORY_AWARE_SCHEDULE,
+        tiled_memory_aware_schedule((4, 64)),
+    ):
+        assert estimate_dram_bytes(compact, schedule) == estimate_dram_bytes(g, schedule)
+        assert estimate_peak_sram_bytes(compact, schedule) == estimate_peak_sram_bytes(
+            g, schedule
+        )
+    assert estimate_flops(compact) == estimate_flops(g)
+
+    hw = HardwareConfig(sram_bytes=64 * 1024)
+    assert run_schedule_pass(compact, hw) == run_schedule_pass(g, hw)
+
+
+def test_native_inference_reports_missing_inputs():
+    g = make_mlp_chain(batch=2, hidden=4, ffs=[8], dtype="fp16")
+    g.ops[1].inputs[0] = "nope"
+    compact = CompactGraph.from_graph(g)
+    with pytest.raises(KeyError):
+        compact.infer_shapes()
+    assert compact.to_graph() == g
+
+
+def test_out_of_order_ops_are_reordered_like_graph():
+    g = make_mlp_chain(batch=16, hidden=64, ffs=[256] * 2)
+    shuffled = Graph(ops=g.ops[3:] + g.ops[:3], inputs=dict(g.inputs), outputs=list(g.outputs))
+    compact = CompactGraph.from_graph(shuffled)
+    assert CompactGraph.from_graph(g).is_topologically_ordered()
+    assert not compact.is_topologically_ordered()
+
+    hw = HardwareConfig(sram_bytes=64 * 1024)
+    result = run_schedule_pass(compact, hw)
+    assert result == run_schedule_pass(shuffled, hw)
+    assert result.op_order == (3, 4, 5, 0, 1, 2)
@@ -0,0 +1,44 @@
+import pickle
+
+import pytest
+
+from mlcompiler import HardwareConfig, Op, decide_schedule, run_schedule_pass
+from mlcompiler.pass_schedule import _Deferred
+
+from graph_builders import make_linear_gelu_linear
+
+
+@pytest.mark.parametrize("hidden", [256, 1024, 2048, 4096])
+@pytest.mark.parametrize("sram_kb", [64, 512, 1024, 2048, 8192])
+@pytest.mark.parametrize(
+    "kwargs",
+    [{}, {"objective": "latency"}, {"tiling": True}, {"fusion": True, "order": "auto"}],
+)
+def test_decision_path_matches_full_pass(hidden, sram_kb, kwargs):
+    g = make_linear_gelu_linear(batch=32, hidden=hidden, ff=4 * hidden)
+    hw = HardwareConfig(sram_bytes=sram_kb * 1024, dram_bandwidth_GBs=100.0, compute_Gops=50.0)
+    full = run_schedule_pass(g, hw, **kwargs)
+    fast = run_schedule_pass(g, hw, explain=False, **kwargs)
+    assert fast.chosen_schedule == full.chosen_schedule
+    assert fast == full
+    if set(kwargs) <= {"objective"}:
+        assert decide_schedule(g, hw, **kwargs) == full.chosen_schedule
+
+
+def test_explanations_are_built_on_first_access():
+    g = make_linear_gelu_linear(batch=32, hidden=4096, ff=16384)
+    hw = HardwareConfig(sram_bytes=1 * 1024 * 1024)
+    fast = run_schedule_pass(g, hw, explain=False)
+    assert isinstance(fast.__dict__["_lazy_reason"], _Deferred)
+    assert isinstance(fast.__dict__["_lazy_costs"], _Deferred)
+
+    assert fast.reason == run_schedule_pass(g, hw).reason
+    assert isinstance(fast.__dict__["_lazy_costs"], _Deferred)
+    assert fast.costs["memory_aware"].sram.peak_bytes == 2 * 1024 * 1024
+    assert pickle.loads(pickle.dumps(fast)) == fast
+
+    stale = run_schedule_pass(g, hw, explain=False)
+    g.ops.append(Op(name="GELU", inputs=["linear2"], outputs=["y"], attrs={}))
+    assert stale.chosen_schedule.name == "naive"
+    with pytest.raises(RuntimeError, match="Graph changed"):
+        stale.reason
@@ -0,0 +1,51 @@
+import pytest
+
+from mlcompiler import HardwareConfig, run_schedule_pass
+from mlcompiler.cost import estimate_flops, roofline_latency_s
+
+from graph_builders import make_linear_gelu_linear
+
+
+def test_flop_counts_per_op():
+    g = make_linear_gelu_linear(batch=2, hidden=8, ff=16)
+    flops = estimate_flops(g)
+    assert flops.breakdown == {
+        "linear1": 2 * 2 * 8 * 16,
+        "gelu": 8 * 2 * 16,
+        "linear2": 2 * 2 * 16 * 8,
+    }
+    assert flops.total_flops == sum(flops.breakdown.values())
+    # Computed once per graph version and shared by every candidate.
+    assert estimate_flops(g) is flops
+    g.ops.pop()
+    assert "linear2" not in estimate_flops(g).breakdown
+
+
+def test_roofline_takes_slower_of_memory_and_compute():
+    hw = HardwareConfig(sram_bytes=0, dram_bandwidth_GBs=100.0, compute_Gops=1000.0)
+    assert roofline_latency_s(10**9, 10**9, hw) == pytest.approx(1e-2)
+    assert roofline_latency_s(10**6, 10**12, hw) == pytest.approx(1.0)
+    assert roofline_latency_s(1, 1, HardwareConfig(sram_bytes=0)) is None
+
+
+def test_latency_objective_reports_bound():
+    g = make_linear_gelu_linear(batch=32, hidden=1024, ff=4096)
+    hw = HardwareConfig(
+        sram_bytes=1 * 1024 * 1024, dram_bandwidth_GBs=900.0, compute_Gops=50_000.0
+    )
+    result = run_schedule_pass(g, hw, objective="latency")
+    chosen = result.costs[result.chosen_schedule.name]
+    assert chosen.latency_s == min(c.latency_s for c in result.costs.values() if c.feasible)
+    assert "compute-bound" in result.reason
+
+
+def test_latency_objective_falls_back_to_bytes():
+    g = make_linear_gelu_linear(batch=32, hidden=1024, ff=4096)
+    hw = HardwareConfig(sram_bytes=1 * 1024 * 1024)
+    by_latency = run_schedule_pass(g, hw, objective="latency")
+    by_bytes = run_schedule_pass(g, hw)
+    assert by_latency.chosen_schedule == by_bytes.chosen_schedule
+    assert by_latency.reason == by_bytes.reason
+
+    with pytest.raises(ValueError):
+        run_schedule_pass(g, hw, objective="energy")
@@ -0,0 +1,33 @@
+from mlcompiler import (
+    HardwareConfig,
+    compute_live_ranges,
+    estimate_peak_sram_bytes,
+    run_schedule_pass,
+)
+from mlcompiler.schedule import MEMORY_AWARE_SCHEDULE
+
+from graph_builders import make_mlp_chain
+
+
+def test_live_ranges_follow_last_consumer():
+    g = make_mlp_chain(batch=2, hidden=4, ffs=[8] * 2)
+    ranges = {r.name: (r.start, r.end) for r in compute_live_ranges(g)}
+    assert ranges["up0"] == (0, 1)
+    assert ranges["act0"] == (1, 2)
+    assert ranges["down0"] == (2, 3)
+    assert "down1" not in ranges
+
+
+def test_peak_sram_reports_live_tensors_at_peak():
+    g = make_mlp_chain(batch=32, hidden=1024, ffs=[4096] * 3)
+    sram = estimate_peak_sram_bytes(g, MEMORY_AWARE_SCHEDULE)
+    inter = 32 * 4096 * 2
+    assert sram.peak_bytes == 2 * inter
+    assert sram.live_at_peak == {"up0": inter, "act0": inter}
+    assert sram.peak_op_index == 1
+
+
+def test_long_chain_fuses_when_live_set_fits():
+    g = make_mlp_chain(batch=32, hidden=1024, ffs=[4096] * 4)
+    result = run_schedule_pass(g, HardwareConfig(sram_bytes=1 * 1024 * 1024))
+    assert result.chosen_schedule.name == "memory_aware"
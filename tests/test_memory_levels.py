@@ -0,0 +1,95 @@
+import dataclasses
+
+import pytest
+
+from mlcompiler import (
+    CompactGraph,
+    HardwareConfig,
+    MemoryLevel,
+    decide_schedule,
+    estimate_dram_bytes,
+    estimate_peak_sram_bytes,
+    estimate_schedule,
+    run_schedule_pass,
+    select_schedule,
+)
+from mlcompiler.schedule import MEMORY_AWARE_SCHEDULE, NAIVE_SCHEDULE
+
+from graph_builders import make_linear_gelu_linear
+
+
+def _hierarchy(l2_bytes: int) -> tuple:
+    return (MemoryLevel("l2", l2_bytes, 2000.0), MemoryLevel("hbm", None, 100.0))
+
+
+def test_memory_levels_validated():
+    with pytest.raises(ValueError, match="unbounded"):
+        HardwareConfig(sram_bytes=1, memory_levels=(MemoryLevel("l2", 10, 1.0),))
+    with pytest.raises(ValueError, match="unique"):
+        HardwareConfig(
+            sram_bytes=1, memory_levels=(MemoryLevel("m", 10), MemoryLevel("m", None))
+        )
+    with pytest.raises(ValueError, match="capacity"):
+        HardwareConfig(
+            sram_bytes=1, memory_levels=(MemoryLevel("l2", None), MemoryLevel("hbm", None))
+        )
+    hw = HardwareConfig(sram_bytes=1, memory_levels=_hierarchy(10))
+    assert HardwareConfig(**dataclasses.asdict(hw)) == hw
+    assert HardwareConfig(sram_bytes=1, dram_bandwidth_GBs=5.0).levels() == (
+        MemoryLevel("dram", None, 5.0),
+    )
+
+
+def test_spilled_intermediates_placed_in_innermost_level_with_room():
+    g = make_linear_gelu_linear(batch=32, hidden=1024, ff=4096)  # intermediates: 256KB each
+    hw = HardwareConfig(sram_bytes=1 << 20, memory_levels=_hierarchy(300 * 1024))
+    dram = estimate_dram_bytes(g, NAIVE_SCHEDULE, hw)
+    sram = estimate_peak_sram_bytes(g, NAIVE_SCHEDULE, hw)
+    # linear1 and gelu overlap at the GELU op, so only one fits in L2.
+    assert dram.by_level == {"l2": 2 * 256 * 1024, "hbm": dram.total_bytes - 2 * 256 * 1024}
+    assert sum(dram.by_level.values()) == dram.total_bytes
+    assert sram.level_peaks == {"l2": 256 * 1024}
+
+    flat = HardwareConfig(sram_bytes=1 << 20)
+    assert estimate_dram_bytes(g, NAIVE_SCHEDULE, flat).by_level == {}
+    assert estimate_dram_bytes(g, MEMORY_AWARE_SCHEDULE, hw).by_level == {
+        "l2": 0,
+        "hbm": estimate_dram_bytes(g, MEMORY_AWARE_SCHEDULE).total_bytes,
+    }
+    compact = CompactGraph.from_graph(g)
+    assert estimate_dram_bytes(compact, NAIVE_SCHEDULE, hw) == dram
+
+
+def test_fast_level_changes_the_choice():
+    g = make_linear_gelu_linear(batch=32, hidden=1024, ff=4096)
+    # Naive fits (largest tensor 256KB); untiled memory_aware (512KB) does not.
+    sram = 300 * 1024
+    flat = run_schedule_pass(g, HardwareConfig(sram_bytes=sram), tiling=True)
+    assert flat.chosen_schedule.name.startswith("memory_aware_tiled")
+
+    hw = HardwareConfig(sram_bytes=sram, memory_levels=_hierarchy(4 << 20))
+    result = run_schedule_pass(g, hw, tiling=True)
+    assert result.chosen_schedule.name == "naive"
+    assert "lowest memory time" in result.reason
+    assert result.costs["naive"].dram.by_level["l2"] > 0
+
+    # A small L2 pushes the spills to HBM and the tiled schedule wins again.
+    small = HardwareConfig(sram_bytes=sram, memory_levels=_hierarchy(128 * 1024))
+    assert run_schedule_pass(g, small, tiling=True).chosen_schedule == flat.chosen_schedule
+
+
+def test_decision_paths_agree_with_hierarchy():
+    g = make_linear_gelu_linear(batch=32, hidden=1024, ff=4096)
+    for l2 in (64 * 1024, 512 * 1024, 4 << 20):
+        for sram in (300 * 1024, 1 << 20):
+            hw = HardwareConfig(sram_bytes=sram, compute_Gops=50.0, memory_levels=_hierarchy(l2))
+            for objective in ("bytes", "latency"):
+                full = run_schedule_pass(g, hw, tiling=True, objective=objective)
+                candidates = [c.schedule for c in full.costs.values()]
+                assert decide_schedule(g, hw, candidates, objective) == full.chosen_schedule
+                fast = run_schedule_pass(g, hw, tiling=True, objective=objective, explain=False)
+                assert fast.chosen_schedule == full.chosen_schedule
+                estimates = {s.name: estimate_schedule(g, s) for s in candidates}
+                what_if = select_schedule(estimates, hw, objective=objective)
+                assert what_if.chosen_schedule == full.chosen_schedule
+                assert full.costs["naive"].latency_s is not None
@@ -0,0 +1,110 @@
+import pytest
+
+from mlcompiler import (
+    Graph,
+    HardwareConfig,
+    Op,
+    OpRule,
+    Tensor,
+    estimate_flops,
+    get_op_rule,
+    register_op,
+    run_schedule_pass,
+)
+from mlcompiler.ir import OP_RULES
+
+
+def _transformer_block(batch: int, seq: int, dim: int, heads: int) -> Graph:
+    ops = [
+        Op(name="LayerNorm", inputs=["x"], outputs=["ln1"], attrs={}),
+        Op(
+            name="MultiHeadAttention",
+            inputs=["ln1"],
+            outputs=["attn"],
+            attrs={"embed_dim": dim, "num_heads": heads},
+        ),
+        Op(name="Add", inputs=["x", "attn"], outputs=["res1"], attrs={}),
+        Op(name="LayerNorm", inputs=["res1"], outputs=["ln2"], attrs={}),
+        Op(
+            name="Linear",
+            inputs=["ln2"],
+            outputs=["up"],
+            attrs={"in_features": dim, "out_features": 4 * dim},
+        ),
+        Op(name="GELU", inputs=["up"], outputs=["act"], attrs={}),
+        Op(
+            name="Linear",
+            inputs=["act"],
+            outputs=["down"],
+            attrs={"in_features": 4 * dim, "out_features": dim},
+        ),
+        Op(name="Add", inputs=["res1", "down"], outputs=["y"], attrs={}),
+    ]
+    return Graph(ops=ops, inputs={"x": Tensor((batch, seq, dim))}, outputs=["y"])
+
+
+def test_transformer_block_schedules():
+    g = _transformer_block(batch=2, seq=16, dim=64, heads=4)
+    tensors = g.shape_table()
+    assert tensors["y"].shape == (2, 16, 64)
+    assert tensors["up"].shape == (2, 16, 256)
+
+    flops = estimate_flops(g)
+    tokens = 2 * 16
+    assert flops.breakdown["up"] == 2 * tokens * 64 * 256
+    assert flops.breakdown["res1"] == tokens * 64
+    assert flops.breakdown["attn"] > 8 * tokens * 64 * 64
+
+    result = run_schedule_pass(g, HardwareConfig(sram_bytes=1 * 1024 * 1024))
+    assert result.chosen_schedule.name == "memory_aware"
+
+
+def test_layout_and_matmul_rules():
+    g = Graph(
+        ops=[
+            Op(name="Reshape", inputs=["q"], outputs=["q4"], attrs={"shape": (2, 8, 4, -1)}),
+            Op(name="Transpose", inputs=["q4"], outputs=["qt"], attrs={"perm": (0, 2, 1, 3)}),
+            Op(name="Transpose", inputs=["qt"], outputs=["kt"], attrs={}),
+            Op(name="MatMul", inputs=["qt", "kt"], outputs=["scores"], attrs={}),
+            Op(name="Softmax", inputs=["scores"], outputs=["probs"], attrs={}),
+        ],
+        inputs={"q": Tensor((2, 8, 64))},
+        outputs=["probs"],
+    )
+    tensors = g.shape_table()
+    assert tensors["q4"].shape == (2, 8, 4, 16)
+    assert tensors["qt"].shape == (2, 4, 8, 16)
+    assert tensors["kt"].shape == (2, 4, 16, 8)
+    assert tensors["probs"].shape == (2, 4, 8, 8)
+    assert estimate_flops(g).breakdown["scores"] == 2 * 16 * (2 * 4 * 8 * 8)
+
+    with pytest.raises(ValueError):
+        Op(name="MatMul", inputs=[], outputs=[], attrs={}).infer_output_tensors(
+            [Tensor((2, 3)), Tensor((4, 5))]
+        )
+    with pytest.raises(ValueError):
+        Op(name="Add", inputs=[], outputs=[], attrs={}).infer_output_tensors(
+            [Tensor((2, 3)), Tensor((4, 3))]
+        )
+
+
+def test_custom_op_registration(monkeypatch):
+    monkeypatch.setitem(OP_RULES, "Scale", OP_RULES["GELU"])
+    with pytest.raises(ValueError):
+        register_op("Scale", OP_RULES["GELU"])
+
+    rule = OpRule(
+        infer=lambda op, ins: [Tensor(ins[0].shape, ins[0].dtype)],
+        flops=lambda op, ins, outs: 1,
+    )
+    register_op("Scale", rule, replace=True)
+    assert get_op_rule("Scale") is rule
+    g = Graph(
+        ops=[Op(name="Scale", inputs=["x"], outputs=["y"], attrs={})],
+        inputs={"x": Tensor((4,))},
+        outputs=["y"],
+    )
+    assert estimate_flops(g).total_flops == 1
+
+    with pytest.raises(NotImplementedError):
+        get_op_rule("Conv2d")
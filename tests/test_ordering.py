@@ -0,0 +1,91 @@
+import pytest
+
+from mlcompiler import Graph, HardwareConfig, Op, Tensor, run_schedule_pass
+from mlcompiler.ordering import order_for_memory, reorder_graph
+
+
+def _branch(prefix: str, src: str, hidden: int, ff: int):
+    return [
+        Op(
+            name="Linear",
+            inputs=[src],
+            outputs=[f"{prefix}_up"],
+            attrs={"in_features": hidden, "out_features": ff},
+        ),
+        Op(name="GELU", inputs=[f"{prefix}_up"], outputs=[f"{prefix}_act"], attrs={}),
+        Op(
+            name="Linear",
+            inputs=[f"{prefix}_act"],
+            outputs=[f"{prefix}_out"],
+            attrs={"in_features": ff, "out_features": hidden},
+        ),
+    ]
+
+
+def _interleaved_fanout(batch: int, hidden: int, ff: int) -> Graph:
+    # Three branches reading the same input, listed breadth-first so every
+    # branch's intermediates are live at once in the given order.
+    branches = [_branch(p, "x", hidden, ff) for p in ("a", "b", "c")]
+    ops = [op for step in zip(*branches) for op in step]
+    return Graph(
+        ops=ops,
+        inputs={"x": Tensor((batch, hidden))},
+        outputs=["a_out", "b_out", "c_out"],
+    )
+
+
+def test_topological_order_and_errors():
+    g = Graph(
+        ops=list(reversed(_branch("a", "x", 4, 8))),
+        inputs={"x": Tensor((2, 4))},
+        outputs=["a_out"],
+    )
+    assert not g.is_topologically_ordered()
+    assert g.topological_order() == [2, 1, 0]
+    assert g.shape_table()["a_out"].shape == (2, 4)
+
+    g.ops[2].inputs[0] = "a_out"
+    g.invalidate_shapes()
+    with pytest.raises(ValueError, match="cycle"):
+        g.topological_order()
+
+    g.ops[2].inputs[0] = "missing"
+    g.invalidate_shapes()
+    with pytest.raises(KeyError):
+        g.topological_order()
+
+
+def test_memory_minimizing_orders():
+    g = _interleaved_fanout(batch=4, hidden=8, ff=32)
+    given = order_for_memory(g, "given")
+    greedy = order_for_memory(g, "greedy")
+    exact = order_for_memory(g, "exact")
+    assert exact.peak_live_bytes <= greedy.peak_live_bytes < given.peak_live_bytes
+
+    def valid_orders(prefix, remaining):
+        if not remaining:
+            yield prefix
+        for idx in sorted(remaining):
+            available = {"x"} | {n for i in prefix for n in g.ops[i].outputs}
+            if g.ops[idx].inputs[0] in available:
+                yield from valid_orders(prefix + [idx], remaining - {idx})
+
+    brute = min(
+        order_for_memory(reorder_graph(g, order), "given").peak_live_bytes
+        for order in valid_orders([], set(range(len(g.ops))))
+    )
+    assert exact.peak_live_bytes == brute
+
+
+def test_pass_uses_chosen_order():
+    g = _interleaved_fanout(batch=32, hidden=1024, ff=4096)
+    hw = HardwareConfig(sram_bytes=768 * 1024)
+
+    given = run_schedule_pass(g, hw)
+    assert given.chosen_schedule.name == "naive"
+    assert given.op_order is None
+
+    result = run_schedule_pass(g, hw, order="auto")
+    assert result.chosen_schedule.name == "memory_aware"
+    assert sorted(result.op_order) == list(range(len(g.ops)))
+    assert reorder_graph(g, result.op_order).is_topologically_ordered()
@@ -0,0 +1,68 @@
+import pytest
+
+from mlcompiler import Graph, HardwareConfig, Op, Tensor, plan_partition, run_schedule_pass
+from mlcompiler.partition import describe_plan, partition_candidates, shard_graph
+
+from graph_builders import make_linear_gelu_linear
+
+
+def test_column_shards_alternate_and_all_reduce():
+    g = make_linear_gelu_linear(batch=32, hidden=1024, ff=4096)
+    shard, comm = shard_graph(g, "columns", 4)
+    tensors = shard.shape_table()
+    assert tensors["linear1"].shape == (32, 1024)
+    assert tensors["gelu"].shape == (32, 1024)
+    assert tensors["linear2"].shape == (32, 1024)
+    # Ring all-reduce of the 64KB output: 2 * 3/4 of it leaves each core.
+    assert comm == 2 * 3 * 64 * 1024 // 4
+
+
+def test_row_shards_split_batch():
+    g = make_linear_gelu_linear(batch=32, hidden=1024, ff=4096)
+    shard, comm = shard_graph(g, "rows", 4)
+    assert shard.shape_table()["linear1"].shape == (8, 4096)
+    assert comm == 0
+    assert shard_graph(g, "rows", 3) is None
+    with pytest.raises(ValueError):
+        shard_graph(g, "diagonal", 2)
+
+
+def test_unshardable_ops_stay_on_one_core():
+    g = Graph(
+        ops=[Op(name="Softmax", inputs=["x"], outputs=["y"], attrs={})],
+        inputs={"x": Tensor((32, 1024))},
+        outputs=["y"],
+    )
+    assert shard_graph(g, "rows", 2) is None
+    plan = plan_partition(g, HardwareConfig(sram_bytes=1 << 20, num_cores=4))
+    assert (plan.mode, plan.cores) == ("none", 1)
+
+
+def test_large_linear_is_split_instead_of_going_naive():
+    g = make_linear_gelu_linear(batch=32, hidden=1024, ff=4096)
+    hw = HardwareConfig(
+        sram_bytes=256 * 1024,
+        dram_bandwidth_GBs=400.0,
+        compute_Gops=5000.0,
+        num_cores=8,
+        interconnect_GBs=100.0,
+    )
+    assert run_schedule_pass(g, hw).chosen_schedule.name == "naive"
+
+    plan = plan_partition(g, hw)
+    assert plan.mode == "columns"
+    assert plan.result.chosen_schedule.name == "memory_aware"
+    assert plan.feasible
+    plans = partition_candidates(g, hw)
+    single = next(p for p in plans if p.mode == "none")
+    assert plan.total_bytes < single.total_bytes
+    assert "columns across" in describe_plan(plan)
+
+    fastest = plan_partition(g, hw, objective="latency")
+    assert fastest.latency_s == min(p.latency_s for p in plans)
+    assert fastest.cores == 8
+
+
+def test_num_cores_validated():
+    with pytest.raises(ValueError):
+        HardwareConfig(sram_bytes=1, num_cores=0)
@@ -0,0 +1,66 @@
+import pytest
+
+from mlcompiler import (
+    HardwareConfig,
+    decide_schedule,
+    dumps_results,
+    loads_results,
+    run_schedule_pass,
+)
+from mlcompiler.cost import (
+    estimate_dram_bytes,
+    estimate_peak_sram_bytes,
+    schedule_latency_s,
+    tile_steps,
+)
+from mlcompiler.schedule import (
+    MEMORY_AWARE_SCHEDULE,
+    pipelined_memory_aware_schedule,
+    tiled_memory_aware_schedule,
+)
+
+from graph_builders import make_linear_gelu_linear
+
+
+def test_latency_models():
+    serial = tiled_memory_aware_schedule((32, 512))
+    piped = pipelined_memory_aware_schedule((32, 512))
+    assert schedule_latency_s(MEMORY_AWARE_SCHEDULE, 3.0, 1.0) == 3.0
+    assert schedule_latency_s(serial, 3.0, 1.0, steps=4) == 4.0
+    assert schedule_latency_s(piped, 3.0, 1.0, steps=4) == pytest.approx(3.25)
+    assert schedule_latency_s(piped, None, 1.0) is None
+    with pytest.raises(ValueError):
+        pipelined_memory_aware_schedule((32, 512), buffers=1)
+
+
+def test_prefetch_buffer_counted_in_peak_sram():
+    g = make_linear_gelu_linear(batch=32, hidden=1024, ff=4096)
+    serial = tiled_memory_aware_schedule((32, 512))
+    piped = pipelined_memory_aware_schedule((32, 512), buffers=3)
+    assert tile_steps(g, serial) == 8
+    dram = estimate_dram_bytes(g, serial).total_bytes
+    assert estimate_dram_bytes(g, piped).total_bytes == dram
+    serial_sram = estimate_peak_sram_bytes(g, serial)
+    piped_sram = estimate_peak_sram_bytes(g, piped)
+    assert piped_sram.breakdown["prefetch_buffers"] == 2 * (dram // 8)
+    assert piped_sram.peak_bytes == serial_sram.peak_bytes + 2 * (dram // 8)
+
+
+def test_pipelining_hides_transfers_under_latency_objective():
+    g = make_linear_gelu_linear(batch=256, hidden=1024, ff=4096)
+    hw = HardwareConfig(sram_bytes=1 << 20, dram_bandwidth_GBs=100.0, compute_Gops=2000.0)
+    result = run_schedule_pass(g, hw, tiling=True, pipelining=True, objective="latency")
+    assert result.chosen_schedule.buffers == 2
+    assert result.chosen_schedule.name.startswith("memory_aware_pipelined_")
+    chosen = result.costs[result.chosen_schedule.name]
+    assert chosen.feasible
+    assert chosen.latency_s == min(c.latency_s for c in result.costs.values() if c.feasible)
+    candidates = [c.schedule for c in result.costs.values()]
+    assert decide_schedule(g, hw, candidates, "latency") == result.chosen_schedule
+
+    # Same bytes, more SRAM: the bytes objective keeps the serial tiles.
+    by_bytes = run_schedule_pass(g, hw, tiling=True, pipelining=True)
+    assert by_bytes.chosen_schedule.buffers == 1
+
+    restored = loads_results(dumps_results([result]))[0]
+    assert restored.chosen_schedule == result.chosen_schedule
@@ -0,0 +1,69 @@
+from mlcompiler import (
+    Graph,
+    HardwareConfig,
+    Op,
+    Tensor,
+    apply_storage_dtypes,
+    estimate_flops,
+    run_precision_pass,
+    run_schedule_pass,
+)
+from mlcompiler.precision import _storage_options
+
+from graph_builders import make_linear_gelu_linear
+
+
+def test_storage_dtype_narrows_tensor_and_charges_conversion():
+    g = make_linear_gelu_linear(batch=32, hidden=1024, ff=4096)
+    narrowed = apply_storage_dtypes(g, {"linear1": "int8"})
+    tensors = narrowed.shape_table()
+    assert tensors["linear1"].dtype == "int8"
+    assert tensors["linear1"].nbytes() == g.shape_table()["linear1"].nbytes() // 2
+    assert tensors["gelu"].dtype == "float16"
+    # Quantize after linear1, dequantize inside GELU: 2 FLOPs per element each.
+    extra = estimate_flops(narrowed).total_flops - estimate_flops(g).total_flops
+    assert extra == 2 * 2 * 32 * 4096
+    # The original graph is untouched.
+    assert g.shape_table()["linear1"].dtype == "float16"
+
+
+def test_fitting_graph_keeps_its_dtypes():
+    g = make_linear_gelu_linear(batch=32, hidden=1024, ff=4096)
+    hw = HardwareConfig(sram_bytes=512 * 1024)
+    result = run_precision_pass(g, hw)
+    assert result.storage_dtypes is None
+    assert result.chosen_schedule.name == run_schedule_pass(g, hw).chosen_schedule.name
+
+
+def test_narrowing_lets_fused_schedule_fit():
+    g = make_linear_gelu_linear(batch=32, hidden=1024, ff=4096)
+    hw = HardwareConfig(sram_bytes=400 * 1024)
+    assert run_schedule_pass(g, hw).chosen_schedule.name == "naive"
+
+    result = run_precision_pass(g, hw)
+    assert result.chosen_schedule.name == "memory_aware"
+    # One int8 intermediate is enough; the search widens back the rest.
+    assert result.storage_dtypes == {"linear1": "int8"}
+    cost = result.costs["memory_aware"]
+    assert cost.feasible and cost.sram.peak_bytes <= hw.sram_bytes
+    again = run_schedule_pass(apply_storage_dtypes(g, result.storage_dtypes), hw)
+    assert again.costs["memory_aware"].dram.total_bytes == cost.dram.total_bytes
+
+
+def test_precision_floors_protect_softmax():
+    g = Graph(
+        ops=[
+            Op(name="MatMul", inputs=["q", "k"], outputs=["scores"], attrs={}),
+            Op(name="Softmax", inputs=["scores"], outputs=["probs"], attrs={}),
+            Op(name="MatMul", inputs=["probs", "v"], outputs=["out"], attrs={}),
+        ],
+        inputs={
+            "q": Tensor((256, 64), "float32"),
+            "k": Tensor((64, 256), "float32"),
+            "v": Tensor((256, 64), "float32"),
+        },
+        outputs=["out"],
+    )
+    options = _storage_options(g, ("float16", "int8"), {"Softmax": "float16"})
+    assert options == {"scores": ["float16"], "probs": ["float16"]}
+    assert _storage_options(g, ("float16",), {"Softmax": "float32"}) == {}
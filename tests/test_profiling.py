@@ -0,0 +1,44 @@
+import json
+
+from mlcompiler import HardwareConfig, profile, run_schedule_pass
+from mlcompiler import profiling
+
+from graph_builders import make_linear_gelu_linear
+
+
+def test_profile_collects_stages_and_counters(tmp_path):
+    g = make_linear_gelu_linear(batch=32, hidden=1024, ff=4096)
+    hw = HardwareConfig(sram_bytes=1 * 1024 * 1024)
+
+    with profile() as prof:
+        run_schedule_pass(g, hw)
+        run_schedule_pass(g, hw)
+    assert not profiling.is_profiling()
+
+    totals = prof.stage_totals()
+    assert totals["run_schedule_pass"]["calls"] == 2
+    assert totals["evaluate_schedule"]["calls"] == 4
+    assert "format_reason" in totals and "estimate_peak_sram_bytes" in totals
+    # Shapes are inferred once and then served from the cache.
+    assert prof.counters["infer_shapes"] == 1
+    assert prof.counters["candidates_evaluated"] == 4
+    assert prof.counters["ops_walked"] > 0
+    assert "run_schedule_pass" in prof.summary()
+
+    path = tmp_path / "trace.json"
+    prof.write_chrome_trace(str(path))
+    trace = json.loads(path.read_text())["traceEvents"]
+    spans = [e for e in trace if e["ph"] == "X"]
+    assert len(spans) == len(prof.events)
+    assert all(e["dur"] >= 0 for e in spans)
+    assert trace[-1]["ph"] == "C"
+    assert trace[-1]["args"]["candidates_evaluated"] == 4
+
+
+def test_disabled_profiling_records_nothing():
+    g = make_linear_gelu_linear(batch=8, hidden=64, ff=256)
+    with profile() as outer:
+        pass
+    run_schedule_pass(g, HardwareConfig(sram_bytes=1 * 1024 * 1024))
+    assert outer.events == [] and outer.counters == {}
+    assert profiling.span("x") is profiling.span("y")
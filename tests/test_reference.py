@@ -0,0 +1,105 @@
+import importlib.util
+import pathlib
+
+import pytest
+
+from mlcompiler import Graph, HardwareConfig, Op, Tensor, execute_schedule
+from mlcompiler.pass_schedule import generate_candidates
+from mlcompiler.schedule import (
+    MEMORY_AWARE_SCHEDULE,
+    NAIVE_SCHEDULE,
+    tiled_memory_aware_schedule,
+)
+
+from graph_builders import make_linear_gelu_linear
+
+np = pytest.importorskip("numpy")
+
+_BENCH = pathlib.Path(__file__).resolve().parents[1] / "benchmarks" / "bench_pipeline.py"
+
+
+def _load_bench():
+    spec = importlib.util.spec_from_file_location("bench_pipeline", _BENCH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_untiled_memory_aware_matches_except_first_weight_read():
+    g = make_linear_gelu_linear(batch=32, hidden=1024, ff=4096)
+    report = execute_schedule(g, MEMORY_AWARE_SCHEDULE)
+    weights = 2 * 1024 * 4096 * 2
+    # The cost model leaves out the first pass over the weights.
+    assert report.differences() == {"dram_bytes": weights, "dram.weight_read": weights}
+    assert report.sram.peak_bytes == report.estimate.sram.peak_bytes == 2 * 32 * 4096 * 2
+    assert report.sram.live_at_peak == {"linear1": 32 * 4096 * 2, "gelu": 32 * 4096 * 2}
+    assert report.max_abs_error == 0.0
+
+    naive = execute_schedule(g, NAIVE_SCHEDULE)
+    np.testing.assert_array_equal(naive.outputs["linear2"], report.outputs["linear2"])
+    assert naive.dram.breakdown["intermediate_read"] == 2 * 32 * 4096 * 2
+
+
+def test_tiled_execution_streams_chunks_and_rereads():
+    g = make_linear_gelu_linear(batch=32, hidden=1024, ff=4096)
+    schedule = tiled_memory_aware_schedule((8, 512))
+    report = execute_schedule(g, schedule)
+    for key in ("weight_reread", "input_reread", "input_read", "output_write"):
+        assert report.dram.breakdown[key] == report.estimate.dram.breakdown[key]
+    # A linear1 chunk, the x row tile and the linear2 accumulator.
+    assert report.sram.peak_bytes == report.estimate.sram.peak_bytes == 8 * (512 + 2 * 1024) * 2
+    assert report.sram.live_at_peak == report.estimate.sram.live_at_peak
+    assert report.max_abs_error < 1e-9
+    assert report.transfers > execute_schedule(g, MEMORY_AWARE_SCHEDULE).transfers
+
+
+def test_differences_surface_multi_reader_tensors():
+    g = Graph(
+        ops=[
+            Op("Linear", ["x"], ["h"], {"in_features": 64, "out_features": 64}),
+            Op("GELU", ["h"], ["a"], {}),
+            Op("Add", ["a", "h"], ["y"], {}),
+        ],
+        inputs={"x": Tensor((8, 64))},
+        outputs=["y"],
+    )
+    diffs = execute_schedule(g, NAIVE_SCHEDULE).differences()
+    # h is loaded back by both of its readers; the model counts one read.
+    assert diffs["dram.intermediate_read"] == 8 * 64 * 2
+
+
+def test_row_tiling_rejects_ops_that_mix_rows():
+    g = Graph(
+        ops=[Op("MatMul", ["a", "b"], ["c"], {}), Op("GELU", ["c"], ["d"], {})],
+        inputs={"a": Tensor((16, 16)), "b": Tensor((16, 16))},
+        outputs=["d"],
+    )
+    assert execute_schedule(g, NAIVE_SCHEDULE).max_abs_error == 0.0
+    with pytest.raises(ValueError):
+        execute_schedule(g, tiled_memory_aware_schedule((4, 16)))
+
+
+def test_benchmark_graphs_run_under_every_candidate():
+    bench = _load_bench()
+    hw = HardwareConfig(sram_bytes=16 * 1024)
+    strategies = set()
+    for make in bench.GENERATORS.values():
+        g = make(20)
+        candidates = generate_candidates(
+            g, hw, tiling=True, fusion=True, pipelining=True, remat=True
+        )
+        for schedule in candidates:
+            report = execute_schedule(g, schedule)
+            assert report.max_abs_error < 1e-9, schedule.name
+            written = report.dram.breakdown["output_write"]
+            assert written == report.estimate.dram.breakdown["output_write"]
+            strategies.add(schedule.strategy if schedule.tile_shape is None else "tiled")
+    assert strategies >= {"naive", "memory_aware", "fusion_groups", "tiled"}
+
+
+def test_tiles_flatten_leading_dims_like_the_cost_model():
+    g = make_linear_gelu_linear(batch=(4, 128), hidden=64, ff=256)
+    report = execute_schedule(g, tiled_memory_aware_schedule((64, 128)))
+    assert report.sram.peak_bytes == report.estimate.sram.peak_bytes
+    assert report.differences() == {"dram_bytes": 2 * 64 * 256 * 2, "dram.weight_read": 2 * 64 * 256 * 2}
+    assert report.max_abs_error < 1e-9
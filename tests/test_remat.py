@@ -0,0 +1,97 @@
+import pytest
+
+from mlcompiler import (
+    Graph,
+    HardwareConfig,
+    Op,
+    Tensor,
+    estimate_schedule,
+    plan_rematerialization,
+    run_schedule_pass,
+)
+from mlcompiler.binfmt import dumps_results, loads_results
+from mlcompiler.ops import GELU_FLOPS_PER_ELEM
+from mlcompiler.remat import remat_layout
+from mlcompiler.schedule import MEMORY_AWARE_SCHEDULE, remat_schedule
+
+from graph_builders import make_linear_gelu_linear
+
+
+def _make_residual_block(batch: int = 32, hidden: int = 1024, ff: int = 4096) -> Graph:
+    # h is read by the first up-projection and again by the residual Add.
+    ops = [
+        Op("Linear", ["x"], ["h"], {"in_features": hidden, "out_features": hidden}),
+        Op("Linear", ["h"], ["a"], {"in_features": hidden, "out_features": ff}),
+        Op("GELU", ["a"], ["b"], {}),
+        Op("Linear", ["b"], ["c"], {"in_features": ff, "out_features": hidden}),
+        Op("Add", ["c", "h"], ["y"], {}),
+    ]
+    return Graph(ops=ops, inputs={"x": Tensor((batch, hidden))}, outputs=["y"])
+
+
+def test_recomputing_gelu_fits_just_over_the_limit():
+    g = make_linear_gelu_linear(batch=32, hidden=1024, ff=4096)
+    hw = HardwareConfig(sram_bytes=400 * 1024)
+    assert not run_schedule_pass(g, hw).costs["memory_aware"].feasible
+
+    plan = plan_rematerialization(g, hw)
+    assert plan.actions == (("gelu", "recompute"),)
+    # GELU has one reader, so it is computed inside the second Linear instead.
+    assert plan.extra_flops == 0
+    assert plan.peak_sram_bytes == 32 * 4096 * 2
+
+    result = run_schedule_pass(g, hw, remat=True)
+    assert result.chosen_schedule.name == "remat"
+    cost = result.costs["remat"]
+    assert cost.feasible
+    assert cost.dram.total_bytes == result.costs["memory_aware"].dram.total_bytes
+    assert run_schedule_pass(g, hw, remat=True, explain=False).chosen_schedule.name == "remat"
+
+
+def test_remat_is_not_offered_when_memory_aware_fits():
+    g = make_linear_gelu_linear(batch=32, hidden=1024, ff=4096)
+    result = run_schedule_pass(g, HardwareConfig(sram_bytes=1 << 20), remat=True)
+    assert "remat" not in result.costs
+
+
+def test_recompute_charges_flops_per_extra_read():
+    g = Graph(
+        ops=[
+            Op("Linear", ["x"], ["up"], {"in_features": 64, "out_features": 256}),
+            Op("GELU", ["up"], ["act"], {}),
+            Op("Linear", ["act"], ["down"], {"in_features": 256, "out_features": 256}),
+            Op("Add", ["down", "act"], ["y"], {}),
+        ],
+        inputs={"x": Tensor((8, 64))},
+        outputs=["y"],
+    )
+    layout = remat_layout(g, {"act": "recompute"})
+    assert layout.extra_flops == {"act": GELU_FLOPS_PER_ELEM * 8 * 256}
+    # up now stays on-chip until the Add, the second place act is rebuilt.
+    assert {(r.name, r.start, r.end) for r in layout.resident} == {("up", 0, 3), ("down", 2, 3)}
+
+    schedule = remat_schedule((("act", "recompute"),))
+    est = estimate_schedule(g, schedule)
+    base = estimate_schedule(g, MEMORY_AWARE_SCHEDULE)
+    assert est.flops.total_flops - base.flops.total_flops == GELU_FLOPS_PER_ELEM * 8 * 256
+
+    with pytest.raises(ValueError):
+        remat_layout(g, {"down": "recompute"})
+
+
+def test_planner_spills_long_lived_skip_tensor():
+    g = _make_residual_block()
+    hw = HardwareConfig(sram_bytes=330 * 1024)
+    plan = plan_rematerialization(g, hw)
+    assert dict(plan.actions) == {"b": "recompute", "h": "spill"}
+    assert plan.spilled_bytes == 32 * 1024 * 2
+    assert plan.peak_sram_bytes <= hw.sram_bytes
+
+    result = run_schedule_pass(g, hw, remat=True)
+    assert result.chosen_schedule.name == "remat"
+    dram = result.costs["remat"].dram
+    assert dram.breakdown["intermediate_write"] == plan.spilled_bytes
+    assert dram.total_bytes == result.costs["memory_aware"].dram.total_bytes + 2 * plan.spilled_bytes
+
+    back = loads_results(dumps_results([result]))[0]
+    assert back.chosen_schedule == result.chosen_schedule
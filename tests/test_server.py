@@ -0,0 +1,98 @@
+import asyncio
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mlcompiler import Graph, HardwareConfig, Op, Tensor, run_schedule_pass
+from mlcompiler.server import CompileClient, CompileError, CompileServer
+
+from graph_builders import make_linear_gelu_linear
+
+
+def test_in_process_coalescing_and_batching():
+    hw = HardwareConfig(sram_bytes=1 * 1024 * 1024)
+    graphs = [make_linear_gelu_linear(32, h, 4 * h) for h in (256, 512, 1024, 4096)]
+
+    async def scenario():
+        server = CompileServer(
+            workers=1, max_batch=8, batch_window_s=0.05, executor=ThreadPoolExecutor(1)
+        )
+        async with server:
+            requests = [server.compile(graphs[i % 4], hw) for i in range(40)]
+            results = await asyncio.gather(*requests)
+            again = await server.compile(graphs[0], hw)
+            return results, again, server.stats()
+
+    results, again, stats = asyncio.run(scenario())
+    for i, result in enumerate(results):
+        assert result == run_schedule_pass(graphs[i % 4], hw)
+    assert again == results[0]
+    assert stats["requests"] == 41
+    assert stats["coalesced"] == 36 and stats["recent_hits"] == 1
+    assert stats["batches"] == 1 and stats["mean_batch_size"] == 4
+    assert 0 <= stats["latency_p50_s"] <= stats["latency_p99_s"] <= stats["latency_max_s"]
+
+
+def test_unix_socket_round_trip_and_errors():
+    hw = HardwareConfig(sram_bytes=1 * 1024 * 1024)
+    g = make_linear_gelu_linear(32, 4096, 16384)
+    bad = Graph(
+        ops=[Op(name="Conv2d", inputs=["x"], outputs=["y"], attrs={})],
+        inputs={"x": Tensor((2,))},
+        outputs=["y"],
+    )
+
+    async def scenario(path):
+        server = CompileServer(workers=1, executor=ThreadPoolExecutor(1))
+        listener = await server.serve_unix(path)
+        client = await CompileClient.connect_unix(path)
+        try:
+            records = await asyncio.gather(*(client.compile(g, hw, tiling=True) for _ in range(5)))
+            with pytest.raises(CompileError, match="NotImplementedError"):
+                await client.compile(bad, hw)
+            stats = await client.stats()
+        finally:
+            await client.close()
+            listener.close()
+            await listener.wait_closed()
+            await server.close()
+        return records, stats
+
+    with tempfile.TemporaryDirectory() as tmp:
+        records, stats = asyncio.run(scenario(os.path.join(tmp, "s.sock")))
+    expected = run_schedule_pass(g, hw, tiling=True)
+    assert all(r == records[0] for r in records)
+    assert records[0]["chosen"] == expected.chosen_schedule.name
+    assert records[0]["reason"] == expected.reason
+    assert stats["requests"] == 6
+
+
+def test_closed_connections_are_released():
+    hw = HardwareConfig(sram_bytes=1 * 1024 * 1024)
+    g = make_linear_gelu_linear(32, 256, 1024)
+
+    async def scenario(path):
+        server = CompileServer(workers=1, executor=ThreadPoolExecutor(1))
+        listener = await server.serve_unix(path)
+        try:
+            clients = [await CompileClient.connect_unix(path) for _ in range(3)]
+            await asyncio.gather(*(c.compile(g, hw) for c in clients))
+            open_while_connected = len(server._connections)
+            for client in clients:
+                await client.close()
+            for _ in range(100):
+                if not server._connections:
+                    break
+                await asyncio.sleep(0.01)
+            return open_while_connected, len(server._connections)
+        finally:
+            listener.close()
+            await listener.wait_closed()
+            await server.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        while_connected, after = asyncio.run(scenario(os.path.join(tmp, "s.sock")))
+    assert while_connected == 3
+    assert after == 0
@@ -0,0 +1,44 @@
+from mlcompiler import HardwareConfig, Op, Tensor, choose_schedule
+
+from graph_builders import make_linear_gelu_linear
+
+
+def test_shapes_inferred_once_per_compile(monkeypatch):
+    calls = []
+    original = Op.infer_output_tensors
+
+    def counting(self, input_tensors):
+        calls.append(self.name)
+        return original(self, input_tensors)
+
+    monkeypatch.setattr(Op, "infer_output_tensors", counting)
+    g = make_linear_gelu_linear(batch=4, hidden=8, ff=16)
+    choose_schedule(g, HardwareConfig(sram_bytes=1024))
+    assert len(calls) == len(g.ops)
+
+
+def test_shape_cache_invalidated_by_mutation():
+    g = make_linear_gelu_linear(batch=4, hidden=8, ff=16)
+    assert g.shape_table()["linear2"].shape == (4, 8)
+
+    g.inputs["x"] = Tensor((6, 8))
+    assert g.shape_table()["linear2"].shape == (6, 8)
+
+    g.ops[1] = Op(
+        name="Linear",
+        inputs=["linear1"],
+        outputs=["gelu"],
+        attrs={"in_features": 16, "out_features": 16},
+    )
+    g.ops[2].attrs["out_features"] = 32
+    g.invalidate_shapes()
+    assert g.shape_table()["linear2"].shape == (6, 32)
+
+
+def test_append_extends_cache_incrementally():
+    g = make_linear_gelu_linear(batch=2, hidden=8, ff=16)
+    g.shape_table()
+    g.ops.append(Op(name="GELU", inputs=["linear2"], outputs=["gelu2"], attrs={}))
+    assert g._shape_cache is not None
+    assert g.shape_table()["gelu2"].shape == (2, 8)
+    assert g.infer_shapes() == dict(g.shape_table())
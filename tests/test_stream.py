@@ -0,0 +1,107 @@
+import io
+import json
+
+import pytest
+
+from mlcompiler import HardwareConfig, MemoryLevel, Op, Sym, run_precision_pass, run_schedule_pass
+from mlcompiler.stream import (
+    compile_jsonl,
+    compile_stream,
+    graph_from_record,
+    graph_to_record,
+    read_graphs,
+    result_to_record,
+    write_graphs,
+)
+
+from graph_builders import make_linear_gelu_linear
+
+
+def test_graph_record_round_trip(tmp_path):
+    g = make_linear_gelu_linear(batch=32, hidden=1024, ff=4096)
+    g.ops.append(Op(name="Reshape", inputs=["linear2"], outputs=["r"], attrs={"shape": (4, 8, -1)}))
+    g.outputs = ["r"]
+    assert graph_from_record(json.loads(json.dumps(graph_to_record(g)))) == g
+
+    path = tmp_path / "graphs.jsonl.gz"
+    assert write_graphs([("a", g), (None, g)], str(path)) == 2
+    read = list(read_graphs(str(path)))
+    assert [gid for gid, _ in read] == ["a", "2"]
+    assert all(graph == g for _, graph in read)
+
+
+def test_graph_record_keeps_symbolic_dims():
+    g = make_linear_gelu_linear(Sym("B"), hidden=64, ff=256)
+    record = json.loads(json.dumps(graph_to_record(g)))
+    assert record["inputs"]["x"]["shape"] == [{"sym": "B"}, 64]
+    back = graph_from_record(record)
+    assert back == g
+    assert back.shape_table()["linear2"].shape == (Sym("B"), 64)
+
+    record["inputs"]["x"]["shape"][0] = {"name": "B"}
+    with pytest.raises(ValueError, match="symbolic dim"):
+        graph_from_record(record)
+
+
+def test_compile_jsonl_streams_results_and_errors(tmp_path):
+    hw = HardwareConfig(sram_bytes=1 * 1024 * 1024)
+    graphs = [
+        ("small", make_linear_gelu_linear(batch=32, hidden=1024, ff=4096)),
+        ("large", make_linear_gelu_linear(batch=32, hidden=4096, ff=16384)),
+    ]
+    src = tmp_path / "in.jsonl"
+    write_graphs(graphs, str(src))
+    with open(src, "a") as f:
+        f.write("\n{not json\n")
+        f.write(json.dumps({"id": "bad-op", "inputs": {"x": {"shape": [2]}},
+                            "ops": [{"name": "Conv2d", "inputs": ["x"], "outputs": ["y"]}],
+                            "outputs": ["y"]}) + "\n")
+
+    out = tmp_path / "out.jsonl"
+    assert compile_jsonl(str(src), str(out), hw, chunk_size=2) == 4
+    records = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [r["id"] for r in records] == ["small", "large", "4", "bad-op"]
+
+    expected = run_schedule_pass(graphs[1][1], hw)
+    assert records[1]["chosen"] == expected.chosen_schedule.name == "naive"
+    assert records[1]["reason"] == expected.reason
+    assert records[1]["costs"]["memory_aware"]["peak_sram_bytes"] == 2 * 1024 * 1024
+    assert records[2]["error"].startswith("line 4: ")
+    assert "NotImplementedError" in records[3]["error"]
+
+    pooled = list(compile_stream(str(src), hw, workers=2, chunk_size=1))
+    assert pooled == records
+
+
+def test_compile_stream_reads_lazily():
+    g = make_linear_gelu_linear(batch=8, hidden=64, ff=256)
+    buf = io.StringIO()
+    write_graphs(((str(i), g) for i in range(100)), buf)
+    buf.seek(0)
+
+    stream = compile_stream(buf, HardwareConfig(sram_bytes=1024 * 1024), chunk_size=4)
+    first = next(stream)
+    assert first["id"] == "0"
+    assert buf.tell() < len(buf.getvalue())
+
+
+def test_result_record_keeps_storage_dtypes():
+    g = make_linear_gelu_linear(batch=32, hidden=1024, ff=4096)
+    hw = HardwareConfig(sram_bytes=400 * 1024)
+    record = json.loads(json.dumps(result_to_record(run_precision_pass(g, hw))))
+    assert record["storage_dtypes"] == {"linear1": "int8"}
+    assert "storage_dtypes" not in result_to_record(run_schedule_pass(g, hw))
+
+
+def test_result_record_keeps_memory_level_costs():
+    g = make_linear_gelu_linear(batch=32, hidden=1024, ff=4096)
+    levels = (MemoryLevel("l2", 300 * 1024, 2000.0), MemoryLevel("hbm", None, 100.0))
+    result = run_schedule_pass(g, HardwareConfig(sram_bytes=256 * 1024, memory_levels=levels))
+    naive = result.costs["naive"]
+    record = json.loads(json.dumps(result_to_record(result)))["costs"]["naive"]
+    assert record["dram_by_level"] == naive.dram.by_level
+    assert record["level_peaks"] == naive.sram.level_peaks
+    assert record["memory_time_s"] == naive.memory_time_s
+
+    flat = result_to_record(run_schedule_pass(g, HardwareConfig(sram_bytes=256 * 1024)))
+    assert not {"dram_by_level", "level_peaks", "memory_time_s"} & set(flat["costs"]["naive"])
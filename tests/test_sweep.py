@@ -0,0 +1,43 @@
+import pytest
+
+from mlcompiler import HardwareConfig, run_schedule_pass, sweep_linear_gelu_linear
+
+from graph_builders import make_linear_gelu_linear
+
+np = pytest.importorskip("numpy")
+
+
+def test_sweep_matches_run_schedule_pass():
+    batch = np.array([1, 8, 32, 32, 32])
+    hidden = np.array([64, 512, 1024, 2048, 4096])
+    ff = hidden * 4
+    srams = np.array([16 * 1024, 1024 * 1024, 8 * 1024 * 1024])
+    res = sweep_linear_gelu_linear(batch, hidden, ff, srams)
+    names = res.chosen_names()
+
+    for i in range(len(batch)):
+        g = make_linear_gelu_linear(int(batch[i]), int(hidden[i]), int(ff[i]))
+        for j, sram in enumerate(srams):
+            result = run_schedule_pass(g, HardwareConfig(sram_bytes=int(sram)))
+            assert names[i, j] == result.chosen_schedule.name
+            chosen = result.costs[result.chosen_schedule.name]
+            assert res.chosen_dram_bytes[i, j] == chosen.dram.total_bytes
+            for name, cost in result.costs.items():
+                assert res.dram_bytes[name][i] == cost.dram.total_bytes
+                assert res.peak_sram_bytes[name][i] == cost.sram.peak_bytes
+                assert res.feasible[name][i, j] == cost.feasible
+
+
+def test_sweep_columns_are_flat_and_aligned():
+    res = sweep_linear_gelu_linear(32, [1024, 4096], [4096, 16384], [2**20, 2**23])
+    cols = res.to_columns()
+    assert len(res) == 4
+    assert all(len(col) == 4 for col in cols.values())
+    assert list(cols["hidden"]) == [1024, 1024, 4096, 4096]
+    assert list(cols["sram_bytes"]) == [2**20, 2**23, 2**20, 2**23]
+    assert list(res.chosen_names().ravel()) == [
+        "memory_aware",
+        "memory_aware",
+        "naive",
+        "memory_aware",
+    ]
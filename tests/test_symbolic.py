@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from mlcompiler import Graph, HardwareConfig, Op, Sym, Tensor, run_schedule_pass, schedule_table
+from mlcompiler.cost import estimate_dram_bytes, estimate_peak_sram_bytes
+from mlcompiler.schedule import MEMORY_AWARE_SCHEDULE, NAIVE_SCHEDULE, fusion_groups_schedule
+from mlcompiler.symbolic import Poly, _eval, _sign, _sign_changes, bind, symbolic_estimate
+
+from graph_builders import make_linear_gelu_linear
+
+
+def _make_attention_core(batch, seq, head_dim: int) -> Graph:
+    ops = [
+        Op(name="MatMul", inputs=["q", "kt"], outputs=["scores"]),
+        Op(name="Softmax", inputs=["scores"], outputs=["probs"]),
+        Op(name="MatMul", inputs=["probs", "v"], outputs=["out"]),
+    ]
+    inputs = {
+        "q": Tensor((batch, seq, head_dim)),
+        "kt": Tensor((batch, head_dim, seq)),
+        "v": Tensor((batch, seq, head_dim)),
+    }
+    return Graph(ops=ops, inputs=inputs, outputs=["out"])
+
+
+def test_symbolic_dims_propagate_and_give_closed_forms():
+    b = Sym("b")
+    g = make_linear_gelu_linear(b, hidden=1024, ff=4096)
+    assert g.shape_table()["gelu"].shape == (b, 4096)
+    with pytest.raises(TypeError, match="bind it first"):
+        g.shape_table()["gelu"].nbytes()
+
+    naive = symbolic_estimate(g, NAIVE_SCHEDULE)
+    assert str(naive.dram_bytes) == "36864*b"
+    assert str(naive.peak_sram_bytes) == "8192*b"
+    for value in (1, 7, 64):
+        concrete = bind(g, b=value)
+        for schedule in (NAIVE_SCHEDULE, MEMORY_AWARE_SCHEDULE):
+            assert symbolic_estimate(g, schedule).at(b=value) == (
+                estimate_dram_bytes(concrete, schedule).total_bytes,
+                estimate_peak_sram_bytes(concrete, schedule).peak_bytes,
+            )
+
+
+def test_schedule_table_matches_compiling_each_batch():
+    g = make_linear_gelu_linear(Sym("b"), hidden=1024, ff=4096)
+    hw = HardwareConfig(sram_bytes=1 << 20)
+    table = schedule_table(g, hw, "b", 1, 256)
+    assert [(r.lo, r.hi, r.schedule.name) for r in table.ranges] == [
+        (1, 64, "memory_aware"),
+        (65, 128, "naive"),
+        (129, 256, "memory_aware"),
+    ]
+    assert not table.ranges[-1].feasible
+    for value in range(1, 257):
+        assert table.lookup(value) == run_schedule_pass(bind(g, b=value), hw).chosen_schedule
+    with pytest.raises(ValueError):
+        table.lookup(257)
+
+
+def test_schedule_table_quadratic_in_sequence_length():
+    g = _make_attention_core(Sym("b"), Sym("s"), head_dim=64)
+    hw = HardwareConfig(sram_bytes=1 << 20)
+    table = schedule_table(g, hw, "s", 1, 1024, bindings={"b": 2})
+    assert "s^2" in str(table.estimates["naive"].dram_bytes)
+    for value in range(1, 1025, 7):
+        concrete = bind(g, b=2, s=value)
+        assert table.lookup(value) == run_schedule_pass(concrete, hw).chosen_schedule
+
+
+def test_sign_changes_exact():
+    rng = random.Random(0)
+    for _ in range(200):
+        coeffs = [rng.randint(-50, 50) for _ in range(rng.randint(1, 4))]
+        expected = [
+            x
+            for x in range(-19, 21)
+            if _sign(_eval(coeffs, x)) != _sign(_eval(coeffs, x - 1))
+        ]
+        assert _sign_changes(coeffs, -20, 20) == expected
+
+
+def test_poly_arithmetic():
+    b, s = Poly.of_dim(Sym("b")), Poly.of_dim(Sym("s"))
+    p = 2 * b * s + 3 * b - 1
+    assert p.evaluate({"b": 2, "s": 5}) == 25
+    assert p.coefficients("s", {"b": 2}) == [5, 4]
+    assert (p - p) == 0
+    assert b.dominated_by(b + s)
+    with pytest.raises(ValueError, match="closed-form"):
+        symbolic_estimate(
+            make_linear_gelu_linear(Sym("b"), 8, 8),
+            fusion_groups_schedule(((0, 3),)),
+        )